@@ -215,6 +215,160 @@ SIMPLE_JWT = {
 }
 
 
+# ==============================================================================
+# CACHE SETTINGS
+# ==============================================================================
+# Celery 브로커로 이미 운영 중인 Redis를 캐시 백엔드로도 사용 (0번 DB는 브로커용)
+REDIS_HOST = os.environ.get("REDIS_HOST", "127.0.0.1")
+REDIS_PORT = os.environ.get("REDIS_PORT", "6379")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/1",
+    }
+}
+
+# 네이버 금융 스크래핑용 공통 HTTP 클라이언트 (stocks.http_client) 설정
+NAVER_HTTP = {
+    "CONNECT_TIMEOUT": 3.05,  # 연결 타임아웃 (초)
+    "READ_TIMEOUT": 5,  # 읽기 타임아웃 (초)
+    "POOL_MAXSIZE": 10,  # 호스트별 keep-alive 연결 수 (기본값)
+    "HOST_POOL_MAXSIZE": {"finance.naver.com": 20},  # 호스트별 연결 수
+    "RETRIES": 2,  # 연결 실패/5xx/429 재시도 횟수
+    "BACKOFF_FACTOR": 0.3,
+}
+
+# 네이버 금융 호스트별 요청 제한 (stocks.rate_limit) 설정 - Redis 토큰 버킷으로 모든 프로세스가 공유
+NAVER_RATE_LIMIT = {
+    "ENABLED": True,
+    "RATE": 10,  # 호스트별 초당 요청 수
+    "BURST": 20,  # 순간적으로 허용되는 요청 수
+    "MAX_WAIT": 5,  # 토큰을 기다리는 최대 시간 (초), 초과 시 요청 실패 처리
+    "HOSTS": {"finance.naver.com": {"RATE": 10, "BURST": 20}},
+    "CACHE_ALIAS": "default",
+}
+
+# 다종목 동시 조회 엔진 (stocks.fetcher) 설정
+FETCH_ENGINE = {
+    "MAX_CONCURRENCY": 16,  # 프로세스 전체 동시 원본 조회 수
+    "TIMEOUT": 30,  # 동기 호출이 결과를 기다리는 최대 시간 (초)
+}
+
+# 스크래핑 HTML 파서 (stocks.parsers) - "auto"는 lxml 설치 시 lxml, 아니면 html.parser
+HTML_PARSER_BACKEND = os.environ.get("HTML_PARSER_BACKEND", "auto")
+
+# 현재가 캐시 (stocks.quote_cache) 설정
+QUOTE_CACHE = {
+    "TTL": 5,  # 현재가 유효 시간 (초)
+    "MAX_ENTRIES": 4096,  # 프로세스 내 LRU 최대 종목 수
+    "LOCK_TIMEOUT": 10,  # 프로세스 간 단일 조회(single-flight) 락 유지 시간 (초)
+    "WAIT_TIMEOUT": 5,  # 다른 프로세스의 조회 결과를 기다리는 최대 시간 (초)
+    "CACHE_ALIAS": "default",
+}
+
+# 보유/미체결 종목 시세 피더 (stocks.feeder) 설정
+QUOTE_FEED = {
+    "INTERVAL": 10,  # 갱신 주기 (초)
+    "TTL": 30,  # 피더가 기록한 현재가의 유효 시간 (초) - 갱신 주기보다 길게 설정
+    "MAX_FETCHES": 20,  # 주기당 개별 조회 상한 - 나머지 종목은 시세 스냅샷으로 갱신
+}
+
+# 지정가 주문 장부 (trading.order_book) 설정
+ORDER_BOOK = {
+    "JOURNAL_TTL": 60
+    * 60,  # 주문 변경 기록 보관 시간 (초) - 지나면 다음 동기화에서 DB로 재구성
+    "CACHE_ALIAS": "default",
+}
+
+# 체결 정산 엔진 (trading.execution) 설정
+EXECUTION = {
+    "BATCH_SIZE": 500,  # bulk_create/bulk_update 한 쿼리당 행 수
+}
+
+# 전 종목 시세 스냅샷 (stocks.snapshot) 설정
+PRICE_SNAPSHOT = {
+    "TTL": 300,  # 스냅샷 유효 시간 (초) - 갱신 주기보다 길게 설정
+    "CACHE_ALIAS": "default",
+}
+
+# 종목 DB 동기화 (stocks.universe, crawl_stocks) 설정
+STOCK_SYNC = {
+    "MARKETS": ["KOSPI", "KOSDAQ"],
+    # 1페이지에서 마지막 페이지 번호(pgRR)를 읽지 못했을 때 사용할 페이지 수
+    "PAGES": {"KOSPI": 48, "KOSDAQ": 36},
+    "CHECKPOINT_TTL": 60 * 60,  # 완료된 페이지 보관 시간 (초) - --resume 가능 시간
+    "BATCH_SIZE": 1000,  # bulk_create 배치 크기
+    "CACHE_ALIAS": "default",
+}
+
+# 시간별 시세 저장소 (stocks.tick_store) 설정
+TICK_STORE = {
+    "SYNC_INTERVAL": 10,  # 같은 종목을 다시 수집하기까지의 최소 간격 (초)
+    "MAX_PAGES": 40,  # 한 번에 수집하는 최대 페이지 수 (페이지당 10건)
+    "LOCK_TIMEOUT": 60,  # 종목별 수집 락 유지 시간 (초)
+    "FETCH_BATCH": 8,  # 처음 수집할 때 동시에 가져오는 페이지 수
+    "CACHE_ALIAS": "default",
+}
+
+# 일별 시세 저장소 (stocks.daily_store) 설정
+DAILY_STORE = {
+    "SYNC_INTERVAL": 60,  # 같은 종목의 새 일자를 다시 확인하기까지의 최소 간격 (초)
+    "INITIAL_PAGES": 10,  # 저장된 데이터가 없을 때 처음 수집하는 페이지 수 (약 100거래일)
+    "LOCK_TIMEOUT": 60,  # 종목별 수집 락 유지 시간 (초)
+    "MAX_SYNC_PAGES": 50,  # 새 일자/빠진 일자를 찾아 한 번에 내려가는 최대 페이지 수
+    "CACHE_ALIAS": "default",
+}
+
+# 분봉 집계 (stocks.bars) 설정
+INTRADAY_BARS = {
+    "TTL": 3600,  # 봉 캐시 유지 시간 (초) - 새 체결이 저장되면 캐시 키가 바뀜
+    "CACHE_ALIAS": "default",
+}
+
+# 기술적 지표 (stocks.indicators) 설정
+INDICATORS = {
+    "TTL": 60 * 60 * 24,  # 지표 캐시 유지 시간 (초) - 마지막 봉이 바뀌면 캐시 키가 바뀜
+    "CACHE_ALIAS": "default",
+}
+
+# 종목 검색 색인 (stocks.search_index) 설정
+SEARCH_INDEX = {
+    "CHECK_INTERVAL": 5,  # 공유 캐시의 색인 버전(crawl_stocks가 갱신)을 다시 확인하는 최소 간격 (초)
+    "CACHE_ALIAS": "default",
+}
+
+# 종목 자동완성 (stocks.autocomplete) 설정
+AUTOCOMPLETE = {
+    "TTL": 30,  # 접두어별 결과 캐시 시간 (초) - 시세 스냅샷 갱신 주기(2분)보다 짧게
+    "LIMIT": 10,  # 기본 결과 수 (?limit=)
+    "MAX_LIMIT": 20,
+    "CACHE_ALIAS": "default",
+}
+
+# 시장 지수 캐시 (stocks.market_index) 설정
+MARKET_INDEX = {
+    "INTERVAL": 30,  # 갱신 주기 (초) - Celery beat가 이 주기로 갱신
+    "STALE_AFTER": 120,  # 마지막 갱신 후 이 시간이 지나면 stale 표시 + 요청 경로에서 한 번 갱신 시도 (초)
+    "TTL": 60
+    * 60
+    * 24,  # 캐시 보관 시간 (초) - 상위 서버 장애 시 마지막 값을 계속 반환
+    "LOCK_TIMEOUT": 10,  # 요청 경로 갱신 락 유지 시간 (초)
+    "CACHE_ALIAS": "default",
+}
+
+# 스크래핑 API 응답 캐시 (stocks.response_cache) 설정
+RESPONSE_CACHE = {
+    "CACHE_ALIAS": "default",
+    "LOCK_TIMEOUT": 10,  # 원본 조회(single-flight) 락 유지 시간 (초)
+    "WAIT_TIMEOUT": 5,  # 다른 요청의 조회 결과를 기다리는 최대 시간 (초)
+    "VIEWS": {
+        # TTL: 캐시 응답을 그대로 반환하는 시간, STALE_TTL: 이후 이전 응답 반환 + 백그라운드 갱신 시간
+        "stock-detail": {"TTL": 5, "STALE_TTL": 30},
+    },
+}
+
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -284,6 +438,26 @@ CELERY_BEAT_SCHEDULE = {
         # 주의: 너무 자주 실행하면 API 호출 제한에 걸리거나 서버 부하가 증가할 수 있습니다.
         #       테스트 및 실제 장 운영 시간 등을 고려하여 빈도를 조절하세요.
     },
+    # 보유 중이거나 미체결 주문이 걸린 종목의 현재가를 캐시에 계속 채워둠
+    "feed-watched-quotes": {
+        "task": "trading.tasks.feed_watched_quotes",
+        "schedule": timedelta(seconds=QUOTE_FEED["INTERVAL"]),
+    },
+    # KOSPI/KOSDAQ 시가총액 페이지(약 84페이지)로 전 종목 시세 스냅샷 갱신
+    "refresh-price-snapshot-every-2-minutes": {
+        "task": "stocks.tasks.task_refresh_price_snapshot",
+        "schedule": crontab(minute="*/2"),
+    },
+    # KOSPI/KOSDAQ 지수를 캐시에 채워둠 (시장 지수 API는 캐시만 읽음)
+    "refresh-market-index": {
+        "task": "stocks.tasks.task_refresh_market_index",
+        "schedule": timedelta(seconds=MARKET_INDEX["INTERVAL"]),
+    },
+    # 장 마감 후 pykrx로 전 종목 일별 시세 저장 (평일 18:30)
+    "ingest-daily-bars-after-close": {
+        "task": "stocks.tasks.task_ingest_daily_bars",
+        "schedule": crontab(minute="30", hour="18", day_of_week="mon-fri"),
+    },
 }
 
 # 작업 결과를 DB에 저장하기 위한 설정 (django-celery-results)
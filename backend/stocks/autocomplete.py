@@ -0,0 +1,77 @@
+# backend/stocks/autocomplete.py
+
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .search_index import get_search_index, normalize
+from .snapshot import get_snapshot_rows
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTOCOMPLETE_SETTINGS = {
+    "TTL": 30,  # 접두어별 결과 캐시 시간 (초) - 시세 스냅샷 갱신 주기보다 짧게
+    "LIMIT": 10,  # 기본 결과 수
+    "MAX_LIMIT": 20,
+    "CACHE_ALIAS": "default",
+}
+
+AUTOCOMPLETE_KEY_PREFIX = "stocks:autocomplete:"
+
+
+def autocomplete_settings():
+    return {
+        **DEFAULT_AUTOCOMPLETE_SETTINGS,
+        **getattr(settings, "AUTOCOMPLETE", {}),
+    }
+
+
+def build_suggestions(entries):
+    """
+    검색 색인 항목에 시세 스냅샷(한 번의 get_many)의 현재가/등락률을 붙입니다.
+    스냅샷에 없는 종목은 price/change_rate가 None
+    """
+    snapshot = get_snapshot_rows([entry.code for entry in entries])
+    suggestions = []
+    for entry in entries:
+        row = snapshot.get(entry.code)
+        suggestions.append(
+            {
+                "code": entry.code,
+                "name": entry.name,
+                "market_type": entry.market_type,
+                "price": row["price"] if row else None,
+                "change_rate": row["change_rate"] if row else None,
+            }
+        )
+    return suggestions
+
+
+def get_suggestions(query, limit):
+    """
+    자동완성 결과. 정규화한 검색어(접두어)와 limit 별로 TTL 동안 캐시합니다.
+    캐시 키에 검색 색인 버전이 들어가므로 종목 DB 동기화 후에는 새로 만듭니다.
+    """
+    options = autocomplete_settings()
+    query = normalize(query)
+    if not query:
+        return []
+
+    index = get_search_index()
+    shared = caches[options["CACHE_ALIAS"]]
+    cache_key = f"{AUTOCOMPLETE_KEY_PREFIX}{index.version or 0}:{limit}:{query}"
+    try:
+        cached = shared.get(cache_key)
+    except Exception as e:
+        logger.warning(f"자동완성 캐시 조회 실패({query}): {e}")
+        cached = None
+    if cached is not None:
+        return cached
+
+    suggestions = build_suggestions(index.search(query, limit=limit))
+    try:
+        shared.set(cache_key, suggestions, timeout=options["TTL"])
+    except Exception as e:
+        logger.warning(f"자동완성 캐시 저장 실패({query}): {e}")
+    return suggestions
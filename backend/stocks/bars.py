@@ -0,0 +1,115 @@
+# backend/stocks/bars.py
+
+import logging
+
+import pandas as pd
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+
+from .models import IntradayTick
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTRADAY_BAR_SETTINGS = {
+    "TTL": 3600,  # 봉 캐시 유지 시간 (초) - 키에 체결 상태가 들어가므로 길게 잡아도 됨
+    "CACHE_ALIAS": "default",
+}
+
+# API의 interval 값 -> pandas 리샘플 주기
+BAR_INTERVALS = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+}
+
+BAR_KEY_PREFIX = "stocks:bars:"
+
+
+def _bar_settings():
+    return {
+        **DEFAULT_INTRADAY_BAR_SETTINGS,
+        **getattr(settings, "INTRADAY_BARS", {}),
+    }
+
+
+def _bar_cache():
+    return caches[_bar_settings()["CACHE_ALIAS"]]
+
+
+def aggregate_bars(ticks, interval):
+    """
+    체결 행(dict: tick_time, price, volume)을 OHLCV 봉으로 묶습니다.
+    - volume은 누적 거래량이므로 직전 체결과의 차이를 봉 거래량으로 사용
+      (첫 체결은 누적값 그대로, 누적값이 줄어든 구간은 0으로 처리)
+    - 체결이 없는 구간의 봉은 만들지 않음
+    봉 시작 시각 오름차순의 리스트를 반환합니다.
+    """
+    rule = BAR_INTERVALS[interval]
+    if not ticks:
+        return []
+
+    frame = pd.DataFrame.from_records(ticks, columns=["tick_time", "price", "volume"])
+    frame.index = pd.to_datetime(frame.pop("tick_time").astype(str), format="%H:%M:%S")
+    frame = frame.sort_index()
+    frame["volume"] = (
+        frame["volume"].diff().fillna(frame["volume"]).clip(lower=0).astype("int64")
+    )
+
+    resampled = frame.resample(rule, label="left", closed="left")
+    bars = resampled["price"].ohlc()
+    bars["volume"] = resampled["volume"].sum()
+    bars = bars.dropna(subset=["open"])
+
+    return [
+        {
+            "time": start.strftime("%H:%M"),
+            "open": int(row.open),
+            "high": int(row.high),
+            "low": int(row.low),
+            "close": int(row.close),
+            "volume": int(row.volume),
+        }
+        for start, row in zip(bars.index, bars.itertuples(index=False))
+    ]
+
+
+def get_intraday_bars(stock_code, trade_date, interval):
+    """
+    저장된 시간별 시세로 trade_date 하루의 봉을 만듭니다. (종목, 주기, 일자별 캐시)
+    캐시 키에 체결 수/마지막 체결시각/누적 거래량을 넣어, 새 체결이 저장되면
+    자동으로 다시 계산합니다.
+    """
+    if interval not in BAR_INTERVALS:
+        raise ValueError(
+            f"지원하지 않는 봉 주기입니다: {interval} ({', '.join(BAR_INTERVALS)})"
+        )
+
+    queryset = IntradayTick.objects.filter(stock_id=stock_code, trade_date=trade_date)
+    state = queryset.aggregate(
+        count=Count("tick_time"), last=Max("tick_time"), volume=Max("volume")
+    )
+    if not state["count"]:
+        return []
+
+    key = (
+        f"{BAR_KEY_PREFIX}{stock_code}:{interval}:{trade_date.isoformat()}:"
+        f"{state['count']}:{state['last'].isoformat()}:{state['volume']}"
+    )
+    shared = _bar_cache()
+    try:
+        bars = shared.get(key)
+    except Exception as e:
+        logger.warning(f"봉 캐시 조회 실패({key}): {e}")
+        bars = None
+    if bars is not None:
+        return bars
+
+    bars = aggregate_bars(
+        list(queryset.values("tick_time", "price", "volume")), interval
+    )
+    try:
+        shared.set(key, bars, timeout=_bar_settings()["TTL"])
+    except Exception as e:
+        logger.warning(f"봉 캐시 저장 실패({key}): {e}")
+    return bars
@@ -0,0 +1,86 @@
+# backend/stocks/columnar.py
+
+from rest_framework.renderers import JSONRenderer
+
+# 차트용 API의 ?format=columnar 응답 컬럼 (순서대로)
+DAILY_BAR_COLUMNS = ["date", "open", "high", "low", "close", "change", "volume"]
+TICK_COLUMNS = [
+    "time",
+    "price",
+    "change",
+    "sell_price",
+    "buy_price",
+    "volume",
+    "volume_change",
+]
+INTRADAY_BAR_COLUMNS = ["time", "open", "high", "low", "close", "volume"]
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    ?format=columnar 요청을 받기 위한 JSON 렌더러.
+    응답 형태는 뷰가 정하며(is_columnar), 렌더링 자체는 일반 JSON과 같습니다.
+    """
+
+    format = "columnar"
+
+
+def is_columnar(request):
+    renderer = getattr(request, "accepted_renderer", None)
+    return renderer is not None and renderer.format == ColumnarJSONRenderer.format
+
+
+def to_columnar(records, columns):
+    """
+    행(컬럼 순서의 튜플) 목록을 {컬럼: 값 리스트}로 전치합니다.
+    키 이름이 행마다 반복되지 않고, 숫자는 문자열이 아닌 숫자 그대로 나갑니다.
+    """
+    values = list(zip(*records))
+    if not values:
+        return {column: [] for column in columns}
+    return {
+        column: list(column_values) for column, column_values in zip(columns, values)
+    }
+
+
+def daily_bars_to_columnar(bars):
+    return to_columnar(
+        (
+            (
+                bar.date.isoformat(),
+                bar.open,
+                bar.high,
+                bar.low,
+                bar.close,
+                bar.change,
+                bar.volume,
+            )
+            for bar in bars
+        ),
+        DAILY_BAR_COLUMNS,
+    )
+
+
+def ticks_to_columnar(ticks):
+    return to_columnar(
+        (
+            (
+                tick.tick_time.isoformat(),
+                tick.price,
+                tick.change,
+                tick.sell_price,
+                tick.buy_price,
+                tick.volume,
+                tick.volume_change,
+            )
+            for tick in ticks
+        ),
+        TICK_COLUMNS,
+    )
+
+
+def intraday_bars_to_columnar(bars):
+    return to_columnar(
+        ((bar[column] for column in INTRADAY_BAR_COLUMNS) for bar in bars),
+        INTRADAY_BAR_COLUMNS,
+    )
@@ -0,0 +1,302 @@
+# backend/stocks/daily_store.py
+
+import logging
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import http_client
+from .models import DailyBar, Stock
+from .parsers import parse_daily_prices
+from .ranges import DAILY_PAGE_SIZE, fetch_pages
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DAILY_STORE_SETTINGS = {
+    "SYNC_INTERVAL": 60,  # 같은 종목의 새 일자를 다시 확인하기까지의 최소 간격 (초)
+    "INITIAL_PAGES": 10,  # 저장된 데이터가 없을 때 처음 수집하는 페이지 수 (약 100거래일)
+    "LOCK_TIMEOUT": 60,  # 종목별 수집 락 유지 시간 (초)
+    "MAX_SYNC_PAGES": 50,  # 새 일자/빠진 일자를 찾아 한 번에 내려가는 최대 페이지 수
+    "CACHE_ALIAS": "default",
+}
+
+SYNCED_KEY_PREFIX = "stocks:daily-synced:"
+LOCK_KEY_PREFIX = "stocks:daily-lock:"
+EXHAUSTED_KEY_PREFIX = "stocks:daily-exhausted:"  # 상장일까지 모두 수집한 종목
+# 빠진 일자 없이 저장되었음을 확인한 범위 {"newest": 최근 일자, "pages": 페이지 수}
+VERIFIED_KEY_PREFIX = "stocks:daily-verified:"
+
+DAILY_URL = "https://finance.naver.com/item/sise_day.naver?code={code}&page={page}"
+
+UPDATE_FIELDS = ["open", "high", "low", "close", "change", "volume"]
+
+
+def _daily_store_settings():
+    return {**DEFAULT_DAILY_STORE_SETTINGS, **getattr(settings, "DAILY_STORE", {})}
+
+
+def _shared():
+    return caches[_daily_store_settings()["CACHE_ALIAS"]]
+
+
+def _cache_get(key):
+    try:
+        return _shared().get(key)
+    except Exception as e:
+        logger.warning(f"일별 시세 캐시 조회 실패({key}): {e}")
+        return None
+
+
+def _cache_set(key, value, timeout):
+    try:
+        _shared().set(key, value, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"일별 시세 캐시 저장 실패({key}): {e}")
+
+
+def _try_lock(lock_key, timeout):
+    """락 획득 여부. Redis 장애 시에는 락 없이 수집하도록 True"""
+    try:
+        return _shared().add(lock_key, 1, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"일별 시세 수집 락 획득 실패({lock_key}): {e}")
+        return True
+
+
+def _release_lock(lock_key):
+    try:
+        _shared().delete(lock_key)
+    except Exception as e:
+        logger.warning(f"일별 시세 수집 락 해제 실패({lock_key}): {e}")
+
+
+def _to_int(text):
+    """'71,300' -> 71300, 비어 있거나 숫자가 아니면 None"""
+    cleaned = text.replace(",", "").strip()
+    try:
+        return int(cleaned)
+    except ValueError:
+        return None
+
+
+def to_bar_fields(row):
+    """
+    parse_daily_prices()의 문자열 행을 DailyBar 필드 값으로 변환합니다.
+    일자/종가를 해석할 수 없는 행은 None
+    """
+    try:
+        day = datetime.strptime(row["date"], "%Y.%m.%d").date()
+    except ValueError:
+        return None
+    close = _to_int(row["close"])
+    if close is None:
+        return None
+    change = _to_int(row["change"]) or 0
+    if row["change_status"] in ("하락", "하한가"):
+        change = -change
+    return {
+        "date": day,
+        "open": _to_int(row["open"]) or close,
+        "high": _to_int(row["high"]) or close,
+        "low": _to_int(row["low"]) or close,
+        "close": close,
+        "change": change,
+        "volume": _to_int(row["volume"]) or 0,
+    }
+
+
+def serialize_daily_bar(bar):
+    """DailyBar -> 기존 일별 시세 API와 같은 형태의 딕셔너리"""
+    if bar.change > 0:
+        change_status = "상승"
+    elif bar.change < 0:
+        change_status = "하락"
+    else:
+        change_status = ""
+    return {
+        "date": bar.date.strftime("%Y.%m.%d"),
+        "close": f"{bar.close:,}",
+        "change": f"{abs(bar.change):,}",
+        "change_status": change_status,
+        "open": f"{bar.open:,}",
+        "high": f"{bar.high:,}",
+        "low": f"{bar.low:,}",
+        "volume": f"{bar.volume:,}",
+    }
+
+
+def fetch_daily_page(stock_code, page):
+    """네이버 일별 시세 한 페이지(최근 거래일부터 10일)를 가져와 파싱합니다."""
+    headers = {"User-Agent": "Mozilla.5.0"}
+    response = http_client.get(
+        DAILY_URL.format(code=stock_code, page=page), headers=headers
+    )
+    response.raise_for_status()
+    return parse_daily_prices(response.text)
+
+
+def _page_fields(rows):
+    return [f for f in (to_bar_fields(row) for row in rows) if f is not None]
+
+
+def upsert_daily_bars(stock, fields):
+    """일별 봉을 저장합니다. 이미 있는 일자는 갱신 (당일 봉은 장중에 바뀜)"""
+    if not fields:
+        return 0
+    DailyBar.objects.bulk_create(
+        [DailyBar(stock=stock, **f) for f in fields],
+        update_conflicts=True,
+        unique_fields=["stock", "date"],
+        update_fields=UPDATE_FIELDS,
+    )
+    return len(fields)
+
+
+def _stored_dates(stock):
+    """저장된 일자 목록 (최근 일자부터)"""
+    return list(
+        DailyBar.objects.filter(stock=stock)
+        .order_by("-date")
+        .values_list("date", flat=True)
+    )
+
+
+def _complete_through(dates, page, fields):
+    """
+    1~page 페이지의 거래일이 모두 저장되어 있는지 (dates: 저장된 일자, 최근 일자부터)
+    저장된 일자는 모두 실제 거래일이므로, page 페이지의 마지막 행이 dates의 같은 위치에
+    있으면 그보다 최근의 거래일은 하나도 빠지지 않은 것입니다.
+    """
+    if not fields:
+        return False
+    position = (page - 1) * DAILY_PAGE_SIZE + len(fields) - 1
+    return position < len(dates) and dates[position] == fields[-1]["date"]
+
+
+def ingest_daily_bars(stock_code):
+    """
+    새 일자와 저장소 중간에 빠진 일자를 수집하여 저장합니다.
+    - 1페이지(최신)부터 내려가며, 지금까지 본 페이지까지의 거래일이 빠짐없이 저장되었거나
+      (_complete_through) 저장된 가장 오래된 일자에 닿으면 중단
+    - 저장된 마지막 일자는 장중 봉일 수 있으므로 다시 받아 갱신
+    - 저장된 데이터가 없으면 INITIAL_PAGES 페이지를 동시에 가져옴
+    저장(추가/갱신)한 행 수를 반환합니다.
+    """
+    stock = Stock.objects.get(stock_code=stock_code)
+    dates = _stored_dates(stock)
+    if not dates:
+        return backfill_daily_bars(stock_code, _daily_store_settings()["INITIAL_PAGES"])
+
+    last_date, first_date, stored = dates[0], dates[-1], set(dates)
+    collected = {}
+    for page in range(1, _daily_store_settings()["MAX_SYNC_PAGES"] + 1):
+        fields = _page_fields(fetch_daily_page(stock_code, page))
+        if not fields or all(f["date"] in collected for f in fields):
+            break
+        for f in fields:
+            # 새 일자(와 장중일 수 있는 마지막 일자), 저장 기간 중간에 빠진 일자
+            if f["date"] >= last_date or (
+                f["date"] >= first_date and f["date"] not in stored
+            ):
+                collected.setdefault(f["date"], f)
+        merged = sorted(stored | set(collected), reverse=True)
+        if (
+            _complete_through(merged, page, fields)
+            or fields[-1]["date"] <= first_date
+            or len(fields) < DAILY_PAGE_SIZE
+        ):
+            break
+
+    return upsert_daily_bars(stock, list(collected.values()))
+
+
+def backfill_daily_bars(stock_code, pages):
+    """
+    최근 pages 페이지만큼의 과거 일별 시세가 빠짐없이 저장소에 있도록 채웁니다.
+    - 빈틈이 없다면 저장된 행 수로 채워진 페이지 수를 알 수 있으므로, 그 마지막 페이지를
+      모자란 페이지와 함께 받아 실제로 빈틈이 없는지 확인 (_complete_through)
+    - 빈틈이 있으면 앞쪽 페이지도 모두 다시 받아 빠진 일자를 채움
+    - 확인한 범위는 최근 일자가 바뀔 때까지 기억하고, 상장일까지 모두 받은 종목은 다시 요청하지 않음
+    새로 저장한 행 수를 반환합니다.
+    """
+    stock = Stock.objects.get(stock_code=stock_code)
+    if _cache_get(EXHAUSTED_KEY_PREFIX + stock_code):
+        return 0
+    dates = _stored_dates(stock)
+    verified = _cache_get(VERIFIED_KEY_PREFIX + stock_code)
+    if (
+        dates
+        and verified
+        and verified["newest"] == dates[0]
+        and verified["pages"] >= pages
+    ):
+        return 0
+
+    def fetch(page):
+        return fetch_daily_page(stock_code, page)
+
+    check = min(len(dates) // DAILY_PAGE_SIZE, pages)
+    rows_by_page = fetch_pages(fetch, range(max(check, 1), pages + 1))
+    if check > 1 and not _complete_through(
+        dates, check, _page_fields(rows_by_page[check])
+    ):
+        logger.info(f"일별 시세({stock_code}) 저장소에 빠진 일자가 있어 다시 받습니다.")
+        rows_by_page.update(fetch_pages(fetch, range(1, check)))
+
+    stored, collected = set(dates), {}
+    exhausted = False
+    for page in sorted(rows_by_page):
+        fields = _page_fields(rows_by_page[page])
+        new = [f for f in fields if f["date"] not in collected]
+        for f in new:
+            collected[f["date"]] = f
+        # 마지막 페이지를 넘기면 네이버는 마지막 페이지를 다시 보여줌
+        if not new or len(fields) < DAILY_PAGE_SIZE:
+            exhausted = True
+            break
+
+    if exhausted:
+        _cache_set(EXHAUSTED_KEY_PREFIX + stock_code, 1, timeout=60 * 60 * 24)
+    missing = [f for day, f in collected.items() if day not in stored]
+    count = upsert_daily_bars(stock, missing)
+    newest = max([*stored, *collected], default=None)
+    if newest is not None:
+        _cache_set(
+            VERIFIED_KEY_PREFIX + stock_code,
+            {"newest": newest, "pages": pages},
+            timeout=60 * 60 * 24,
+        )
+    return count
+
+
+def sync_daily_bars(stock_code):
+    """
+    요청 경로에서 호출하는 수집 진입점.
+    SYNC_INTERVAL 이내에 이미 수집했거나 다른 요청/프로세스가 수집 중이면 건너뜁니다.
+    (공유 캐시에 접근할 수 없으면 간격/락 없이 수집)
+    수집한 경우 저장 행 수, 건너뛴 경우 None을 반환합니다.
+    """
+    options = _daily_store_settings()
+    if _cache_get(SYNCED_KEY_PREFIX + stock_code):
+        return None
+    if not _try_lock(LOCK_KEY_PREFIX + stock_code, options["LOCK_TIMEOUT"]):
+        return None
+    try:
+        count = ingest_daily_bars(stock_code)
+        _cache_set(SYNCED_KEY_PREFIX + stock_code, 1, timeout=options["SYNC_INTERVAL"])
+        return count
+    finally:
+        _release_lock(LOCK_KEY_PREFIX + stock_code)
+
+
+def get_daily_bars(stock_code, start=None, end=None, limit=None, offset=0):
+    """저장된 일별 봉을 최근 일자부터 조회합니다. (start/end: 포함, limit: None이면 전부)"""
+    queryset = DailyBar.objects.filter(stock_id=stock_code).order_by("-date")
+    if start is not None:
+        queryset = queryset.filter(date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(date__lte=end)
+    if limit is None:
+        return list(queryset[offset:])
+    return list(queryset[offset : offset + limit])
@@ -0,0 +1,190 @@
+# backend/stocks/eod_ingest.py
+
+import logging
+from datetime import timedelta
+
+import pandas as pd
+from django.db.models import Max, Min
+from pykrx import stock as krx
+
+from .daily_store import UPDATE_FIELDS
+from .models import DailyBar, DailyBarIngestion, Stock
+
+logger = logging.getLogger(__name__)
+
+MARKETS = ("KOSPI", "KOSDAQ")
+BULK_BATCH_SIZE = 1000
+PREVIOUS_CLOSE_LOOKBACK = timedelta(days=14)  # 전일 종가를 찾을 기간 (연휴 고려)
+# 밀린 일자를 이어서 수집할 최대 기간 (더 오래된 빈 일자는 일별 시세 저장소가 요청 시 채움)
+CATCH_UP_LIMIT = timedelta(days=30)
+
+# pykrx 전 종목 OHLCV 컬럼 -> DailyBar 필드
+KRX_COLUMNS = {
+    "시가": "open",
+    "고가": "high",
+    "저가": "low",
+    "종가": "close",
+    "거래량": "volume",
+}
+
+
+def fetch_market_ohlcv(day, market):
+    """pykrx로 하루치 시장 전체 OHLCV를 한 번에 조회합니다. (index: 종목코드)"""
+    return krx.get_market_ohlcv_by_ticker(day.strftime("%Y%m%d"), market=market)
+
+
+def frame_to_bar_fields(frame, previous_closes=None):
+    """
+    pykrx 조회 결과를 {종목코드: DailyBar 필드} 로 변환합니다.
+    - 거래정지 종목(종가 0)은 제외
+    - 거래가 없는 종목(시가/고가/저가 0, 종가는 전일 종가)은 시가/고가/저가를 종가로 채움
+      (daily_store.to_bar_fields와 같은 방식)
+    - 전일비는 저장된 전일 종가(previous_closes)와의 차이,
+      전일 종가가 없으면 등락률로 역산 (종가 - 종가 / (1 + 등락률/100), 반올림 오차 있음)
+    """
+    if frame.empty:
+        return {}
+    bars = frame.rename(columns=KRX_COLUMNS)
+    bars = bars[bars["close"] > 0]
+    bars = bars.assign(
+        **{
+            column: bars[column].mask(bars[column] <= 0, bars["close"])
+            for column in ("open", "high", "low")
+        }
+    )
+    estimated = bars["close"] / (1 + bars["등락률"] / 100)
+    stored = pd.Series(previous_closes or {}, dtype="float64").reindex(bars.index)
+    previous_close = stored.fillna(estimated)
+    bars = bars.assign(change=(bars["close"] - previous_close).round())
+    bars = bars[["open", "high", "low", "close", "change", "volume"]].astype("int64")
+    return {
+        str(code): {field: int(value) for field, value in row.items()}
+        for code, row in bars.to_dict("index").items()
+    }
+
+
+def _previous_closes(day):
+    """day 직전 거래일의 저장된 종가 {종목코드: 종가}"""
+    closes = {}
+    for code, close in (
+        DailyBar.objects.filter(date__lt=day, date__gte=day - PREVIOUS_CLOSE_LOOKBACK)
+        .order_by("stock_id", "-date")
+        .values_list("stock_id", "close")
+    ):
+        closes.setdefault(code, close)
+    return closes
+
+
+def ingest_market_day(day, market, force=False):
+    """
+    day 하루의 market 전체 일별 봉을 저장하고 수집 기록을 남깁니다.
+    이미 완료(또는 휴장)로 기록된 일자는 force가 아니면 건너뜁니다.
+    조회 결과가 없으면 이후 거래일이 수집된 경우에만 휴장으로 확정하고, 아니면
+    KRX가 아직 공개하지 않았을 수 있으므로 미공개(다시 수집)로 기록합니다.
+    종목 DB에 있는 종목만 저장하며, 수집 기록(DailyBarIngestion)을 반환합니다.
+    """
+    log = DailyBarIngestion.objects.filter(date=day, market_type=market).first()
+    if (
+        log is not None
+        and log.status not in DailyBarIngestion.RETRY_STATUSES
+        and not force
+    ):
+        return log
+
+    try:
+        fields_by_code = frame_to_bar_fields(
+            fetch_market_ohlcv(day, market), _previous_closes(day)
+        )
+        if not fields_by_code:
+            later = DailyBarIngestion.objects.filter(
+                market_type=market,
+                date__gt=day,
+                status=DailyBarIngestion.STATUS_SUCCESS,
+            ).exists()
+            status = (
+                DailyBarIngestion.STATUS_HOLIDAY
+                if later
+                else DailyBarIngestion.STATUS_EMPTY
+            )
+            count = 0
+        else:
+            known = list(
+                Stock.objects.filter(stock_code__in=fields_by_code.keys()).values_list(
+                    "stock_code", flat=True
+                )
+            )
+            DailyBar.objects.bulk_create(
+                [
+                    DailyBar(stock_id=code, date=day, **fields_by_code[code])
+                    for code in known
+                ],
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=["stock", "date"],
+                update_fields=UPDATE_FIELDS,
+            )
+            status, count = DailyBarIngestion.STATUS_SUCCESS, len(known)
+        error = ""
+    except Exception as e:
+        logger.error(f"{day} {market} 일별 시세 일괄 수집 실패: {e}")
+        status, count, error = DailyBarIngestion.STATUS_FAILED, 0, str(e)
+
+    log, _ = DailyBarIngestion.objects.update_or_create(
+        date=day,
+        market_type=market,
+        defaults={"status": status, "row_count": count, "error": error},
+    )
+    return log
+
+
+def ingest_market_range(start, end, markets=MARKETS, force=False):
+    """
+    start~end(포함) 평일마다 시장별 일괄 수집을 실행합니다. (오래된 일자부터)
+    중간에 멈춰도 다시 실행하면 완료된 (일자, 시장)은 건너뛰고 이어서 수집합니다.
+    """
+    logs = []
+    for day in pd.bdate_range(start, end):
+        for market in markets:
+            logs.append(ingest_market_day(day.date(), market, force=force))
+    return logs
+
+
+def catch_up_start(market, today):
+    """
+    이어서 수집할 시작일: market 종목들의 마지막 저장 일자 중 가장 이른 날의 다음 날과
+    수집에 실패했거나 결과가 없던(미공개) 일자 중 이른 날.
+    (최대 CATCH_UP_LIMIT 전, 둘 다 없으면 today)
+    """
+    oldest = today - CATCH_UP_LIMIT
+    earliest = (
+        DailyBar.objects.filter(stock__market_type=market)
+        .values("stock_id")
+        .annotate(last=Max("date"))
+        .aggregate(earliest=Min("last"))["earliest"]
+    )
+    failed = DailyBarIngestion.objects.filter(
+        market_type=market,
+        status__in=DailyBarIngestion.RETRY_STATUSES,
+        date__gte=oldest,
+    ).aggregate(earliest=Min("date"))["earliest"]
+
+    candidates = [today]
+    if earliest is not None:
+        candidates.append(earliest + timedelta(days=1))
+    if failed is not None:
+        candidates.append(failed)
+    return max(min(candidates), oldest)
+
+
+def ingest_market_catch_up(today, markets=MARKETS):
+    """
+    시장별로 밀린 일자(catch_up_start)부터 today까지 이어서 수집합니다.
+    한 번 실패한 일자도 다음 실행에서 다시 수집되며, 이미 완료/휴장으로 기록된 일자는
+    조회하지 않으므로 밀린 일자가 없으면 today 하루만 조회합니다.
+    """
+    logs = []
+    for market in markets:
+        logs.extend(
+            ingest_market_range(catch_up_start(market, today), today, markets=[market])
+        )
+    return logs
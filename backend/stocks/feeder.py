@@ -0,0 +1,91 @@
+# backend/stocks/feeder.py
+
+import logging
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils import timezone
+
+from .fetcher import fetch_prices
+from .quote_cache import Quote, quote_cache
+from .snapshot import get_snapshot_rows
+from .views import fetch_current_stock_price
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUOTE_FEED_SETTINGS = {
+    "INTERVAL": 10,
+    "TTL": 30,
+    # 주기당 개별 조회 상한 - 네이버 요청 한도(초당 10회)를 사용자 요청과 나눠 쓰도록 제한
+    "MAX_FETCHES": 20,
+}
+
+
+def quote_feed_settings():
+    return {**DEFAULT_QUOTE_FEED_SETTINGS, **getattr(settings, "QUOTE_FEED", {})}
+
+
+def _snapshot_quotes(stock_codes, cached, ttl):
+    """
+    시세 스냅샷(시가총액 페이지 일괄 조회)에서 TTL 안에 조회된 행 중
+    캐시보다 새로운 현재가만 Quote로 반환합니다. (Quote 목록, 남은 유효 시간)
+    """
+    now = timezone.now()
+    quotes = []
+    for code, row in get_snapshot_rows(stock_codes).items():
+        as_of = datetime.fromtimestamp(row["as_of"], tz=dt_timezone.utc)
+        if (now - as_of).total_seconds() >= ttl:
+            continue
+        if code in cached and cached[code].as_of >= as_of:
+            continue
+        quotes.append(Quote(stock_code=code, price=Decimal(row["price"]), as_of=as_of))
+    if not quotes:
+        return [], 0
+    oldest = min(quote.as_of for quote in quotes)
+    return quotes, max(1, int(ttl - (now - oldest).total_seconds()))
+
+
+def feed_quotes(stock_codes):
+    """
+    [시세 피더] 주어진 종목들의 현재가를 공유 현재가 캐시(프로세스 내 LRU + Redis)에 기록합니다.
+    - 개별 조회는 주기당 MAX_FETCHES 종목까지만 (캐시에 없는 종목, 오래된 종목 순)
+    - 나머지 종목은 시세 스냅샷에 더 새로운 현재가가 있으면 그 값을 (조회 시각 기준 TTL)
+
+    TTL을 갱신 주기보다 길게 잡아, 피더가 돌고 있는 동안에는 요청 처리 코드와
+    지정가 주문 Task가 항상 캐시에서 현재가를 읽도록 합니다.
+    (반환값: 갱신 성공 종목 수, 실패 종목 수)
+    """
+    options = quote_feed_settings()
+    stock_codes = list(stock_codes)
+    cached = quote_cache.get_many(stock_codes)
+    oldest_first = sorted(
+        stock_codes,
+        key=lambda code: (code in cached, cached[code].as_of if code in cached else 0),
+    )
+    fetch_codes = oldest_first[: options["MAX_FETCHES"]]
+
+    prices = fetch_prices(fetch_codes, fetch=fetch_current_stock_price)
+    now = timezone.now()
+    quotes = [
+        Quote(stock_code=code, price=price, as_of=now)
+        for code, price in prices.items()
+        if price is not None
+    ]
+    quote_cache.set_many(quotes, ttl=options["TTL"])
+
+    rest = [code for code in stock_codes if code not in prices or prices[code] is None]
+    snapshot_quotes, ttl = _snapshot_quotes(rest, cached, options["TTL"])
+    quote_cache.set_many(snapshot_quotes, ttl=ttl)
+
+    failed = len(prices) - len(quotes)
+    if failed:
+        logger.warning(f"시세 피더: {failed}개 종목 현재가 갱신 실패")
+    skipped = len(stock_codes) - len(fetch_codes)
+    if skipped:
+        logger.info(
+            f"시세 피더: 개별 조회 {len(fetch_codes)}개, "
+            f"나머지 {skipped}개 중 {len(snapshot_quotes)}개는 시세 스냅샷으로 갱신"
+        )
+    return len(quotes) + len(snapshot_quotes), failed
@@ -0,0 +1,179 @@
+# backend/stocks/fetcher.py
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+
+from .rate_limit import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_ENGINE_SETTINGS = {
+    "MAX_CONCURRENCY": 16,  # 프로세스 전체에서 동시에 진행되는 원본 조회 수
+    # 동기 호출(map)이 결과를 기다리는 기본 시간 (초)
+    # 실제 대기 시간은 여기에 요청 한도(초당 요청 수)로 전체 건수를 보내는 시간을 더함
+    "TIMEOUT": 30,
+}
+
+
+class AsyncFetchEngine:
+    """
+    여러 종목/페이지를 동시에 조회하는 asyncio 기반 조회 엔진
+
+    - 프로세스당 이벤트 루프 1개를 백그라운드 스레드에서 계속 실행합니다.
+    - 전역 세마포어로 동시 조회 수를 제한합니다. (요청마다 스레드 풀을 만들지 않음)
+    - 블로킹 HTTP 호출(stocks.http_client)은 고정 크기 실행기에서 수행됩니다.
+    - 동기 코드에서는 map(), 비동기 코드에서는 map_async()를 사용합니다.
+    """
+
+    def __init__(self, max_concurrency=16, timeout=30):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._executor = None
+        self._semaphore = None
+
+    @classmethod
+    def from_settings(cls):
+        options = {
+            **DEFAULT_FETCH_ENGINE_SETTINGS,
+            **getattr(settings, "FETCH_ENGINE", {}),
+        }
+        return cls(
+            max_concurrency=options["MAX_CONCURRENCY"], timeout=options["TIMEOUT"]
+        )
+
+    def _ensure_started(self):
+        # Celery prefork 등으로 fork된 자식 프로세스에서는 루프 스레드가 없으므로 새로 띄움
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="stocks-fetch"
+            )
+            loop.set_default_executor(self._executor)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            thread = threading.Thread(
+                target=loop.run_forever, name="stocks-fetch-loop", daemon=True
+            )
+            thread.start()
+
+            self._loop = loop
+            self._pid = os.getpid()
+            return loop
+
+    async def _run(self, fn, key):
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(None, fn, key)
+
+    async def _gather(self, fn, keys, results=None):
+        # 끝난 항목부터 results에 채움 (시간 초과 시 끝난 항목의 결과는 살림)
+        results = {} if results is None else results
+
+        async def run(key):
+            try:
+                results[key] = await self._run(fn, key)
+            except Exception as e:
+                results[key] = e
+
+        await asyncio.gather(*(run(key) for key in keys))
+        return {key: results[key] for key in keys}
+
+    def timeout_for(self, count):
+        """
+        count건을 기다릴 시간 (초): TIMEOUT + 가장 느린 호스트의 요청 한도로 count건을 보내는 시간
+        (요청 한도 때문에 대기열에서 기다리는 조회가 시간 초과로 잘리지 않도록)
+        """
+        if not rate_limiter.enabled:
+            return self.timeout
+        rates = [rate_limiter.rate] + [
+            options.get("RATE", rate_limiter.rate)
+            for options in rate_limiter.hosts.values()
+        ]
+        return self.timeout + count / min(rates)
+
+    def map(self, fn, keys, timeout=None):
+        """
+        [동기 facade] keys의 각 항목에 fn을 동시에 적용하고 {key: 결과 또는 예외}를 반환합니다.
+        timeout(기본: timeout_for(건수)) 안에 끝나지 않으면 남은 조회를 취소하고,
+        끝나지 않은 항목의 값은 TimeoutError
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        if timeout is None:
+            timeout = self.timeout_for(len(keys))
+        loop = self._ensure_started()
+        results = {}
+        future = asyncio.run_coroutine_threadsafe(self._gather(fn, keys, results), loop)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            done = dict(results)
+            logger.warning(
+                f"조회 시간 초과({timeout:.0f}s): {len(keys) - len(done)}/{len(keys)}건 취소"
+            )
+            return {
+                key: done.get(key, TimeoutError(f"조회 시간 초과 ({timeout:.0f}s)"))
+                for key in keys
+            }
+
+    async def map_async(self, fn, keys):
+        """
+        [비동기 facade] 다른 이벤트 루프(ASGI 등)에서 await 할 수 있는 map()
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._gather(fn, keys), loop)
+        return await asyncio.wrap_future(future)
+
+
+# 프로세스 전역에서 공유하는 조회 엔진
+fetch_engine = AsyncFetchEngine.from_settings()
+
+
+def fetch_prices(stock_codes, fetch=None):
+    """
+    여러 종목의 현재가를 동시에 조회하여 {종목코드: Decimal} 형태로 반환합니다.
+    조회에 실패했거나 시간 초과로 취소된 종목의 값은 None 입니다. (호출자가 처리)
+
+    fetch를 지정하지 않으면 현재가 캐시를 거치는
+    stocks.views.get_current_stock_price_for_trading을 사용합니다.
+    """
+    if fetch is None:
+        from stocks.views import get_current_stock_price_for_trading
+
+        fetch = get_current_stock_price_for_trading
+
+    prices, timed_out = {}, []
+    for code, result in fetch_engine.map(fetch, stock_codes).items():
+        if isinstance(result, TimeoutError):
+            timed_out.append(code)
+            prices[code] = None
+        elif isinstance(result, Exception):
+            logger.error(f"Error fetching price for {code}: {result}")
+            prices[code] = None
+        else:
+            prices[code] = result
+    if timed_out:
+        logger.error(
+            f"현재가 조회 시간 초과: {len(timed_out)}/{len(prices)}개 종목 "
+            f"({', '.join(sorted(timed_out)[:10])}{' ...' if len(timed_out) > 10 else ''})"
+        )
+    return prices
@@ -0,0 +1,179 @@
+# backend/stocks/http_client.py
+
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from .rate_limit import rate_limiter
+
+DEFAULT_NAVER_HTTP_SETTINGS = {
+    "CONNECT_TIMEOUT": 3.05,  # 초
+    "READ_TIMEOUT": 5,  # 초
+    "POOL_MAXSIZE": 10,  # 호스트별 keep-alive 연결 수 (기본값)
+    "HOST_POOL_MAXSIZE": {},  # {"finance.naver.com": 20} 처럼 호스트별로 지정
+    "RETRIES": 2,
+    "BACKOFF_FACTOR": 0.3,
+    "RETRY_STATUSES": (429, 500, 502, 503, 504),
+    "DEFAULT_HEADERS": {"User-Agent": "Mozilla/5.0"},
+}
+
+
+def _http_settings():
+    return {**DEFAULT_NAVER_HTTP_SETTINGS, **getattr(settings, "NAVER_HTTP", {})}
+
+
+class PoolStats:
+    """
+    호스트별 연결 재사용(hit) / 새 연결 생성(miss) 카운터 (스레드 안전)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, host, hit):
+        with self._lock:
+            counts = self._counts.setdefault(host, {"hits": 0, "misses": 0})
+            counts["hits" if hit else "misses"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {host: dict(counts) for host, counts in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+pool_stats = PoolStats()
+
+
+class _CountingPoolMixin:
+    """
+    풀에서 꺼낸 연결에 이미 소켓이 열려 있으면 hit(핸드셰이크 생략),
+    새로 만들었거나 끊겨서 다시 연결해야 하면 miss 로 기록합니다.
+    """
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        pool_stats.record(self.host, hit=getattr(conn, "sock", None) is not None)
+        return conn
+
+
+class CountingHTTPConnectionPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class CountingHTTPSConnectionPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+
+class RateLimitedRetry(Retry):
+    """
+    재시도도 상위 서버에는 요청 1건이므로, urllib3가 재시도하기 전(sleep)에
+    같은 호스트의 요청 제한 토큰을 예약합니다. (한도 초과 시 RateLimitExceeded)
+    """
+
+    host = None
+
+    def increment(self, *args, _pool=None, **kwargs):
+        retry = super().increment(*args, _pool=_pool, **kwargs)
+        retry.host = _pool.host if _pool is not None else self.host
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        if self.host:
+            rate_limiter.acquire(self.host)
+
+
+def _build_retry(options):
+    return RateLimitedRetry(
+        total=options["RETRIES"],
+        backoff_factor=options["BACKOFF_FACTOR"],
+        status_forcelist=options["RETRY_STATUSES"],
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        raise_on_status=False,  # 마지막 응답은 그대로 돌려주고 raise_for_status()에 맡김
+    )
+
+
+def _build_adapters():
+    """
+    모든 스레드의 Session이 공유하는 어댑터(=연결 풀)를 만듭니다.
+    urllib3 연결 풀은 스레드 안전하므로 연결은 프로세스 전체에서 재사용됩니다.
+    """
+    options = _http_settings()
+    retry = _build_retry(options)
+    default_adapter = CountingHTTPAdapter(
+        pool_maxsize=options["POOL_MAXSIZE"], max_retries=retry
+    )
+    host_adapters = {
+        host: CountingHTTPAdapter(pool_maxsize=maxsize, max_retries=retry)
+        for host, maxsize in options["HOST_POOL_MAXSIZE"].items()
+    }
+    return default_adapter, host_adapters
+
+
+_adapters_lock = threading.Lock()
+_adapters = None
+_local = threading.local()
+
+
+def _get_adapters():
+    global _adapters
+    if _adapters is None:
+        with _adapters_lock:
+            if _adapters is None:
+                _adapters = _build_adapters()
+    return _adapters
+
+
+def get_session():
+    """
+    현재 스레드의 Session을 반환합니다.
+    (쿠키 등 Session 상태는 스레드별로, 연결 풀은 프로세스 전체에서 공유)
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        default_adapter, host_adapters = _get_adapters()
+        session = requests.Session()
+        session.headers.update(_http_settings()["DEFAULT_HEADERS"])
+        session.mount("http://", default_adapter)
+        session.mount("https://", default_adapter)
+        for host, adapter in host_adapters.items():
+            session.mount(f"https://{host}/", adapter)
+            session.mount(f"http://{host}/", adapter)
+        _local.session = session
+    return session
+
+
+def get(url, *, headers=None, timeout=None, **kwargs):
+    """
+    네이버 금융 스크래핑용 공통 GET.
+    keep-alive 연결 풀, 기본 연결/읽기 타임아웃, 재시도 정책과
+    호스트별 요청 제한(stocks.rate_limit)이 적용됩니다. (재시도도 토큰을 예약)
+    """
+    rate_limiter.acquire(urlsplit(url).hostname)
+    if timeout is None:
+        options = _http_settings()
+        timeout = (options["CONNECT_TIMEOUT"], options["READ_TIMEOUT"])
+    return get_session().get(url, headers=headers, timeout=timeout, **kwargs)
+
+
+def get_pool_stats():
+    """호스트별 연결 풀 hit/miss 카운터 {host: {"hits": n, "misses": m}}"""
+    return pool_stats.snapshot()
@@ -0,0 +1,197 @@
+# backend/stocks/indicators.py
+
+import logging
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDICATOR_SETTINGS = {
+    "TTL": 60
+    * 60
+    * 24,  # 지표 캐시 유지 시간 (초) - 키에 마지막 봉이 들어가므로 길게 잡아도 됨
+    "CACHE_ALIAS": "default",
+}
+
+INDICATOR_KEY_PREFIX = "stocks:indicators:"
+
+# 지표 이름 -> 기본 파라미터 (파라미터 개수도 이와 같아야 함)
+INDICATOR_DEFAULTS = {
+    "sma": (20,),
+    "ema": (20,),
+    "rsi": (14,),
+    "macd": (12, 26, 9),
+    "bollinger": (20, 2),
+}
+
+# ?indicators= 를 생략했을 때 계산하는 지표
+DEFAULT_SPECS = [
+    "sma:5",
+    "sma:20",
+    "sma:60",
+    "rsi:14",
+    "macd:12:26:9",
+    "bollinger:20:2",
+]
+
+
+def _indicator_settings():
+    return {**DEFAULT_INDICATOR_SETTINGS, **getattr(settings, "INDICATORS", {})}
+
+
+def parse_spec(spec):
+    """
+    'macd:12:26:9' -> ('macd', (12, 26, 9)). 파라미터를 생략하면 기본값.
+    지원하지 않는 지표이거나 파라미터가 잘못되면 ValueError
+    """
+    name, *params = spec.strip().lower().split(":")
+    if name not in INDICATOR_DEFAULTS:
+        raise ValueError(
+            f"지원하지 않는 지표입니다: {name} ({', '.join(INDICATOR_DEFAULTS)})"
+        )
+    defaults = INDICATOR_DEFAULTS[name]
+    if not params:
+        return name, defaults
+    if len(params) != len(defaults):
+        raise ValueError(f"{name} 파라미터는 {len(defaults)}개입니다: {spec}")
+    # 볼린저 밴드의 표준편차 배수만 실수
+    values = tuple(
+        float(p) if name == "bollinger" and i == 1 else int(p)
+        for i, p in enumerate(params)
+    )
+    if any(v <= 0 for v in values) or max(values) > 250:
+        raise ValueError(f"{name} 파라미터는 1~250 사이여야 합니다: {spec}")
+    return name, values
+
+
+def spec_key(name, params):
+    return ":".join([name, *(f"{p:g}" for p in params)])
+
+
+def warmup_length(specs):
+    """지표 값이 안정되기 위해 출력 구간 앞에 더 필요한 봉 수 (EMA 계열은 기간의 3배)"""
+    lengths = [0]
+    for name, params in specs:
+        if name in ("ema", "rsi", "macd"):
+            lengths.append(sum(params) * 3 if name == "macd" else params[0] * 3)
+        else:
+            lengths.append(params[0])
+    return max(lengths)
+
+
+# ------------------------------------------------------------
+# 지표 계산 (close: 오래된 일자부터의 종가 배열)
+# ------------------------------------------------------------
+def _ema(values, span):
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def sma(close, window):
+    """단순 이동평균 (누적합 차이로 한 번에 계산)"""
+    result = np.full(len(close), np.nan)
+    if len(close) >= window:
+        cumsum = np.cumsum(np.insert(close, 0, 0.0))
+        result[window - 1 :] = (cumsum[window:] - cumsum[:-window]) / window
+    return {"sma": result}
+
+
+def ema(close, span):
+    result = _ema(close, span)
+    result[: span - 1] = np.nan
+    return {"ema": result}
+
+
+def rsi(close, period):
+    """
+    Wilder RSI (평균 상승/하락폭을 alpha=1/period 지수평활)
+    첫 값은 등락폭이 period개 쌓인 index period부터 (그 앞은 NaN)
+    """
+    delta = np.diff(close, prepend=np.nan)
+    gain = pd.Series(np.clip(delta, 0, None))
+    loss = pd.Series(np.clip(-delta, 0, None))
+    avg_gain = gain.ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    avg_loss = loss.ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 100 - 100 / (1 + avg_gain / avg_loss)
+    result = np.where(avg_loss == 0, 100.0, result)
+    result[:period] = np.nan
+    return {"rsi": result}
+
+
+def macd(close, fast, slow, signal):
+    line = _ema(close, fast) - _ema(close, slow)
+    signal_line = _ema(line, signal)
+    histogram = line - signal_line
+    line[: slow - 1] = np.nan
+    signal_line[: slow + signal - 2] = np.nan
+    histogram[: slow + signal - 2] = np.nan
+    return {"macd": line, "signal": signal_line, "histogram": histogram}
+
+
+def bollinger(close, window, k):
+    """볼린저 밴드 (중심선: 이동평균, 밴드: ±k * 모표준편차)"""
+    rolling = pd.Series(close).rolling(window)
+    middle = rolling.mean().to_numpy()
+    std = rolling.std(ddof=0).to_numpy()
+    return {"middle": middle, "upper": middle + k * std, "lower": middle - k * std}
+
+
+INDICATORS = {
+    "sma": sma,
+    "ema": ema,
+    "rsi": rsi,
+    "macd": macd,
+    "bollinger": bollinger,
+}
+
+
+def _to_list(values):
+    """NaN은 None, 나머지는 소수 둘째 자리까지"""
+    rounded = np.round(values, 2)
+    return [None if np.isnan(v) else float(v) for v in rounded]
+
+
+def compute_indicator(close, name, params):
+    """지표 하나를 계산하여 {시리즈 이름: 값 리스트}로 반환합니다."""
+    series = INDICATORS[name](np.asarray(close, dtype="float64"), *params)
+    return {key: _to_list(values) for key, values in series.items()}
+
+
+def get_indicators(stock_code, bars, specs):
+    """
+    일별 봉(오래된 일자부터)으로 지표들을 계산합니다.
+    (종목, 지표, 파라미터, 마지막 봉) 별로 캐시하며, 마지막 봉의 일자/종가와
+    봉 수가 같으면 다시 계산하지 않습니다. {spec: {시리즈 이름: 값 리스트}}
+    """
+    if not bars:
+        return {spec_key(name, params): {} for name, params in specs}
+
+    shared = caches[_indicator_settings()["CACHE_ALIAS"]]
+    last = bars[-1]
+    state = f"{last.date.isoformat()}:{last.close}:{len(bars)}"
+    close = None
+
+    results = {}
+    for name, params in specs:
+        key = spec_key(name, params)
+        cache_key = f"{INDICATOR_KEY_PREFIX}{stock_code}:{key}:{state}"
+        try:
+            cached = shared.get(cache_key)
+        except Exception as e:
+            logger.warning(f"지표 캐시 조회 실패({cache_key}): {e}")
+            cached = None
+        if cached is not None:
+            results[key] = cached
+            continue
+
+        if close is None:
+            close = np.fromiter((bar.close for bar in bars), dtype="float64")
+        results[key] = compute_indicator(close, name, params)
+        try:
+            shared.set(cache_key, results[key], timeout=_indicator_settings()["TTL"])
+        except Exception as e:
+            logger.warning(f"지표 캐시 저장 실패({cache_key}): {e}")
+    return results
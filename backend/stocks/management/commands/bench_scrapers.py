@@ -0,0 +1,292 @@
+# backend/stocks/management/commands/bench_scrapers.py
+
+import time
+import tracemalloc
+import urllib.parse
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from stocks import http_client
+from stocks.parsers import (
+    MARKET_SUM_STRAINER,
+    derive_order_book,
+    get_parser_backend,
+    make_soup,
+    parse_current_price,
+    parse_daily_prices,
+    parse_market_index,
+    parse_order_book,
+    parse_search_results,
+    parse_stock_header,
+    parse_time_ticks,
+)
+from stocks.snapshot import MARKET_SUM_URL, parse_market_sum_rows
+
+# 저장된 네이버 금융 페이지 모음 (stocks/testdata/naver)
+CORPUS_DIR = Path(__file__).resolve().parents[2] / "testdata" / "naver"
+# 실제 페이지가 아니라 구조만 따라 만든 저장본 목록 (--record로 내려받으면 목록에서 빠짐)
+SYNTHETIC_LIST = CORPUS_DIR / "SYNTHETIC"
+
+
+@dataclass(frozen=True)
+class ScraperPage:
+    """
+    벤치마크 대상 페이지 한 종류
+    - fixture: CORPUS_DIR 안의 파일 이름
+    - parse: HTML 문자열 -> 파싱 결과 (뷰가 사용하는 것과 같은 파서)
+    - count_rows: 파싱 결과의 행 수 (행당 비용 계산용)
+    - url: --record 시 내려받을 주소 ({code} 자리에 종목 코드)
+    - referer: --record 시 보낼 Referer ({code} 자리에 종목 코드, 없으면 생략)
+    """
+
+    fixture: str
+    parse: Callable
+    count_rows: Callable
+    url: str
+    referer: str = ""
+
+
+def _parse_detail(html):
+    # StockDetailView와 동일: 10단계 페이지 전체 파싱 -> 헤더, 10단계/5단계 호가
+    soup = make_soup(html)
+    order_book_10 = parse_order_book(soup, ask_type=10)
+    return {
+        "header": parse_stock_header(soup),
+        "order_book_10": order_book_10,
+        "order_book_5": derive_order_book(order_book_10, levels=5),
+    }
+
+
+def _parse_market_sum(html):
+    return parse_market_sum_rows(make_soup(html, parse_only=MARKET_SUM_STRAINER))
+
+
+def _count_order_book(order_book):
+    return len(order_book["asks"]) + len(order_book["bids"])
+
+
+SCRAPER_PAGES = {
+    "current_price": ScraperPage(
+        "sise_asktype5.html",
+        parse_current_price,
+        lambda result: 1,
+        "https://finance.naver.com/item/sise.naver?code={code}&asktype=5",
+    ),
+    "market_index": ScraperPage(
+        "sise_main.html",
+        parse_market_index,
+        len,
+        "https://finance.naver.com/sise/",
+    ),
+    "search": ScraperPage(
+        "search.html",
+        parse_search_results,
+        len,
+        "https://finance.naver.com/search/search.naver?query="
+        + urllib.parse.quote("삼성", encoding="euc-kr"),
+    ),
+    "detail": ScraperPage(
+        "sise_asktype10.html",
+        _parse_detail,
+        lambda result: _count_order_book(result["order_book_10"]),
+        "https://finance.naver.com/item/sise.naver?code={code}&asktype=10",
+    ),
+    "ticks": ScraperPage(
+        "sise_time.html",
+        parse_time_ticks,
+        len,
+        "https://finance.naver.com/item/sise_time.naver?code={code}&page=1"
+        "&thistime={thistime}",
+        # 시간별 시세는 Referer가 없으면 빈 표를 돌려줌 (stocks.tick_store와 동일)
+        "https://finance.naver.com/item/sise.naver?code={code}",
+    ),
+    "daily": ScraperPage(
+        "sise_day.html",
+        parse_daily_prices,
+        len,
+        "https://finance.naver.com/item/sise_day.naver?code={code}&page=1",
+    ),
+    "market_sum": ScraperPage(
+        "sise_market_sum.html",
+        _parse_market_sum,
+        len,
+        MARKET_SUM_URL.format(sosok=0, page=1),
+    ),
+}
+
+
+def load_corpus_page(fixture):
+    return (CORPUS_DIR / fixture).read_text(encoding="utf-8")
+
+
+def synthetic_fixtures():
+    """실제 네이버 페이지가 아닌(직접 만든) 저장본 파일 이름 집합"""
+    if not SYNTHETIC_LIST.exists():
+        return set()
+    return {
+        line.strip()
+        for line in SYNTHETIC_LIST.read_text(encoding="utf-8").splitlines()
+        if line.strip() and not line.startswith("#")
+    }
+
+
+def measure(parse, html, iterations):
+    """
+    parse(html)를 iterations번 반복 실행한 평균 시간(초)과,
+    별도 1회 실행의 최대 메모리 사용량(바이트), 파싱 결과를 반환합니다.
+    (tracemalloc은 실행 속도를 떨어뜨리므로 시간 측정과 분리)
+    """
+    result = parse(html)  # 워밍업
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        parse(html)
+    elapsed = (time.perf_counter() - started) / iterations
+
+    tracemalloc.start()
+    try:
+        parse(html)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+class Command(BaseCommand):
+    help = (
+        "저장된 네이버 금융 페이지로 스크래퍼 파서 성능을 측정합니다. "
+        "(네트워크 요청 없음, 합성 저장본은 --allow-synthetic일 때만 측정)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "pages",
+            nargs="*",
+            help=f"측정할 페이지 (기본: 전체) - {', '.join(SCRAPER_PAGES)}",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=50,
+            help="페이지당 반복 횟수 (기본: 50)",
+        )
+        parser.add_argument(
+            "--backend",
+            choices=["auto", "lxml", "html.parser", "all"],
+            default=None,
+            help="HTML 파서 엔진 (기본: HTML_PARSER_BACKEND 설정, all은 두 엔진 비교)",
+        )
+        parser.add_argument(
+            "--allow-synthetic",
+            action="store_true",
+            help="직접 만든(합성) 저장본도 측정합니다. (기준값이 아닌 참고용)",
+        )
+        parser.add_argument(
+            "--record",
+            action="store_true",
+            help="측정 대신 네이버 금융에서 페이지를 새로 내려받아 저장합니다.",
+        )
+        parser.add_argument(
+            "--code",
+            default="005930",
+            help="--record 시 사용할 종목 코드 (기본: 005930)",
+        )
+
+    def handle(self, *args, **options):
+        names = options["pages"] or list(SCRAPER_PAGES)
+        unknown = [name for name in names if name not in SCRAPER_PAGES]
+        if unknown:
+            raise CommandError(f"알 수 없는 페이지: {', '.join(unknown)}")
+
+        if options["record"]:
+            self.record(names, options["code"])
+            return
+
+        if options["iterations"] < 1:
+            raise CommandError("--iterations는 1 이상이어야 합니다.")
+
+        backend = options["backend"]
+        if backend is None:
+            backends = [get_parser_backend()]
+        elif backend == "all":
+            backends = ["html.parser", "lxml"]
+        else:
+            backends = [backend]
+
+        synthetic = synthetic_fixtures()
+        skipped = [name for name in names if SCRAPER_PAGES[name].fixture in synthetic]
+        if skipped and not options["allow_synthetic"]:
+            self.stderr.write(
+                self.style.WARNING(
+                    f"합성 저장본이라 측정하지 않습니다: {', '.join(skipped)} "
+                    "(--record로 실제 페이지를 내려받거나 --allow-synthetic으로 참고용 측정)"
+                )
+            )
+            names = [name for name in names if name not in skipped]
+            if not names:
+                return
+
+        for backend in backends:
+            with override_settings(HTML_PARSER_BACKEND=backend):
+                self.bench(names, options["iterations"])
+
+    def bench(self, names, iterations):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"[{get_parser_backend()}] 페이지당 {iterations}회 반복 측정"
+            )
+        )
+        self.stdout.write(
+            f"{'page':<14} {'KiB':>7} {'rows':>5} {'ms/page':>9} "
+            f"{'us/row':>9} {'parse/s':>9} {'peak KiB':>9}"
+        )
+        synthetic = synthetic_fixtures()
+        for name in names:
+            page = SCRAPER_PAGES[name]
+            html = load_corpus_page(page.fixture)
+            elapsed, peak, result = measure(page.parse, html, iterations)
+            rows = page.count_rows(result)
+            per_row = elapsed / rows * 1e6 if rows else 0.0
+            mark = " *" if page.fixture in synthetic else ""
+            self.stdout.write(
+                f"{name:<14} {len(html.encode('utf-8')) / 1024:>7.1f} {rows:>5} "
+                f"{elapsed * 1e3:>9.3f} {per_row:>9.1f} {1 / elapsed:>9.1f} "
+                f"{peak / 1024:>9.1f}{mark}"
+            )
+        if any(SCRAPER_PAGES[name].fixture in synthetic for name in names):
+            self.stdout.write(
+                self.style.WARNING(
+                    "* 직접 만든(합성) 저장본으로 잰 참고용 값입니다. 실제 페이지보다 "
+                    "마크업이 적어 부분 파싱 효과가 과장되므로 기준값이 아닙니다. "
+                    "(--record로 실제 페이지를 내려받으면 해제)"
+                )
+            )
+
+    def record(self, names, code):
+        thistime = datetime.now().strftime("%Y%m%d") + "180000"
+        for name in names:
+            page = SCRAPER_PAGES[name]
+            url = page.url.format(code=code, thistime=thistime)
+            headers = (
+                {"Referer": page.referer.format(code=code)} if page.referer else None
+            )
+            response = http_client.get(url, headers=headers)
+            response.raise_for_status()
+            (CORPUS_DIR / page.fixture).write_text(response.text, encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"{name}: {url} -> {page.fixture}"))
+
+        # 내려받은 파일은 합성 저장본 목록에서 제거
+        recorded = {SCRAPER_PAGES[name].fixture for name in names}
+        remaining = sorted(synthetic_fixtures() - recorded)
+        if remaining:
+            header = SYNTHETIC_LIST.read_text(encoding="utf-8").splitlines()[:1]
+            SYNTHETIC_LIST.write_text(
+                "\n".join(header + remaining) + "\n", encoding="utf-8"
+            )
+        elif SYNTHETIC_LIST.exists():
+            SYNTHETIC_LIST.unlink()
@@ -1,81 +1,131 @@
-import time
+import json
 
-import requests
-from bs4 import BeautifulSoup
 from django.core.management.base import BaseCommand
 
-from stocks.models import Stock
+from stocks.search_index import bump_search_index_version
+from stocks.snapshot import drop_snapshot_rows
+from stocks.universe import (
+    clear_checkpoints,
+    crawl_markets,
+    stock_sync_settings,
+    sync_stocks,
+)
 
 
 class Command(BaseCommand):
-    help = "네이버 금융에서 KOSPI 주식 정보를 크롤링하여 데이터베이스에 동기화합니다."
+    help = "네이버 금융에서 KOSPI/KOSDAQ 주식 정보를 크롤링하여 데이터베이스에 동기화합니다."
 
-    def handle(self, *args, **options):
-        self.stdout.write(self.style.SUCCESS("KOSPI 주식 정보 동기화를 시작합니다..."))
-
-        # --- 1. 크롤링을 통해 최신 주식 정보 가져오기 ---
-        crawled_stocks = {}
-        # 1페이지부터 48페이지까지 순회
-        for page in range(1, 49):
-            url = f"https://finance.naver.com/sise/sise_market_sum.naver?sosok=0&page={page}"
-            headers = {"User-Agent": "Mozilla/5.0"}
-
-            try:
-                response = requests.get(url, headers=headers)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                stock_rows = soup.select("table.type_2 > tbody > tr[onmouseover]")
-
-                for row in stock_rows:
-                    cols = row.find_all("td")
-                    item_tag = cols[1].find("a")
-
-                    if item_tag:
-                        stock_name = item_tag.get_text(strip=True)
-                        stock_code = item_tag["href"].split("code=")[1]
-                        crawled_stocks[stock_code] = stock_name
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--snapshot",
+            action="store_true",
+            help="종목 DB 동기화 없이 현재가/등락/거래량/시가총액 스냅샷만 갱신합니다.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="이전 실행에서 완료된 페이지는 다시 조회하지 않고 이어서 크롤링합니다.",
+        )
+        parser.add_argument(
+            "--market",
+            action="append",
+            choices=stock_sync_settings()["MARKETS"],
+            help="대상 시장 (여러 번 지정 가능, 기본: 전체)",
+        )
 
-                self.stdout.write(
-                    self.style.SUCCESS(f"{page}/48 페이지 크롤링 완료...")
+    def handle(self, *args, **options):
+        snapshot_only = options["snapshot"]
+        markets = options["market"] or stock_sync_settings()["MARKETS"]
+        if snapshot_only:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{'/'.join(markets)} 시세 스냅샷 갱신을 시작합니다..."
                 )
-                time.sleep(0.5)  # 서버에 부담을 주지 않기 위해 잠시 대기
-
-            except requests.exceptions.RequestException as e:
-                self.stderr.write(
-                    self.style.ERROR(f"{page} 페이지 크롤링 중 오류 발생: {e}")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{'/'.join(markets)} 주식 정보 동기화를 시작합니다..."
                 )
-                continue
+            )
 
-        self.stdout.write(
-            self.style.SUCCESS(f"총 {len(crawled_stocks)}개의 종목을 크롤링했습니다.")
+        # --- 1. 크롤링을 통해 최신 주식 정보 가져오기 (시장/페이지 동시 조회) ---
+        results = crawl_markets(
+            markets,
+            resume=options["resume"] and not snapshot_only,
+            checkpoint=not snapshot_only,
         )
 
-        # --- 2. 데이터베이스와 동기화 ---
-        # DB에 저장된 모든 종목 코드 가져오기
-        db_stock_codes = set(Stock.objects.values_list("stock_code", flat=True))
-        crawled_stock_codes = set(crawled_stocks.keys())
-
-        # 상장 폐지된 종목 찾기 (DB에는 있지만 크롤링 결과에는 없는 종목)
-        codes_to_delete = db_stock_codes - crawled_stock_codes
-        if codes_to_delete:
-            Stock.objects.filter(stock_code__in=codes_to_delete).delete()
+        crawled_stocks = {}
+        for market, result in results.items():
+            stocks = result.stocks
+            crawled_stocks.update(
+                {code: (name, market) for code, name in stocks.items()}
+            )
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"{len(codes_to_delete)}개의 상장 폐지 종목을 삭제했습니다."
+                    f"[{market}] {result.pages}페이지 중 {result.fetched}개 조회: "
+                    f"{len(stocks)}개 종목, 시세 스냅샷 {result.snapshot_count}개"
                 )
             )
-
-        # 신규 또는 업데이트할 종목 처리
-        for stock_code, stock_name in crawled_stocks.items():
-            # DB에 없으면 생성(created=True), 있으면 정보 업데이트(created=False)
-            stock, created = Stock.objects.update_or_create(
-                stock_code=stock_code,
-                defaults={"stock_name": stock_name, "market_type": "KOSPI"},
+            for page, error in sorted(result.failed.items()):
+                self.stderr.write(
+                    self.style.ERROR(
+                        f"[{market}] {page} 페이지 크롤링 중 오류 발생: {error}"
+                    )
+                )
+        if snapshot_only:
+            return
+
+        # 일부 페이지가 빠진 채로 동기화하면 그 페이지의 종목이 상장 폐지로 삭제되므로 중단
+        incomplete = [
+            market for market, result in results.items() if not result.complete
+        ]
+        if incomplete:
+            self.stderr.write(
+                self.style.ERROR(
+                    f"{', '.join(incomplete)} 페이지를 모두 가져오지 못해 동기화를 중단합니다. "
+                    "--resume 옵션으로 다시 실행하면 실패한 페이지만 조회합니다."
+                )
+            )
+            return
+
+        # --- 2. 데이터베이스와 동기화 (바뀐 종목만 쓰기) ---
+        changes = sync_stocks(crawled_stocks, markets)
+        clear_checkpoints()
+
+        for code, name in sorted(changes.inserted.items()):
+            self.stdout.write(f"[추가] {name} ({code})")
+        for code, (old, new) in sorted(changes.renamed.items()):
+            self.stdout.write(f"[이름 변경] {old} -> {new} ({code})")
+        for code, (old, new) in sorted(changes.remarketed.items()):
+            self.stdout.write(f"[시장 변경] {old} -> {new} ({code})")
+        for code in sorted(changes.delisted):
+            self.stdout.write(f"[삭제] {code}")
+        if changes.protected:
+            self.stderr.write(
+                self.style.WARNING(
+                    f"주문/거래/보유 내역이 있어 삭제하지 않은 종목: "
+                    f"{', '.join(sorted(changes.protected))}"
+                )
+            )
+        if changes.unverified:
+            self.stderr.write(
+                self.style.WARNING(
+                    f"{'/'.join(markets)}에서 빠졌지만 다른 시장으로 옮겼을 수 있어 "
+                    f"삭제하지 않은 종목 (전체 시장 동기화에서 확정): "
+                    f"{', '.join(sorted(changes.unverified))}"
+                )
             )
-            if created:
-                self.stdout.write(f"[추가] {stock.stock_name} ({stock.stock_code})")
 
+        if changes:
+            # 상장 폐지 종목의 시세 스냅샷을 지우고,
+            # 모든 프로세스의 종목 검색 색인을 새 종목 DB로 다시 만들도록 알림
+            drop_snapshot_rows(changes.delisted)
+            bump_search_index_version()
+
+        # 변경 요약 (한 줄 JSON)
+        self.stdout.write(json.dumps(changes.summary()))
         self.stdout.write(
             self.style.SUCCESS("데이터베이스 동기화가 성공적으로 완료되었습니다.")
         )
@@ -0,0 +1,101 @@
+# backend/stocks/management/commands/ingest_daily_bars.py
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from stocks.eod_ingest import (
+    MARKETS,
+    catch_up_start,
+    ingest_market_catch_up,
+    ingest_market_range,
+)
+from stocks.models import DailyBarIngestion
+
+
+class Command(BaseCommand):
+    help = (
+        "pykrx로 시장 전체의 일별 시세(OHLCV)를 일자/시장별 한 번의 조회로 받아 저장합니다. "
+        "기간을 지정하면 완료된 일자는 건너뛰고 이어서 수집합니다. "
+        "일자/기간을 지정하지 않으면 종목별 마지막 저장 일자 다음 날부터 오늘까지 수집합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="수집할 일자 (YYYY-MM-DD, 기본: 마지막 저장 일자 다음 날부터 오늘까지)",
+            default=None,
+        )
+        parser.add_argument(
+            "--from", dest="start", help="기간 수집 시작일 (YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--to", dest="end", help="기간 수집 종료일 (YYYY-MM-DD, 기본: 오늘)"
+        )
+        parser.add_argument(
+            "--market",
+            choices=MARKETS,
+            action="append",
+            help="수집할 시장 (여러 번 지정 가능, 기본: 전체)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="이미 완료로 기록된 일자도 다시 수집합니다.",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        markets = options["market"] or MARKETS
+        try:
+            if options["start"]:
+                start = date.fromisoformat(options["start"])
+                end = date.fromisoformat(options["end"]) if options["end"] else today
+            elif options["date"]:
+                start = end = date.fromisoformat(options["date"])
+            else:
+                start = end = None  # 밀린 일자부터 오늘까지
+        except ValueError as e:
+            raise CommandError(f"잘못된 일자입니다: {e}")
+        if start is not None and end < start:
+            raise CommandError("종료일은 시작일 이후여야 합니다.")
+
+        if start is None:
+            for market in markets:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{catch_up_start(market, today)} ~ {today} {market} "
+                        "일별 시세 일괄 수집을 시작합니다..."
+                    )
+                )
+            logs = ingest_market_catch_up(today, markets=markets)
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{start} ~ {end} {', '.join(markets)} 일별 시세 일괄 수집을 시작합니다..."
+                )
+            )
+            logs = ingest_market_range(
+                start, end, markets=markets, force=options["force"]
+            )
+
+        failed = 0
+        for log in logs:
+            message = f"{log.date} {log.market_type}: {log.get_status_display()} ({log.row_count}건)"
+            if log.status == DailyBarIngestion.STATUS_FAILED:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f"{message} - {log.error}"))
+            elif log.status == DailyBarIngestion.STATUS_EMPTY:
+                self.stdout.write(
+                    self.style.WARNING(f"{message} - 다음 실행에서 다시 수집합니다.")
+                )
+            else:
+                self.stdout.write(message)
+
+        total = sum(log.row_count for log in logs)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"총 {len(logs)}건 중 실패 {failed}건, {total}개 일별 봉을 저장했습니다."
+            )
+        )
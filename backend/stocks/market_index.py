@@ -0,0 +1,113 @@
+# backend/stocks/market_index.py
+
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from . import http_client
+from .parsers import parse_market_index
+from .response_cache import make_etag
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MARKET_INDEX_SETTINGS = {
+    "INTERVAL": 30,  # 갱신 주기 (초) - Celery beat가 이 주기로 갱신
+    "STALE_AFTER": 120,  # 마지막 갱신 후 이 시간이 지나면 stale로 표시하고 요청 경로에서 한 번 갱신 시도 (초)
+    "TTL": 60
+    * 60
+    * 24,  # 캐시 보관 시간 (초) - 상위 서버 장애 시 마지막 값을 계속 반환
+    "LOCK_TIMEOUT": 10,  # 요청 경로 갱신 락 유지 시간 (초)
+    "CACHE_ALIAS": "default",
+}
+
+POLL_INTERVAL = 0.05
+
+MARKET_INDEX_URL = "https://finance.naver.com/sise/"
+MARKET_INDEX_KEY = "stocks:market-index"
+REFRESH_LOCK_KEY = "stocks:market-index-lock"
+
+
+def market_index_settings():
+    return {**DEFAULT_MARKET_INDEX_SETTINGS, **getattr(settings, "MARKET_INDEX", {})}
+
+
+def _shared():
+    return caches[market_index_settings()["CACHE_ALIAS"]]
+
+
+def get_cached_market_index():
+    """
+    캐시된 시장 지수 항목 {data, etag, as_of, fetched_at} (없으면 None)
+    Redis 장애 시에도 None을 반환하여 호출 측이 직접 조회하도록 합니다.
+    """
+    try:
+        return _shared().get(MARKET_INDEX_KEY)
+    except Exception as e:
+        logger.warning(f"시장 지수 캐시 조회 실패: {e}")
+        return None
+
+
+def is_stale(entry):
+    return time.time() - entry["fetched_at"] > market_index_settings()["STALE_AFTER"]
+
+
+def refresh_market_index():
+    """
+    네이버 금융 메인에서 KOSPI/KOSDAQ 지수를 스크래핑하여 캐시에 기록하고 항목을 반환합니다.
+    요청 실패(requests.exceptions.RequestException)나 파싱 실패 시 예외를 그대로 올리며,
+    이 경우 캐시에 있던 마지막 값은 그대로 남습니다.
+    """
+    response = http_client.get(MARKET_INDEX_URL, headers={"User-Agent": "Mozilla/5.0"})
+    response.raise_for_status()
+    data = parse_market_index(response.text)
+
+    entry = {
+        "data": data,
+        "etag": make_etag(data),
+        "as_of": timezone.now().isoformat(),
+        "fetched_at": time.time(),
+    }
+    try:
+        _shared().set(MARKET_INDEX_KEY, entry, timeout=market_index_settings()["TTL"])
+    except Exception as e:
+        logger.warning(f"시장 지수 캐시 저장 실패: {e}")
+    return entry
+
+
+def _wait_for_refresh(timeout):
+    """다른 요청의 첫 갱신 결과가 캐시에 올라올 때까지 기다립니다. (시간 초과 시 None)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = get_cached_market_index()
+        if entry is not None:
+            return entry
+    return None
+
+
+def try_refresh_market_index(previous=None):
+    """
+    요청 경로용 갱신. 다른 요청/프로세스가 갱신 중이면 직접 조회하지 않고
+    previous(오래된 항목)를 그대로 반환하며, previous도 없으면 갱신 결과를 기다립니다.
+    (갱신 주기 동안 상위 서버 요청은 클라이언트 수와 관계없이 한 번)
+    """
+    options = market_index_settings()
+    try:
+        locked = _shared().add(REFRESH_LOCK_KEY, 1, timeout=options["LOCK_TIMEOUT"])
+    except Exception as e:
+        logger.warning(f"시장 지수 갱신 락 획득 실패: {e}")
+        locked = True
+    if not locked:
+        if previous is not None:
+            return previous
+        return _wait_for_refresh(options["LOCK_TIMEOUT"])
+    try:
+        return refresh_market_index()
+    finally:
+        try:
+            _shared().delete(REFRESH_LOCK_KEY)
+        except Exception as e:
+            logger.warning(f"시장 지수 갱신 락 해제 실패: {e}")
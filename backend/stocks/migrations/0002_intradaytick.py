@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stocks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IntradayTick",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("trade_date", models.DateField(verbose_name="거래일")),
+                ("tick_time", models.TimeField(verbose_name="체결시각")),
+                ("price", models.IntegerField(verbose_name="체결가")),
+                ("change", models.IntegerField(verbose_name="전일비")),
+                (
+                    "sell_price",
+                    models.IntegerField(blank=True, null=True, verbose_name="매도호가"),
+                ),
+                (
+                    "buy_price",
+                    models.IntegerField(blank=True, null=True, verbose_name="매수호가"),
+                ),
+                ("volume", models.BigIntegerField(verbose_name="누적 거래량")),
+                ("volume_change", models.BigIntegerField(verbose_name="변동량")),
+                (
+                    "stock",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="intraday_ticks",
+                        to="stocks.stock",
+                        verbose_name="종목",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-trade_date", "-tick_time"],
+                "unique_together": {("stock", "trade_date", "tick_time")},
+            },
+        ),
+    ]
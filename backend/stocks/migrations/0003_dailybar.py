@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stocks", "0002_intradaytick"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyBar",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="일자")),
+                ("open", models.IntegerField(verbose_name="시가")),
+                ("high", models.IntegerField(verbose_name="고가")),
+                ("low", models.IntegerField(verbose_name="저가")),
+                ("close", models.IntegerField(verbose_name="종가")),
+                ("change", models.IntegerField(default=0, verbose_name="전일비")),
+                ("volume", models.BigIntegerField(verbose_name="거래량")),
+                (
+                    "stock",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_bars",
+                        to="stocks.stock",
+                        verbose_name="종목",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date"],
+                "unique_together": {("stock", "date")},
+            },
+        ),
+    ]
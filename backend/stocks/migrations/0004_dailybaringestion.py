@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-17 18:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stocks", "0003_dailybar"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyBarIngestion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="일자")),
+                ("market_type", models.CharField(max_length=10, verbose_name="시장")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("success", "완료"),
+                            ("holiday", "휴장"),
+                            ("failed", "실패"),
+                        ],
+                        max_length=10,
+                        verbose_name="상태",
+                    ),
+                ),
+                (
+                    "row_count",
+                    models.IntegerField(default=0, verbose_name="저장 행 수"),
+                ),
+                (
+                    "error",
+                    models.TextField(blank=True, default="", verbose_name="오류"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(auto_now=True, verbose_name="수집 시각"),
+                ),
+            ],
+            options={
+                "ordering": ["-date", "market_type"],
+                "unique_together": {("date", "market_type")},
+            },
+        ),
+    ]
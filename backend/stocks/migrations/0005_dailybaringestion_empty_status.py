@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-17 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stocks", "0004_dailybaringestion"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="dailybaringestion",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("success", "완료"),
+                    ("holiday", "휴장"),
+                    ("empty", "미공개"),
+                    ("failed", "실패"),
+                ],
+                max_length=10,
+                verbose_name="상태",
+            ),
+        ),
+    ]
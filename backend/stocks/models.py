@@ -17,3 +17,98 @@ class Stock(models.Model):
 
     def __str__(self):
         return f"[{self.stock_code}] {self.stock_name}"
+
+
+class IntradayTick(models.Model):
+    """
+    시간별 시세(sise_time.naver) 저장소.
+    한 행이 (종목, 거래일, 체결시각) 한 건이며, 가격/거래량은 숫자로 저장합니다.
+    """
+
+    stock = models.ForeignKey(
+        Stock,
+        on_delete=models.CASCADE,
+        related_name="intraday_ticks",
+        verbose_name="종목",
+    )
+    trade_date = models.DateField(verbose_name="거래일")
+    tick_time = models.TimeField(verbose_name="체결시각")
+    price = models.IntegerField(verbose_name="체결가")
+    change = models.IntegerField(verbose_name="전일비")  # 하락은 음수
+    sell_price = models.IntegerField(null=True, blank=True, verbose_name="매도호가")
+    buy_price = models.IntegerField(null=True, blank=True, verbose_name="매수호가")
+    volume = models.BigIntegerField(verbose_name="누적 거래량")
+    volume_change = models.BigIntegerField(verbose_name="변동량")
+
+    class Meta:
+        # 같은 체결시각은 한 번만 저장 (최신 분은 다시 수집하면 갱신)
+        unique_together = ("stock", "trade_date", "tick_time")
+        ordering = ["-trade_date", "-tick_time"]
+
+    def __str__(self):
+        return f"[{self.stock_id}] {self.trade_date} {self.tick_time} {self.price}"
+
+
+class DailyBar(models.Model):
+    """
+    일별 시세(sise_day.naver) 저장소.
+    한 행이 (종목, 일자) 하루치 봉이며, 지난 일자는 바뀌지 않으므로 새 일자만 수집합니다.
+    """
+
+    stock = models.ForeignKey(
+        Stock,
+        on_delete=models.CASCADE,
+        related_name="daily_bars",
+        verbose_name="종목",
+    )
+    date = models.DateField(verbose_name="일자")
+    open = models.IntegerField(verbose_name="시가")
+    high = models.IntegerField(verbose_name="고가")
+    low = models.IntegerField(verbose_name="저가")
+    close = models.IntegerField(verbose_name="종가")
+    change = models.IntegerField(default=0, verbose_name="전일비")  # 하락은 음수
+    volume = models.BigIntegerField(verbose_name="거래량")
+
+    class Meta:
+        # (종목, 일자) 유니크 인덱스로 기간 조회도 인덱스 범위 검색 한 번으로 처리
+        unique_together = ("stock", "date")
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"[{self.stock_id}] {self.date} {self.close}"
+
+
+class DailyBarIngestion(models.Model):
+    """
+    시장 전체 일별 시세 일괄 수집(stocks.eod_ingest) 기록.
+    (일자, 시장)마다 한 행이며, 기간 수집을 이어서 할 때 완료된 일자를 건너뛰는 데 씁니다.
+    """
+
+    STATUS_SUCCESS = "success"
+    STATUS_HOLIDAY = "holiday"  # 휴장일 (조회 결과 없음, 이후 거래일은 수집됨)
+    STATUS_EMPTY = "empty"  # 조회 결과 없음 (아직 공개 전일 수 있어 다시 수집)
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_SUCCESS, "완료"),
+        (STATUS_HOLIDAY, "휴장"),
+        (STATUS_EMPTY, "미공개"),
+        (STATUS_FAILED, "실패"),
+    ]
+    # 다시 수집해야 하는 상태
+    RETRY_STATUSES = (STATUS_EMPTY, STATUS_FAILED)
+
+    date = models.DateField(verbose_name="일자")
+    market_type = models.CharField(max_length=10, verbose_name="시장")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, verbose_name="상태"
+    )
+    row_count = models.IntegerField(default=0, verbose_name="저장 행 수")
+    error = models.TextField(blank=True, default="", verbose_name="오류")
+    finished_at = models.DateTimeField(auto_now=True, verbose_name="수집 시각")
+
+    class Meta:
+        unique_together = ("date", "market_type")
+        ordering = ["-date", "market_type"]
+
+    def __str__(self):
+        return f"{self.date} {self.market_type} {self.status} ({self.row_count})"
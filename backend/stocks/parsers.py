@@ -0,0 +1,447 @@
+# backend/stocks/parsers.py
+
+import logging
+import re
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, SoupStrainer
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------------
+# 부분 파싱 대상 (SoupStrainer)
+# 페이지 전체 대신 필요한 요소(와 그 하위 요소)만 트리로 만듭니다.
+# ----------------------------------------------------------------
+# 현재가 (sise.naver) - <strong id="_nowVal">
+NOW_PRICE_STRAINER = SoupStrainer(id="_nowVal")
+
+# 시장 지수 (sise/) - KOSPI/KOSDAQ 현재 지수, 등락, 차트 영역
+MARKET_INDEX_STRAINER = SoupStrainer(
+    id=re.compile(r"^(KOSPI|KOSDAQ)_(now|change)$|^tab_sel[12]_sise_main_chart$")
+)
+
+# 종목 검색 결과 (search.naver) - table.tbl_search
+SEARCH_RESULT_STRAINER = SoupStrainer("table", class_="tbl_search")
+
+# 호가/시간별/일별 시세 (sise.naver, sise_time.naver, sise_day.naver) - table.type2
+TYPE2_TABLE_STRAINER = SoupStrainer("table", class_="type2")
+
+# 시가총액 (sise_market_sum.naver) - table.type_2 + 페이지 네비게이션(table.Nnavi)
+MARKET_SUM_STRAINER = SoupStrainer("table", class_=["type_2", "Nnavi"])
+
+
+@lru_cache(maxsize=None)
+def _resolve_backend(backend):
+    if backend != "auto":
+        return backend
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+def get_parser_backend():
+    """
+    HTML_PARSER_BACKEND 설정값 ("auto", "lxml", "html.parser")에 따른 파서 이름.
+    "auto"는 lxml이 설치되어 있으면 lxml, 없으면 순수 파이썬 html.parser를 사용합니다.
+    """
+    return _resolve_backend(getattr(settings, "HTML_PARSER_BACKEND", "auto"))
+
+
+def make_soup(markup, parse_only=None):
+    """
+    스크래핑 공통 파서 진입점.
+    parse_only에 위의 SoupStrainer를 넘기면 해당 요소만 파싱합니다.
+    """
+    return BeautifulSoup(markup, get_parser_backend(), parse_only=parse_only)
+
+
+# ================================================================
+# 페이지별 파서
+# 네트워크 없이 HTML 문자열(또는 soup)만으로 동작하므로
+# 뷰와 bench_scrapers 명령, 테스트에서 함께 사용합니다.
+# ================================================================
+def parse_current_price(html):
+    """
+    현재가 페이지(sise.naver)에서 '#_nowVal' 현재가를 Decimal로 반환합니다.
+    현재가 요소가 없거나 숫자가 아니면 ValueError를 발생시킵니다.
+    """
+    soup = make_soup(html, parse_only=NOW_PRICE_STRAINER)
+
+    # 네이버 증권의 현재가 ID 선택자
+    price_strong = soup.select_one("#_nowVal")
+    if not price_strong:
+        raise ValueError("현재가 정보를 찾을 수 없습니다.")
+
+    price_str = price_strong.get_text(strip=True).replace(",", "")
+    try:
+        return Decimal(price_str)
+    except InvalidOperation:
+        raise ValueError(f"현재가 '{price_str}'를 숫자로 변환할 수 없습니다.")
+
+
+def parse_change_data(change_element):
+    """
+    등락률 정보를 담은 HTML 요소를 파싱하여 딕셔너리로 반환하는 헬퍼 함수
+    예: "91.09 +2.49%상승" -> {'change': '91.09', 'change_percent': '+2.49%', 'status': '상승'}
+    """
+    full_text = change_element.get_text(strip=True)
+    status_text = change_element.find("span", class_="blind").get_text(
+        strip=True
+    )  # "상승" 또는 "하락"
+
+    # "상승" 또는 "하락" 텍스트를 제외한 나머지 부분
+    data_part = full_text.replace(status_text, "").strip()
+
+    parts = data_part.split()
+    change_value = parts[0]
+    change_rate = parts[1] if len(parts) > 1 else ""
+
+    return {
+        "change": change_value,
+        "change_percent": change_rate,
+        "status": status_text,
+    }
+
+
+def parse_market_index(html):
+    """
+    시장 지수 페이지(sise/)에서 KOSPI/KOSDAQ 지수, 등락, 차트 URL을 추출합니다.
+    """
+    soup = make_soup(html, parse_only=MARKET_INDEX_STRAINER)
+
+    data = {}
+    for key, market, chart_id in (
+        ("kospi", "KOSPI", "tab_sel1_sise_main_chart"),
+        ("kosdaq", "KOSDAQ", "tab_sel2_sise_main_chart"),
+    ):
+        change_data = parse_change_data(soup.select_one(f"#{market}_change"))
+        data[key] = {
+            "index": soup.select_one(f"#{market}_now").get_text(strip=True),
+            "change": change_data["change"],
+            "change_percent": change_data["change_percent"],
+            "status": change_data["status"],
+            "chart_url": soup.select_one(f"#{chart_id} img")["src"],
+        }
+    return data
+
+
+def parse_search_results(html):
+    """
+    종목 검색 결과 페이지(search.naver)의 국내종목 목록을 파싱합니다.
+    [{name, code, price, changeRate}, ...] (검색 결과 표가 없으면 빈 리스트)
+    """
+    soup = make_soup(html, parse_only=SEARCH_RESULT_STRAINER)
+
+    search_table = soup.find("table", class_="tbl_search", summary="국내종목 검색 결과")
+    if not search_table:
+        return []
+
+    results = []
+    for row in search_table.find("tbody").find_all("tr"):
+        columns = row.find_all("td")
+        if len(columns) < 3:
+            continue
+        name_tag = columns[0].find("a")
+        if not name_tag:
+            continue
+        change_rate_text = columns[2].get_text(strip=True).replace("%", "")
+        try:
+            change_rate = float(change_rate_text)
+        except ValueError:
+            change_rate = 0.0
+        results.append(
+            {
+                "name": name_tag.get_text(strip=True),
+                "code": name_tag["href"].split("code=")[1],
+                "price": columns[1].get_text(strip=True),
+                "changeRate": change_rate,
+            }
+        )
+    return results
+
+
+# 헬퍼 함수 (로그 제거)
+def parse_span_numbers(span_elements):
+    number_str = ""
+    for span in span_elements:
+        class_list = span.get("class", [])
+        if not class_list:
+            continue
+
+        class_name = class_list[0]
+        if "no" in class_name:
+            digit = class_name.replace("no", "")
+            number_str += digit
+        elif "jum" in class_name:
+            number_str += "."
+        elif "shim" in class_name:
+            number_str += ","
+
+    return number_str
+
+
+# 헬퍼 함수 (로그 제거)
+def parse_sign(span_element):
+    if span_element is None:
+        return ""
+
+    class_list = span_element.get("class", [])
+
+    if "plus" in class_list:
+        return "+"
+    elif "minus" in class_list:
+        return "-"
+
+    return ""
+
+
+def parse_stock_header(soup):
+    """
+    종목 시세 페이지(sise.naver)의 헤더(종목명, 현재가, 전일비, 등락률)를 파싱합니다.
+    '#rate_info_krx' 영역이 없으면 None을 반환합니다.
+    """
+    rate_info = soup.select_one("div#rate_info_krx")
+    if not rate_info:
+        return None
+
+    all_ems = rate_info.select('em[class*="no_"]')
+    price_em, change_price_em, change_rate_em = (
+        all_ems[0],
+        all_ems[1],
+        all_ems[2],
+    )
+    price = parse_span_numbers(
+        price_em.select('span[class*="no"], span[class*="shim"]')
+    )
+    status_text = (
+        change_price_em.select_one("span.ico").get_text(strip=True)
+        if change_price_em.select_one("span.ico")
+        else "보합"
+    )
+    change = parse_span_numbers(change_price_em.select('span[class*="no"]'))
+    sign = parse_sign(change_rate_em.select_one("span.ico"))
+    change_rate = (
+        sign
+        + parse_span_numbers(
+            change_rate_em.select('span[class*="no"], span[class*="jum"]')
+        )
+        + "%"
+    )
+    return {
+        "name": soup.title.get_text().split(" : ")[0],
+        "price": price,
+        "change": change,
+        "change_rate": change_rate,
+        "status": status_text,
+    }
+
+
+def parse_order_book(soup, ask_type):
+    """
+    5단계/10단계 HTML 구조를 구분하여 호가창 정보를 파싱합니다.
+    """
+    asks = []  # 매도
+    bids = []  # 매수
+    total_ask_vol = ""
+    total_bid_vol = ""
+
+    order_book_table = soup.select_one(
+        'table.type2[summary="호가 정보에 관한표입니다."]'
+    )
+
+    if order_book_table:
+        rows = order_book_table.select("tbody > tr")
+
+        if ask_type == 10:
+            # --- 10단계 파서 (한 행에 매도/매수가 모두 있음) ---
+            data_rows = [r for r in rows if r.select("td.bg01") and r.select("td.bg02")]
+            for row in reversed(data_rows):  # 매도는 가격 높은 순 -> 낮은 순
+                ask_cols = row.select("td.bg01")
+                if len(ask_cols) == 2:
+                    asks.append(
+                        {
+                            "price": ask_cols[1].get_text(strip=True),
+                            "volume": ask_cols[0].get_text(strip=True),
+                        }
+                    )
+
+            for row in data_rows:  # 매수는 가격 높은 순 -> 낮은 순
+                bid_cols = row.select("td.bg02")
+                if len(bid_cols) == 2:
+                    bids.append(
+                        {
+                            "price": bid_cols[0].get_text(strip=True),
+                            "volume": bid_cols[1].get_text(strip=True),
+                        }
+                    )
+
+        else:
+            # --- 5단계 파서 (매도/매수 행이 분리됨) ---
+            ask_rows = [
+                r for r in rows if r.select("td.bg01") and not r.select("td.bg02")
+            ]
+            for row in reversed(ask_rows):
+                cols = row.select("td.bg01")
+                if len(cols) == 2:
+                    asks.append(
+                        {
+                            "price": cols[1].get_text(strip=True),
+                            "volume": cols[0].get_text(strip=True),
+                        }
+                    )
+
+            bid_rows = [
+                r for r in rows if r.select("td.bg02") and not r.select("td.bg01")
+            ]
+            for row in bid_rows:
+                cols = row.select("td.bg02")
+                if len(cols) == 2:
+                    bids.append(
+                        {
+                            "price": cols[0].get_text(strip=True),
+                            "volume": cols[1].get_text(strip=True),
+                        }
+                    )
+
+    # --- 잔량합계 파싱 (공통) ---
+    totals_table = soup.select_one(
+        'table.type2[summary="호가 정보에 관한표입니다."] + table.type2'
+    )
+    if totals_table:
+        total_ask_vol_element = totals_table.select_one("td.bor strong")
+        if total_ask_vol_element:
+            total_ask_vol = total_ask_vol_element.get_text(strip=True)
+
+        total_bid_vol_element = totals_table.select_one("th.num strong")
+        if total_bid_vol_element:
+            total_bid_vol = total_bid_vol_element.get_text(strip=True)
+
+    return {
+        "asks": asks,
+        "bids": bids,
+        "total_ask_volume": total_ask_vol,
+        "total_bid_volume": total_bid_vol,
+    }
+
+
+def _to_number(text):
+    """'80,400' -> 80400, 숫자가 아니면 None"""
+    try:
+        return int(text.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def derive_order_book(order_book, levels=5):
+    """
+    10단계 호가에서 최우선 levels단계 호가를 만듭니다.
+    매도는 낮은 가격부터, 매수는 높은 가격부터 levels개를 고르며,
+    잔량합계는 고른 단계의 잔량을 더한 값입니다.
+    """
+    asks = sorted(
+        (level for level in order_book["asks"] if _to_number(level["price"])),
+        key=lambda level: _to_number(level["price"]),
+    )[:levels]
+    bids = sorted(
+        (level for level in order_book["bids"] if _to_number(level["price"])),
+        key=lambda level: _to_number(level["price"]),
+        reverse=True,
+    )[:levels]
+
+    def total(side):
+        return f"{sum(_to_number(level['volume']) or 0 for level in side):,}"
+
+    return {
+        "asks": asks,
+        "bids": bids,
+        "total_ask_volume": total(asks),
+        "total_bid_volume": total(bids),
+    }
+
+
+def parse_time_ticks(html):
+    """
+    시간별 시세 페이지(sise_time.naver)의 체결 행을 파싱합니다.
+    """
+    soup = make_soup(html, parse_only=TYPE2_TABLE_STRAINER)
+
+    ticks_data = []
+    for row in soup.select("table.type2 > tr[onmouseover]"):
+        cols = row.select("td")
+        if len(cols) != 7:
+            continue
+
+        try:
+            # 변수 'time' 대신 'tick_time'을 사용하여 time 모듈과의 충돌 방지
+            tick_time = cols[0].get_text(strip=True)
+            price = cols[1].get_text(strip=True)
+
+            change_status_span = cols[2].select_one("em span.blind")
+            change_status = (
+                change_status_span.get_text(strip=True) if change_status_span else ""
+            )
+            change = cols[2].get_text(strip=True).replace(change_status, "").strip()
+
+            if not tick_time or not price:
+                # 페이지 하단의 빈 줄
+                logger.debug(f"Skipping empty row: {row.get_text(strip=True)}")
+                continue
+
+            ticks_data.append(
+                {
+                    "time": tick_time,
+                    "price": price,
+                    "change": change,
+                    "change_status": change_status,
+                    "sell_price": cols[3].get_text(strip=True),
+                    "buy_price": cols[4].get_text(strip=True),
+                    "volume": cols[5].get_text(strip=True),
+                    "volume_change": cols[6].get_text(strip=True),
+                }
+            )
+        except Exception as ex:
+            logger.debug(
+                f"Skipping row due to parsing error: {ex} in row: {row.get_text(strip=True)}"
+            )
+            continue
+    return ticks_data
+
+
+def parse_daily_prices(html):
+    """
+    일별 시세 페이지(sise_day.naver)의 일자별 행을 파싱합니다.
+    """
+    soup = make_soup(html, parse_only=TYPE2_TABLE_STRAINER)
+
+    daily_data = []
+    for row in soup.select("table.type2 > tr[onmouseover]"):
+        cols = row.select("td")
+        if len(cols) != 7:
+            continue
+
+        # cols[2] ('전일비' td) 안에서 'em span.blind'로 상승/하락을 찾습니다.
+        change_status_span = cols[2].select_one("em span.blind")
+        change_status = (
+            change_status_span.get_text(strip=True) if change_status_span else ""
+        )
+        change_value = (
+            cols[2].get_text(strip=True).replace(change_status, "").strip()
+        )  # 상태 텍스트 제거
+
+        daily_data.append(
+            {
+                "date": cols[0].get_text(strip=True),
+                "close": cols[1].get_text(strip=True),
+                "change": change_value,
+                "change_status": change_status,  # "상승" 또는 "하락"
+                "open": cols[3].get_text(strip=True),
+                "high": cols[4].get_text(strip=True),
+                "low": cols[5].get_text(strip=True),
+                "volume": cols[6].get_text(strip=True),
+            }
+        )
+    return daily_data
@@ -0,0 +1,317 @@
+# backend/stocks/quote_cache.py
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUOTE_CACHE_SETTINGS = {
+    "TTL": 5,
+    "MAX_ENTRIES": 4096,
+    "LOCK_TIMEOUT": 10,
+    "WAIT_TIMEOUT": 5,
+    "CACHE_ALIAS": "default",
+}
+
+
+@dataclass(frozen=True)
+class Quote:
+    """
+    캐시에 저장되는 현재가 한 건 (조회 시각 as_of 포함)
+    """
+
+    stock_code: str
+    price: Decimal
+    as_of: datetime
+
+
+class _Flight:
+    """
+    같은 종목에 대해 진행 중인 조회 한 건. 뒤따르는 스레드는 event를 기다립니다.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.quote = None
+        self.error = None
+
+
+class QuoteCache:
+    """
+    2단계 현재가 캐시
+    - 1단계: 프로세스 내 LRU (OrderedDict)
+    - 2단계: Redis (Django cache) - 여러 워커 프로세스가 공유
+    같은 종목의 동시 캐시 미스는 스레드 간(_Flight)·프로세스 간(Redis 락) 모두
+    한 번의 원본 조회로 합쳐집니다.
+    """
+
+    key_prefix = "stocks:quote:"
+    lock_prefix = "stocks:quote-lock:"
+    poll_interval = 0.05
+
+    def __init__(
+        self,
+        ttl=5,
+        max_entries=4096,
+        lock_timeout=10,
+        wait_timeout=5,
+        cache_alias="default",
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.cache_alias = cache_alias
+
+        self._entries = OrderedDict()  # stock_code -> (Quote, expires_at)
+        self._lock = threading.Lock()
+        self._flights = {}  # stock_code -> _Flight
+
+    @classmethod
+    def from_settings(cls):
+        options = {
+            **DEFAULT_QUOTE_CACHE_SETTINGS,
+            **getattr(settings, "QUOTE_CACHE", {}),
+        }
+        return cls(
+            ttl=options["TTL"],
+            max_entries=options["MAX_ENTRIES"],
+            lock_timeout=options["LOCK_TIMEOUT"],
+            wait_timeout=options["WAIT_TIMEOUT"],
+            cache_alias=options["CACHE_ALIAS"],
+        )
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    # ------------------------------------------------------------
+    # 1단계: 프로세스 내 LRU
+    # ------------------------------------------------------------
+    def _get_local(self, stock_code):
+        with self._lock:
+            entry = self._entries.get(stock_code)
+            if entry is None:
+                return None
+            quote, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[stock_code]
+                return None
+            self._entries.move_to_end(stock_code)
+            return quote
+
+    def _set_local(self, quote, expires_at):
+        with self._lock:
+            self._entries[quote.stock_code] = (quote, expires_at)
+            self._entries.move_to_end(quote.stock_code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # ------------------------------------------------------------
+    # 2단계: Redis (장애 시 로그만 남기고 1단계로만 동작)
+    # ------------------------------------------------------------
+    def _get_shared(self, stock_code):
+        try:
+            payload = self.shared.get(self.key_prefix + stock_code)
+        except Exception as e:
+            logger.warning(f"현재가 공유 캐시 조회 실패({stock_code}): {e}")
+            return None
+        return self._load_payload(stock_code, payload)
+
+    def _load_payload(self, stock_code, payload):
+        """Redis 값 (가격, as_of, 만료 시각)을 Quote로 복원하고 1단계에 올립니다."""
+        if payload is None:
+            return None
+        price, as_of_ts, expires_at = payload
+        if expires_at <= time.time():
+            return None
+        quote = Quote(
+            stock_code=stock_code,
+            price=Decimal(price),
+            as_of=datetime.fromtimestamp(as_of_ts, tz=dt_timezone.utc),
+        )
+        self._set_local(quote, expires_at)
+        return quote
+
+    def _set_shared_many(self, quotes, ttl, expires_at):
+        payloads = {
+            self.key_prefix
+            + quote.stock_code: (
+                str(quote.price),
+                quote.as_of.timestamp(),
+                expires_at,
+            )
+            for quote in quotes
+        }
+        try:
+            self.shared.set_many(payloads, timeout=ttl)
+        except Exception as e:
+            logger.warning(f"현재가 공유 캐시 저장 실패: {e}")
+
+    def _acquire_shared_lock(self, stock_code):
+        """
+        프로세스 간 락 획득. 락 토큰을 반환하며, Redis 장애 시에는
+        프로세스 내 단일 조회만 보장하도록 토큰 없이(True) 진행합니다.
+        """
+        token = uuid.uuid4().hex
+        try:
+            if self.shared.add(
+                self.lock_prefix + stock_code, token, timeout=self.lock_timeout
+            ):
+                return token
+            return None
+        except Exception as e:
+            logger.warning(f"현재가 조회 락 획득 실패({stock_code}): {e}")
+            return True
+
+    def _release_shared_lock(self, stock_code, token):
+        if token is True:
+            return
+        key = self.lock_prefix + stock_code
+        try:
+            if self.shared.get(key) == token:
+                self.shared.delete(key)
+        except Exception as e:
+            logger.warning(f"현재가 조회 락 해제 실패({stock_code}): {e}")
+
+    def _shared_lock_held(self, stock_code):
+        try:
+            return self.shared.get(self.lock_prefix + stock_code) is not None
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------
+    def get(self, stock_code):
+        """캐시에 유효한 현재가가 있으면 Quote, 없으면 None을 반환합니다."""
+        return self._get_local(stock_code) or self._get_shared(stock_code)
+
+    def get_many(self, stock_codes):
+        """여러 종목을 한 번에 조회합니다. (캐시에 있는 종목만 반환)"""
+        found = {}
+        missing = []
+        for code in stock_codes:
+            quote = self._get_local(code)
+            if quote is not None:
+                found[code] = quote
+            else:
+                missing.append(code)
+        if missing:
+            try:
+                payloads = self.shared.get_many(
+                    [self.key_prefix + code for code in missing]
+                )
+            except Exception as e:
+                logger.warning(f"현재가 공유 캐시 일괄 조회 실패: {e}")
+                payloads = {}
+            for code in missing:
+                quote = self._load_payload(code, payloads.get(self.key_prefix + code))
+                if quote is not None:
+                    found[code] = quote
+        return found
+
+    def set(self, quote, ttl=None):
+        self.set_many([quote], ttl=ttl)
+
+    def set_many(self, quotes, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl
+        for quote in quotes:
+            self._set_local(quote, expires_at)
+        if quotes:
+            self._set_shared_many(quotes, ttl, expires_at)
+
+    def invalidate(self, stock_code):
+        with self._lock:
+            self._entries.pop(stock_code, None)
+        try:
+            self.shared.delete(self.key_prefix + stock_code)
+        except Exception as e:
+            logger.warning(f"현재가 공유 캐시 삭제 실패({stock_code}): {e}")
+
+    def clear(self):
+        """프로세스 내 캐시만 비웁니다. (테스트 및 운영 도구용)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_fetch(self, stock_code, fetch):
+        """
+        캐시된 현재가를 반환하고, 없으면 fetch(stock_code)로 한 번만 조회합니다.
+        fetch는 Decimal 현재가를 반환해야 하며, 발생한 예외는 대기 중이던
+        모든 호출자에게 그대로 전달됩니다. (실패 결과는 캐시하지 않음)
+        """
+        quote = self.get(stock_code)
+        if quote is not None:
+            return quote
+
+        # --- 1. 프로세스 내 single-flight ---
+        with self._lock:
+            flight = self._flights.get(stock_code)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[stock_code] = flight
+
+        if not is_leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.quote
+
+        try:
+            flight.quote = self._fetch_across_processes(stock_code, fetch)
+            return flight.quote
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(stock_code, None)
+            flight.event.set()
+
+    def _fetch_across_processes(self, stock_code, fetch):
+        # --- 2. 프로세스 간 single-flight (Redis 락) ---
+        deadline = time.monotonic() + self.wait_timeout
+        token = self._acquire_shared_lock(stock_code)
+        while token is None:
+            # 다른 프로세스가 조회 중 -> 결과가 Redis에 올라올 때까지 대기
+            time.sleep(self.poll_interval)
+            quote = self._get_shared(stock_code)
+            if quote is not None:
+                return quote
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"{stock_code} 현재가 조회 대기 시간 초과, 직접 조회합니다."
+                )
+                token = True
+            elif not self._shared_lock_held(stock_code):
+                # 앞선 조회가 실패하고 락이 풀렸다면 직접 락을 잡고 조회
+                token = self._acquire_shared_lock(stock_code)
+
+        try:
+            # 락을 잡는 사이 다른 프로세스가 채워 넣었을 수 있으므로 재확인
+            quote = self._get_shared(stock_code)
+            if quote is not None:
+                return quote
+            price = fetch(stock_code)
+            quote = Quote(stock_code=stock_code, price=price, as_of=timezone.now())
+            self.set(quote)
+            return quote
+        finally:
+            self._release_shared_lock(stock_code, token)
+
+
+# 프로세스 전역에서 공유하는 현재가 캐시
+quote_cache = QuoteCache.from_settings()
@@ -0,0 +1,70 @@
+# backend/stocks/ranges.py
+
+import math
+from datetime import date
+
+import numpy as np
+
+from .fetcher import fetch_engine
+
+MAX_RANGE_PAGES = 50  # 범위 API 한 번에 가져올 수 있는 최대 페이지 수
+DAILY_PAGE_SIZE = 10  # 네이버 일별 시세 한 페이지의 거래일 수 (기존 페이지 API와 동일)
+
+
+class PageFetchError(Exception):
+    """범위 조회 중 일부 페이지를 가져오지 못한 경우 (실패한 페이지 번호 포함)"""
+
+    def __init__(self, failed):
+        self.failed = failed  # {page: 예외}
+        pages = ", ".join(str(page) for page in sorted(failed))
+        first_error = next(iter(failed.values()))
+        super().__init__(f"{pages} 페이지 조회 실패: {first_error}")
+
+
+def parse_page_range(text, max_pages=MAX_RANGE_PAGES):
+    """
+    '1-20' 또는 '3' 형태의 페이지 범위를 페이지 번호 리스트로 변환합니다.
+    형식이 잘못되었거나 max_pages보다 길면 ValueError
+    """
+    first, _, last = text.partition("-")
+    first = int(first)
+    last = int(last) if last else first
+    if first < 1 or last < first:
+        raise ValueError(f"잘못된 페이지 범위입니다: {text}")
+    if last - first + 1 > max_pages:
+        raise ValueError(f"한 번에 최대 {max_pages}페이지까지 조회할 수 있습니다.")
+    return list(range(first, last + 1))
+
+
+def daily_pages_for(start, today=None, max_pages=MAX_RANGE_PAGES):
+    """
+    start 일자까지의 일별 시세를 덮는 페이지 번호 리스트.
+    오늘부터 start까지의 평일 수로 거래일 수를 추정하며, 공휴일 등을 감안해
+    한 페이지를 여유로 더합니다. start가 오늘 이후면 ValueError
+    """
+    today = today or date.today()
+    if start > today:
+        raise ValueError("from은 오늘 이후 날짜일 수 없습니다.")
+    trading_days = int(np.busday_count(start, today)) + 1
+    pages = math.ceil(trading_days / DAILY_PAGE_SIZE) + 1
+    if pages > max_pages:
+        raise ValueError(
+            f"조회 기간이 너무 깁니다. (최대 약 {max_pages * DAILY_PAGE_SIZE}거래일)"
+        )
+    return list(range(1, pages + 1))
+
+
+def fetch_pages(fetch_page, pages):
+    """
+    공용 조회 엔진으로 여러 페이지를 동시에 가져옵니다. (호스트별 요청 제한 적용)
+    {페이지: 행 리스트}를 반환하며, 실패한 페이지가 있으면 PageFetchError
+    """
+    results = fetch_engine.map(fetch_page, pages)
+    failed = {
+        page: result
+        for page, result in results.items()
+        if isinstance(result, Exception)
+    }
+    if failed:
+        raise PageFetchError(failed)
+    return results
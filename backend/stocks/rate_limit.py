@@ -0,0 +1,228 @@
+# backend/stocks/rate_limit.py
+
+import logging
+import math
+import threading
+import time
+
+import redis
+import requests
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_LIMIT_SETTINGS = {
+    "ENABLED": True,
+    "RATE": 10,  # 호스트별 초당 요청 수 (토큰 충전 속도)
+    "BURST": 20,  # 버킷 크기 (순간적으로 허용되는 요청 수)
+    "MAX_WAIT": 5,  # 토큰을 기다릴 수 있는 최대 시간 (초), 넘으면 RateLimitExceeded
+    "HOSTS": {},  # {"finance.naver.com": {"RATE": 10, "BURST": 20}} 처럼 호스트별로 지정
+    "CACHE_ALIAS": "default",
+}
+
+# 토큰 버킷 (Redis 서버 시각 기준, 원자적으로 실행)
+# 토큰이 모자라면 다음 토큰이 생길 시각까지를 예약(토큰을 음수로)하고 대기 시간을 돌려줍니다.
+# 반환값: {예약 여부(1/0), 대기 시간(초, 문자열)}
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+end
+if wait > max_wait then
+    return {0, tostring(wait)}
+end
+
+tokens = tokens - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return {1, tostring(wait)}
+"""
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """
+    호스트의 요청 한도를 MAX_WAIT 안에 확보하지 못한 경우.
+    (RequestException을 상속하므로 스크래퍼의 기존 요청 실패 처리를 그대로 탑니다)
+    """
+
+
+class _LocalBucket:
+    """Redis를 쓸 수 없을 때 사용하는 프로세스 내 토큰 버킷"""
+
+    def __init__(self, burst):
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+
+class RateLimiter:
+    """
+    상위 서버(네이버 금융) 호스트별 토큰 버킷 요청 제한기
+    - Redis(Django cache)에 버킷을 두어 모든 웹/Celery 워커 프로세스가 한도를 공유합니다.
+    - 토큰이 남아 있으면 바로 통과하고, 소진된 경우에만 필요한 만큼 대기합니다.
+    - Redis 장애 시에는 로그만 남기고 프로세스 내 버킷으로 제한합니다.
+    """
+
+    key_prefix = "stocks:ratelimit:"
+
+    def __init__(
+        self,
+        rate=10,
+        burst=20,
+        max_wait=5,
+        hosts=None,
+        cache_alias="default",
+        enabled=True,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.hosts = hosts or {}
+        self.cache_alias = cache_alias
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._local = {}  # host -> _LocalBucket
+        self._client = None
+        self._script = None
+
+    @classmethod
+    def from_settings(cls):
+        options = {
+            **DEFAULT_RATE_LIMIT_SETTINGS,
+            **getattr(settings, "NAVER_RATE_LIMIT", {}),
+        }
+        return cls(
+            rate=options["RATE"],
+            burst=options["BURST"],
+            max_wait=options["MAX_WAIT"],
+            hosts=options["HOSTS"],
+            cache_alias=options["CACHE_ALIAS"],
+            enabled=options["ENABLED"],
+        )
+
+    def limits_for(self, host):
+        """호스트의 (초당 요청 수, 버킷 크기)"""
+        host_options = self.hosts.get(host, {})
+        return host_options.get("RATE", self.rate), host_options.get(
+            "BURST", self.burst
+        )
+
+    # ------------------------------------------------------------
+    # Redis 버킷 (프로세스 간 공유)
+    # ------------------------------------------------------------
+    def _redis_client(self):
+        """
+        캐시 설정(LOCATION)의 첫 번째(쓰기) 서버에 연결하는 Redis 클라이언트.
+        Django RedisCache는 클라이언트를 공개하지 않으므로 같은 서버에 직접 연결합니다.
+        """
+        if self._client is None:
+            location = settings.CACHES[self.cache_alias]["LOCATION"]
+            if isinstance(location, str):
+                location = location.split(",")
+            self._client = redis.Redis.from_url(location[0])
+            self._script = self._client.register_script(TOKEN_BUCKET_LUA)
+        return self._client
+
+    def shared_key(self, host):
+        """host의 공유 버킷 Redis 키 (캐시의 KEY_PREFIX/VERSION 적용)"""
+        return caches[self.cache_alias].make_key(self.key_prefix + host)
+
+    def _reserve_shared(self, host, rate, burst):
+        """(예약 여부, 대기 시간). 공유 버킷을 쓸 수 없으면 None"""
+        if not isinstance(caches[self.cache_alias], RedisCache):
+            return None
+        try:
+            client = self._redis_client()
+            granted, wait = self._script(
+                keys=[self.shared_key(host)],
+                args=[rate, burst, self.max_wait],
+                client=client,
+            )
+        except Exception as e:
+            logger.warning(f"요청 제한 공유 버킷 사용 실패({host}): {e}")
+            return None
+        return bool(int(granted)), float(wait)
+
+    # ------------------------------------------------------------
+    # 프로세스 내 버킷
+    # ------------------------------------------------------------
+    def _reserve_local(self, host, rate, burst):
+        with self._lock:
+            bucket = self._local.get(host)
+            if bucket is None:
+                bucket = self._local[host] = _LocalBucket(burst)
+            now = time.monotonic()
+            bucket.tokens = min(
+                burst, bucket.tokens + max(0.0, now - bucket.updated_at) * rate
+            )
+            bucket.updated_at = now
+
+            wait = (1 - bucket.tokens) / rate if bucket.tokens < 1 else 0.0
+            if wait > self.max_wait:
+                return False, wait
+            bucket.tokens -= 1
+            return True, wait
+
+    # ------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------
+    def reserve(self, host):
+        """
+        host에 요청 1건을 예약하고 요청 전에 기다려야 할 시간(초)을 반환합니다.
+        MAX_WAIT 안에 예약할 수 없으면 RateLimitExceeded를 발생시킵니다.
+        """
+        if not self.enabled or not host:
+            return 0.0
+        rate, burst = self.limits_for(host)
+        result = self._reserve_shared(host, rate, burst)
+        if result is None:
+            result = self._reserve_local(host, rate, burst)
+        granted, wait = result
+        if not granted:
+            raise RateLimitExceeded(
+                f"{host} 요청 한도 초과 (초당 {rate}회, {math.ceil(wait)}초 후 재시도)"
+            )
+        return wait
+
+    def acquire(self, host):
+        """예약한 시각까지 기다린 뒤 반환합니다. (한도가 남아 있으면 즉시 반환)"""
+        wait = self.reserve(host)
+        if wait > 0:
+            logger.debug(f"{host} 요청 한도 소진, {wait:.3f}초 대기")
+            time.sleep(wait)
+        return wait
+
+    def reset(self, host=None):
+        """
+        프로세스 내 버킷을 비웁니다. host를 주면 그 호스트의 공유 버킷도 지웁니다.
+        (테스트 및 운영 도구용)
+        """
+        with self._lock:
+            self._local.clear()
+        if host is None or not isinstance(caches[self.cache_alias], RedisCache):
+            return
+        try:
+            self._redis_client().delete(self.shared_key(host))
+        except Exception as e:
+            logger.warning(f"요청 제한 공유 버킷 삭제 실패({host}): {e}")
+
+
+# 프로세스 전역에서 공유하는 요청 제한기
+rate_limiter = RateLimiter.from_settings()
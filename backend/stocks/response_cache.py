@@ -0,0 +1,217 @@
+# backend/stocks/response_cache.py
+
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE_CACHE_SETTINGS = {
+    "CACHE_ALIAS": "default",
+    "LOCK_TIMEOUT": 10,  # 원본 조회(single-flight) 락 유지 시간 (초)
+    "WAIT_TIMEOUT": 5,  # 다른 요청의 조회 결과를 기다리는 최대 시간 (초)
+    "VIEWS": {},  # {"stock-detail": {"TTL": 5, "STALE_TTL": 30}, ...}
+}
+
+DEFAULT_VIEW_SETTINGS = {
+    "TTL": 30,  # 이 시간 동안은 캐시된 응답을 그대로 반환 (초)
+    "STALE_TTL": 120,  # TTL이 지난 뒤 이 시간 동안은 이전 응답을 반환하며 백그라운드 갱신 (초)
+}
+
+KEY_PREFIX = "stocks:response:"
+LOCK_PREFIX = "stocks:response-lock:"
+REFRESH_PREFIX = "stocks:response-refresh:"
+POLL_INTERVAL = 0.05
+
+
+def _cache_settings():
+    return {
+        **DEFAULT_RESPONSE_CACHE_SETTINGS,
+        **getattr(settings, "RESPONSE_CACHE", {}),
+    }
+
+
+def _view_settings(name):
+    return {**DEFAULT_VIEW_SETTINGS, **_cache_settings()["VIEWS"].get(name, {})}
+
+
+def _shared():
+    return caches[_cache_settings()["CACHE_ALIAS"]]
+
+
+def make_etag(data):
+    """응답 데이터의 내용 기반 강한 ETag ("sha1")"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return '"' + hashlib.sha1(payload.encode("utf-8")).hexdigest() + '"'
+
+
+def _get_entry(key):
+    try:
+        return _shared().get(KEY_PREFIX + key)
+    except Exception as e:
+        logger.warning(f"응답 캐시 조회 실패({key}): {e}")
+        return None
+
+
+def _store_entry(key, name, data):
+    options = _view_settings(name)
+    now = time.time()
+    entry = {
+        "data": data,
+        "etag": make_etag(data),
+        "last_modified": int(now),
+        "fresh_until": now + options["TTL"],
+    }
+    # 내용이 그대로면 Last-Modified를 유지하여 If-Modified-Since도 304가 되도록 함
+    previous = _get_entry(key)
+    if previous is not None and previous["etag"] == entry["etag"]:
+        entry["last_modified"] = previous["last_modified"]
+    try:
+        _shared().set(
+            KEY_PREFIX + key, entry, timeout=options["TTL"] + options["STALE_TTL"]
+        )
+    except Exception as e:
+        logger.warning(f"응답 캐시 저장 실패({key}): {e}")
+    return entry
+
+
+def _try_lock(lock_key):
+    """락 획득 여부. Redis 장애 시에는 캐시 없이 직접 조회하도록 True"""
+    try:
+        return _shared().add(lock_key, 1, timeout=_cache_settings()["LOCK_TIMEOUT"])
+    except Exception as e:
+        logger.warning(f"응답 캐시 락 획득 실패({lock_key}): {e}")
+        return True
+
+
+def _release_lock(lock_key):
+    try:
+        _shared().delete(lock_key)
+    except Exception as e:
+        logger.warning(f"응답 캐시 락 해제 실패({lock_key}): {e}")
+
+
+def _fetch_and_store(key, name, fetch):
+    """
+    원본 응답을 만들고 200이면 캐시에 저장합니다. (entry 또는 None, 원본 응답)
+    오류 응답은 캐시하지 않습니다.
+    """
+    response = fetch()
+    if response.status_code != status.HTTP_200_OK:
+        return None, response
+    return _store_entry(key, name, response.data), response
+
+
+def _fetch_single_flight(key, name, fetch):
+    """
+    캐시 미스 시 같은 키의 동시 요청은 한 번의 원본 조회로 합칩니다.
+    락을 잡지 못한 요청은 앞선 조회 결과가 캐시에 올라올 때까지 기다립니다.
+    """
+    lock_key = LOCK_PREFIX + key
+    deadline = time.monotonic() + _cache_settings()["WAIT_TIMEOUT"]
+    while not _try_lock(lock_key):
+        time.sleep(POLL_INTERVAL)
+        entry = _get_entry(key)
+        if entry is not None:
+            return entry, None
+        if time.monotonic() >= deadline:
+            logger.warning(f"{key} 응답 대기 시간 초과, 직접 조회합니다.")
+            return _fetch_and_store(key, name, fetch)
+
+    try:
+        # 락을 잡는 사이 다른 요청이 채워 넣었을 수 있으므로 재확인
+        entry = _get_entry(key)
+        if entry is not None:
+            return entry, None
+        return _fetch_and_store(key, name, fetch)
+    finally:
+        _release_lock(lock_key)
+
+
+def _refresh(key, name, fetch):
+    try:
+        entry, response = _fetch_and_store(key, name, fetch)
+        if entry is None:
+            logger.warning(
+                f"{key} 응답 갱신 실패 (status={response.status_code}), 이전 응답을 유지합니다."
+            )
+    except Exception as e:
+        logger.warning(f"{key} 응답 갱신 중 오류: {e}")
+    finally:
+        _release_lock(REFRESH_PREFIX + key)
+        close_old_connections()
+
+
+def _refresh_in_background(key, name, fetch):
+    threading.Thread(
+        target=_refresh,
+        args=(key, name, fetch),
+        name="stocks-response-refresh",
+        daemon=True,
+    ).start()
+
+
+def _build_response(request, entry, name, state):
+    """캐시 항목으로 응답을 만들고, 조건부 요청(If-None-Match 등)이면 304를 반환합니다."""
+    response = get_conditional_response(
+        request, etag=entry["etag"], last_modified=entry["last_modified"]
+    )
+    if response is None:
+        response = Response(entry["data"], status=status.HTTP_200_OK)
+
+    max_age = max(0, int(entry["fresh_until"] - time.time()))
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    response["Cache-Control"] = (
+        f"max-age={max_age}, stale-while-revalidate={_view_settings(name)['STALE_TTL']}"
+    )
+    response["X-Cache"] = state
+    return response
+
+
+def cache_response(name):
+    """
+    APIView.get에 붙이는 응답 캐시 데코레이터.
+    - name 별 TTL 동안은 캐시된 응답을 반환하고 (HIT)
+    - TTL 이후 STALE_TTL 동안은 이전 응답을 반환하면서 백그라운드에서 한 번만 갱신 (STALE)
+    - 캐시가 없으면 동시 요청 중 하나만 원본을 조회 (MISS)
+    - 200 응답만 캐시하며, ETag/Last-Modified를 붙이고 조건부 요청에는 304로 응답
+    캐시 키는 name과 URL 인자(kwargs)로 만듭니다.
+    """
+
+    def decorator(get):
+        @functools.wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            key = ":".join([name, *(str(kwargs[k]) for k in sorted(kwargs))])
+
+            def fetch():
+                return get(view, request, *args, **kwargs)
+
+            entry = _get_entry(key)
+            if entry is not None and entry["fresh_until"] > time.time():
+                return _build_response(request, entry, name, "HIT")
+
+            if entry is not None:
+                if _try_lock(REFRESH_PREFIX + key):
+                    _refresh_in_background(key, name, fetch)
+                return _build_response(request, entry, name, "STALE")
+
+            entry, response = _fetch_single_flight(key, name, fetch)
+            if entry is None:
+                return response
+            return _build_response(request, entry, name, "MISS")
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,211 @@
+# backend/stocks/search_index.py
+
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import Stock
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_INDEX_SETTINGS = {
+    "CHECK_INTERVAL": 5,  # 공유 캐시의 색인 버전을 다시 확인하는 최소 간격 (초)
+    "CACHE_ALIAS": "default",
+}
+
+VERSION_KEY = "stocks:search-index-version"
+
+# 한글 음절의 초성 (유니코드 '가'(0xAC00)부터 초성 19개 x 중성 21개 x 종성 28개 순서)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+
+# 검색 순위 (작을수록 먼저)
+RANK_EXACT = 0  # 종목코드/종목명 일치
+RANK_CODE_PREFIX = 1
+RANK_NAME_PREFIX = 2
+RANK_CHOSEONG_PREFIX = 3
+RANK_NAME_CONTAINS = 4
+RANK_CHOSEONG_CONTAINS = 5
+
+
+def _search_index_settings():
+    return {
+        **DEFAULT_SEARCH_INDEX_SETTINGS,
+        **getattr(settings, "SEARCH_INDEX", {}),
+    }
+
+
+def normalize(text):
+    """대소문자/공백 차이를 없앤 검색용 문자열"""
+    return "".join(text.split()).lower()
+
+
+def to_choseong(text):
+    """'삼성전자' -> 'ㅅㅅㅈㅈ' (한글 음절이 아닌 문자는 그대로)"""
+    chars = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_FIRST <= code <= HANGUL_LAST:
+            chars.append(CHOSEONG[(code - HANGUL_FIRST) // (21 * 28)])
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+def is_choseong_query(query):
+    return bool(query) and all(char in CHOSEONG for char in query)
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    code: str
+    name: str
+    market_type: str
+    key: str  # normalize(name)
+    choseong: str  # to_choseong(key)
+
+
+class SearchIndex:
+    """
+    종목 DB로 만든 프로세스 내 검색 색인.
+    - 종목코드/종목명/초성 접두어는 정렬된 키 목록에서 이진 탐색
+    - 포함 검색은 접두어 결과가 limit보다 적을 때만 전체를 훑음
+    """
+
+    def __init__(self, stocks, version=None):
+        self.version = version  # 색인을 만들 때의 공유 캐시 버전 (응답 캐시 키에 사용)
+        self.entries = [
+            SearchEntry(
+                code=code,
+                name=name,
+                market_type=market_type,
+                key=normalize(name),
+                choseong=to_choseong(normalize(name)),
+            )
+            for code, name, market_type in stocks
+        ]
+        # 포함 검색용 (속성 접근 없이 문자열 목록만 훑음)
+        self._keys = [entry.key for entry in self.entries]
+        self._choseongs = [entry.choseong for entry in self.entries]
+        self._by_code = self._sorted_keys(lambda entry: entry.code)
+        self._by_name = self._sorted_keys(lambda entry: entry.key)
+        self._by_choseong = self._sorted_keys(lambda entry: entry.choseong)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _sorted_keys(self, key):
+        pairs = sorted((key(entry), i) for i, entry in enumerate(self.entries))
+        return [k for k, _ in pairs], [i for _, i in pairs]
+
+    @staticmethod
+    def _prefix(sorted_keys, prefix):
+        keys, positions = sorted_keys
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + "\uffff")
+        return positions[start:end]
+
+    def search(self, query, limit=20):
+        """순위(일치 > 코드 접두어 > 이름 접두어 > 초성 접두어 > 이름 포함 > 초성 포함)대로 최대 limit개"""
+        query = normalize(query)
+        if not query or limit < 1:
+            return []
+
+        ranks = {}
+
+        def add(positions, rank):
+            for i in positions:
+                if i not in ranks or rank < ranks[i]:
+                    ranks[i] = rank
+
+        choseong_query = is_choseong_query(query)
+        if query.isdigit():
+            add(self._prefix(self._by_code, query), RANK_CODE_PREFIX)
+        add(self._prefix(self._by_name, query), RANK_NAME_PREFIX)
+        if choseong_query:
+            add(self._prefix(self._by_choseong, query), RANK_CHOSEONG_PREFIX)
+
+        if len(ranks) < limit:
+            add(
+                [i for i, key in enumerate(self._keys) if query in key],
+                RANK_NAME_CONTAINS,
+            )
+            if choseong_query:
+                add(
+                    [i for i, key in enumerate(self._choseongs) if query in key],
+                    RANK_CHOSEONG_CONTAINS,
+                )
+
+        for i in list(ranks):
+            entry = self.entries[i]
+            if entry.code == query or entry.key == query:
+                ranks[i] = RANK_EXACT
+
+        ordered = sorted(
+            ranks,
+            key=lambda i: (ranks[i], len(self.entries[i].key), self.entries[i].key),
+        )
+        return [self.entries[i] for i in ordered[:limit]]
+
+
+_lock = threading.Lock()
+_state = {"index": None, "version": None, "checked_at": 0.0}
+
+
+def _current_version():
+    try:
+        return caches[_search_index_settings()["CACHE_ALIAS"]].get(VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"검색 색인 버전 조회 실패: {e}")
+        return _state["version"]
+
+
+def bump_search_index_version():
+    """
+    종목 DB가 바뀌었음을 알립니다. (crawl_stocks 동기화 후 호출)
+    모든 프로세스가 CHECK_INTERVAL 안에 새 색인을 만듭니다.
+    """
+    try:
+        caches[_search_index_settings()["CACHE_ALIAS"]].set(
+            VERSION_KEY, str(time.time_ns()), timeout=None
+        )
+    except Exception as e:
+        logger.warning(f"검색 색인 버전 갱신 실패: {e}")
+    reset_search_index()
+
+
+def reset_search_index():
+    """이 프로세스의 색인을 버립니다. (다음 검색에서 다시 만듦)"""
+    with _lock:
+        _state.update(index=None, version=None, checked_at=0.0)
+
+
+def get_search_index():
+    """
+    프로세스 내 검색 색인. 공유 캐시의 버전이 바뀌었으면 종목 DB에서 다시 만듭니다.
+    (버전 확인은 CHECK_INTERVAL에 한 번만 하므로 대부분의 검색은 네트워크/DB 접근 없음)
+    """
+    now = time.monotonic()
+    index = _state["index"]
+    if (
+        index is not None
+        and now - _state["checked_at"] < _search_index_settings()["CHECK_INTERVAL"]
+    ):
+        return index
+
+    with _lock:
+        version = _current_version()
+        if _state["index"] is None or version != _state["version"]:
+            stocks = Stock.objects.values_list(
+                "stock_code", "stock_name", "market_type"
+            )
+            _state["index"] = SearchIndex(stocks, version=version)
+            _state["version"] = version
+            logger.info(f"검색 색인 생성: {len(_state['index'])}개 종목")
+        _state["checked_at"] = time.monotonic()
+        return _state["index"]
@@ -0,0 +1,178 @@
+# backend/stocks/snapshot.py
+
+import logging
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MARKET_SUM_URL = (
+    "https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page={page}"
+)
+
+DEFAULT_PRICE_SNAPSHOT_SETTINGS = {
+    "TTL": 300,
+    "CACHE_ALIAS": "default",
+}
+
+SNAPSHOT_KEY_PREFIX = "stocks:snapshot:"
+SNAPSHOT_META_KEY = "stocks:snapshot-meta"
+
+
+def _snapshot_settings():
+    return {
+        **DEFAULT_PRICE_SNAPSHOT_SETTINGS,
+        **getattr(settings, "PRICE_SNAPSHOT", {}),
+    }
+
+
+def _snapshot_cache():
+    return caches[_snapshot_settings()["CACHE_ALIAS"]]
+
+
+def _to_int(text):
+    """'71,300' -> 71300, 숫자가 아니면 None"""
+    cleaned = text.replace(",", "").strip()
+    if not cleaned:
+        return None
+    try:
+        return int(Decimal(cleaned))
+    except InvalidOperation:
+        return None
+
+
+def parse_market_sum_rows(soup):
+    """
+    시가총액(sise_market_sum) 페이지의 종목 행을 파싱합니다.
+    컬럼: N, 종목명, 현재가, 전일비, 등락률, 액면가, 시가총액, 상장주식수, 외국인비율, 거래량, ...
+    종목명 외 컬럼이 없는 행은 가격 정보 없이 코드/이름만 반환합니다.
+    """
+    rows = []
+    for row in soup.select("table.type_2 > tbody > tr[onmouseover]"):
+        cols = row.find_all("td")
+        if len(cols) < 2:
+            continue
+        item_tag = cols[1].find("a")
+        if not item_tag:
+            continue
+
+        item = {
+            "code": item_tag["href"].split("code=")[1],
+            "name": item_tag.get_text(strip=True),
+            "price": None,
+        }
+
+        if len(cols) >= 10:
+            # 전일비: "<span class='blind'>하락</span> 1,200" -> -1200
+            status_span = cols[3].select_one("span.blind")
+            change_status = status_span.get_text(strip=True) if status_span else ""
+            change = _to_int(cols[3].get_text(strip=True).replace(change_status, ""))
+            if change is not None and change_status in ("하락", "하한가"):
+                change = -change
+
+            rate_text = cols[4].get_text(strip=True).replace("%", "")
+            try:
+                change_rate = float(rate_text)
+            except ValueError:
+                change_rate = 0.0
+
+            item.update(
+                {
+                    "price": _to_int(cols[2].get_text(strip=True)),
+                    "change": change,
+                    "change_rate": change_rate,
+                    "market_cap": _to_int(cols[6].get_text(strip=True)),  # 억원
+                    "volume": _to_int(cols[9].get_text(strip=True)),
+                }
+            )
+        rows.append(item)
+    return rows
+
+
+def parse_last_page(soup):
+    """
+    페이지 네비게이션의 '맨뒤'(td.pgRR) 링크에서 마지막 페이지 번호를 읽습니다.
+    네비게이션은 있지만 '맨뒤'가 없으면 1페이지뿐이므로 1, 네비게이션이 없으면 None
+    """
+    link = soup.select_one("table.Nnavi td.pgRR a[href]")
+    if link is None:
+        return 1 if soup.select_one("table.Nnavi") is not None else None
+    match = re.search(r"page=(\d+)", link["href"])
+    return int(match.group(1)) if match else None
+
+
+def store_price_snapshot(rows, market_type="KOSPI"):
+    """
+    파싱된 시가총액 페이지 행들을 시세 스냅샷 테이블(공유 캐시)에 일괄 저장합니다.
+    가격 정보가 있는 행만 저장하며, 저장된 종목 수를 반환합니다.
+    """
+    as_of = timezone.now().timestamp()
+    entries = {
+        SNAPSHOT_KEY_PREFIX
+        + row["code"]: {
+            "code": row["code"],
+            "name": row["name"],
+            "market_type": market_type,
+            "price": row["price"],
+            "change": row["change"],
+            "change_rate": row["change_rate"],
+            "market_cap": row["market_cap"],
+            "volume": row["volume"],
+            "as_of": as_of,
+        }
+        for row in rows
+        if row.get("price") is not None
+    }
+    if not entries:
+        return 0
+
+    ttl = _snapshot_settings()["TTL"]
+    snapshot_cache = _snapshot_cache()
+    try:
+        snapshot_cache.set_many(entries, timeout=ttl)
+        snapshot_cache.set(
+            SNAPSHOT_META_KEY, {"as_of": as_of, "count": len(entries)}, timeout=ttl
+        )
+    except Exception as e:
+        logger.warning(f"시세 스냅샷 저장 실패: {e}")
+        return 0
+    return len(entries)
+
+
+def drop_snapshot_rows(stock_codes):
+    """상장 폐지 등으로 종목 DB에서 빠진 종목의 스냅샷 행을 지웁니다."""
+    if not stock_codes:
+        return
+    try:
+        _snapshot_cache().delete_many(
+            [SNAPSHOT_KEY_PREFIX + code for code in stock_codes]
+        )
+    except Exception as e:
+        logger.warning(f"시세 스냅샷 삭제 실패: {e}")
+
+
+def get_snapshot_rows(stock_codes):
+    """
+    시세 스냅샷에서 여러 종목의 행을 한 번에 조회합니다. {종목코드: 행} (없는 종목은 제외)
+    """
+    try:
+        entries = _snapshot_cache().get_many(
+            [SNAPSHOT_KEY_PREFIX + code for code in stock_codes]
+        )
+    except Exception as e:
+        logger.warning(f"시세 스냅샷 조회 실패: {e}")
+        return {}
+    return {row["code"]: row for row in entries.values()}
+
+
+def get_snapshot_meta():
+    """마지막 스냅샷 갱신 정보 {as_of, count} (없으면 None)"""
+    try:
+        return _snapshot_cache().get(SNAPSHOT_META_KEY)
+    except Exception as e:
+        logger.warning(f"시세 스냅샷 정보 조회 실패: {e}")
+        return None
@@ -0,0 +1,58 @@
+# backend/stocks/tasks.py
+
+import logging
+
+from celery import shared_task
+from django.core.management import call_command
+
+from .market_index import refresh_market_index
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def task_refresh_price_snapshot():
+    """
+    Celery Task가 'crawl_stocks --snapshot' Management Command를 호출합니다.
+    KOSPI/KOSDAQ 시가총액 페이지 전체(약 84페이지)를 동시에 조회하여 모든 종목의 시세 스냅샷을 갱신합니다.
+    """
+    logger.info("Celery: 시세 스냅샷 갱신('crawl_stocks --snapshot')을 시작합니다...")
+    try:
+        call_command("crawl_stocks", snapshot=True)
+
+        logger.info("Celery: 시세 스냅샷 갱신 완료.")
+        return "Management command 'crawl_stocks --snapshot' executed."
+    except Exception as e:
+        logger.error(f"Celery: 시세 스냅샷 갱신 중 오류 발생: {e}")
+        return f"Error executing command: {e}"
+
+
+@shared_task
+def task_ingest_daily_bars():
+    """
+    Celery Task가 'ingest_daily_bars' Management Command를 호출합니다.
+    장 마감 후 pykrx로 당일 전 종목 일별 시세를 시장별 한 번의 조회로 저장합니다.
+    """
+    logger.info("Celery: 일별 시세 일괄 수집('ingest_daily_bars')을 시작합니다...")
+    try:
+        call_command("ingest_daily_bars")
+
+        logger.info("Celery: 일별 시세 일괄 수집 완료.")
+        return "Management command 'ingest_daily_bars' executed."
+    except Exception as e:
+        logger.error(f"Celery: 일별 시세 일괄 수집 중 오류 발생: {e}")
+        return f"Error executing command: {e}"
+
+
+@shared_task
+def task_refresh_market_index():
+    """
+    KOSPI/KOSDAQ 지수를 스크래핑하여 공유 캐시에 기록합니다. (MARKET_INDEX["INTERVAL"] 주기)
+    실패하면 캐시의 마지막 값을 그대로 두고, 시장 지수 API는 그 값을 stale로 반환합니다.
+    """
+    try:
+        entry = refresh_market_index()
+        return f"Market index refreshed (as_of={entry['as_of']})."
+    except Exception as e:
+        logger.error(f"Celery: 시장 지수 갱신 중 오류 발생: {e}")
+        return f"Error refreshing market index: {e}"
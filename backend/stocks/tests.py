@@ -1,16 +1,74 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from datetime import time as dt_time
+from datetime import timedelta
 from decimal import Decimal
-from unittest.mock import patch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+from unittest.mock import MagicMock, patch
 
+import pandas as pd
 import requests
 from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.cache import cache
 from django.core.management import call_command
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APITestCase
 
-from .models import Stock
+from . import http_client, response_cache
+from .bars import aggregate_bars, get_intraday_bars
+from .daily_store import backfill_daily_bars, ingest_daily_bars
+from .eod_ingest import (
+    catch_up_start,
+    frame_to_bar_fields,
+    ingest_market_catch_up,
+    ingest_market_range,
+)
+from .fetcher import AsyncFetchEngine, fetch_prices
+from .indicators import compute_indicator, parse_spec
+from .management.commands.bench_scrapers import SCRAPER_PAGES, load_corpus_page
+from .models import DailyBar, DailyBarIngestion, IntradayTick, Stock
+from .parsers import (
+    MARKET_SUM_STRAINER,
+    TYPE2_TABLE_STRAINER,
+    derive_order_book,
+    get_parser_backend,
+    make_soup,
+    parse_order_book,
+)
+from .quote_cache import Quote, QuoteCache, quote_cache
+from .ranges import daily_pages_for, parse_page_range
+from .rate_limit import RateLimiter
+from .search_index import (
+    bump_search_index_version,
+    get_search_index,
+    reset_search_index,
+    to_choseong,
+)
+from .snapshot import (
+    get_snapshot_rows,
+    parse_last_page,
+    parse_market_sum_rows,
+    store_price_snapshot,
+)
+from .tasks import task_refresh_market_index
+from .tick_store import get_trading_date, ingest_ticks
 
 # [추가] views.py에서 테스트할 함수 및 헬퍼 함수 임포트
 from .views import (
+    get_current_prices_for_trading,
     get_current_stock_price_for_trading,
     parse_change_data,
     parse_sign,
@@ -46,7 +104,26 @@ FAKE_NAVER_FINANCE_HTML = """
 """
 
 
-# requests.get()이 반환할 가짜 응답(Response) 객체
+def fake_market_sum_html(stocks, last_page=None):
+    """종목 [(코드, 이름)]과 페이지 네비게이션('맨뒤' 링크는 last_page가 있을 때만)이 있는 시가총액 페이지"""
+    rows = "".join(
+        f'<tr onmouseover="mouseOver(this)"><td>{i}</td>'
+        f'<td><a href="/item/main.naver?code={code}">{name}</a></td></tr>'
+        for i, (code, name) in enumerate(stocks, start=1)
+    )
+    last = (
+        f'<td class="pgRR"><a href="/sise/sise_market_sum.naver?sosok=0&amp;page={last_page}">맨뒤</a></td>'
+        if last_page
+        else ""
+    )
+    return (
+        f'<html><body><table class="type_2"><tbody>{rows}</tbody></table>'
+        f'<table class="Nnavi"><tr><td class="on"><a href="#">1</a></td>{last}</tr></table>'
+        "</body></html>"
+    )
+
+
+# http_client.get()이 반환할 가짜 응답(Response) 객체
 class MockResponse:
     def __init__(self, text, status_code):
         self.text = text
@@ -62,13 +139,15 @@ class CrawlStocksCommandTest(TestCase):
     'crawl_stocks' 관리자 명령어의 DB 동기화 로직을 테스트합니다.
     """
 
-    # @patch 데코레이터를 사용하여 `requests.get`을 가짜(mock_get) 객체로 대체합니다.
-    # 이 테스트 메서드가 실행되는 동안 `requests.get`은 실제 네트워크 요청을 보내지 않습니다.
-    @patch("stocks.management.commands.crawl_stocks.requests.get")
+    # @patch 데코레이터를 사용하여 `http_client.get`을 가짜(mock_get) 객체로 대체합니다.
+    # 이 테스트 메서드가 실행되는 동안 `http_client.get`은 실제 네트워크 요청을 보내지 않습니다.
+    # (가짜 HTML에는 페이지 네비게이션이 없으므로 KOSPI 기본 페이지 수만큼 같은 페이지를 조회)
+    @override_settings(STOCK_SYNC={"MARKETS": ["KOSPI"]})
+    @patch("stocks.http_client.get")
     def test_sync_stocks_logic(self, mock_get):
         # 1. --- 사전 준비 (Setup) ---
 
-        # 가짜 requests.get()이 우리가 만든 가짜 HTML을 담은 MockResponse를 반환하도록 설정합니다.
+        # 가짜 http_client.get()이 우리가 만든 가짜 HTML을 담은 MockResponse를 반환하도록 설정합니다.
         mock_get.return_value = MockResponse(FAKE_NAVER_FINANCE_HTML, 200)
 
         # 테스트 시작 전, 데이터베이스의 초기 상태를 설정합니다.
@@ -88,7 +167,7 @@ class CrawlStocksCommandTest(TestCase):
         # 2. --- 명령어 실행 (Action) ---
 
         # 'crawl_stocks' 명령어를 실행합니다.
-        # 이 때 `requests.get`이 호출되면 mock_get이 대신 응답합니다.
+        # 이 때 `http_client.get`이 호출되면 mock_get이 대신 응답합니다.
         call_command("crawl_stocks")
 
         # 3. --- 결과 검증 (Assert) ---
@@ -123,6 +202,195 @@ class CrawlStocksCommandTest(TestCase):
 
         print("\n[SUCCESS] crawl_stocks 명령어 동기화 테스트 통과!")
 
+    @override_settings(STOCK_SYNC={"MARKETS": ["KOSPI"], "PAGES": {"KOSPI": 3}})
+    @patch("stocks.http_client.get")
+    def test_failed_page_skips_sync_and_resume(self, mock_get):
+        """일부 페이지가 실패하면 DB를 건드리지 않고, --resume은 실패한 페이지만 다시 조회"""
+        cache.clear()
+        Stock.objects.create(stock_code="000001", stock_name="상장폐지된 주식")
+
+        def fake_get(url, **kwargs):
+            if url.endswith("page=2"):
+                raise requests.exceptions.RequestException("Test Error")
+            return MockResponse(FAKE_NAVER_FINANCE_HTML, 200)
+
+        mock_get.side_effect = fake_get
+        call_command("crawl_stocks", stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(
+            list(Stock.objects.values_list("stock_code", flat=True)), ["000001"]
+        )
+
+        mock_get.reset_mock()
+        mock_get.side_effect = None
+        mock_get.return_value = MockResponse(FAKE_NAVER_FINANCE_HTML, 200)
+        call_command("crawl_stocks", resume=True, stdout=StringIO())
+
+        self.assertEqual(
+            [call.args[0][-6:] for call in mock_get.call_args_list], ["page=2"]
+        )
+        self.assertEqual(
+            set(Stock.objects.values_list("stock_code", flat=True)),
+            {"005930", "035720", "005380"},
+        )
+
+    @override_settings(STOCK_SYNC={"MARKETS": ["KOSPI"], "PAGES": {"KOSPI": 1}})
+    @patch("stocks.http_client.get")
+    def test_protected_stock_is_kept(self, mock_get):
+        """보유 내역이 있는 상장 폐지 종목은 남기고 나머지만 삭제"""
+        from trading.models import Portfolio
+        from users.models import User
+
+        mock_get.return_value = MockResponse(FAKE_NAVER_FINANCE_HTML, 200)
+        held = Stock.objects.create(stock_code="000001", stock_name="보유 종목")
+        Stock.objects.create(stock_code="000002", stock_name="상장폐지된 주식")
+        user = User.objects.create_user(
+            email="holder@test.com", password="password123", nickname="holder"
+        )
+        Portfolio.objects.create(user=user, stock=held, total_quantity=1)
+
+        stderr = StringIO()
+        call_command("crawl_stocks", stdout=StringIO(), stderr=stderr)
+
+        self.assertTrue(Stock.objects.filter(stock_code="000001").exists())
+        self.assertFalse(Stock.objects.filter(stock_code="000002").exists())
+        self.assertIn("000001", stderr.getvalue())
+
+    @patch("stocks.http_client.get")
+    def test_delta_sync_kospi_kosdaq(self, mock_get):
+        """
+        KOSPI/KOSDAQ 페이지 수는 1페이지의 '맨뒤' 링크로 정하고,
+        추가/이름 변경/시장 변경/상장 폐지 종목만 쓰며 변경 요약을 출력
+        """
+        cache.clear()
+        pages = {
+            (0, 1): fake_market_sum_html(
+                [("005930", "삼성전자"), ("000660", "SK하이닉스")], last_page=2
+            ),
+            (0, 2): fake_market_sum_html([("005380", "현대차")], last_page=2),
+            (1, 1): fake_market_sum_html(
+                [("035720", "카카오"), ("247540", "에코프로비엠")]
+            ),
+        }
+
+        def fake_get(url, **kwargs):
+            query = dict(part.split("=") for part in url.split("?")[1].split("&"))
+            return MockResponse(pages[(int(query["sosok"]), int(query["page"]))], 200)
+
+        mock_get.side_effect = fake_get
+        samsung = Stock.objects.create(stock_code="005930", stock_name="삼성전자")
+        Stock.objects.create(stock_code="005380", stock_name="현대차")
+        Stock.objects.create(stock_code="000660", stock_name="하이닉스")
+        Stock.objects.create(stock_code="035720", stock_name="카카오")
+        Stock.objects.create(stock_code="000001", stock_name="상장폐지된 주식")
+        Stock.objects.create(
+            stock_code="900001", stock_name="코넥스 종목", market_type="KONEX"
+        )
+
+        stdout = StringIO()
+        call_command("crawl_stocks", stdout=stdout)
+
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(
+            json.loads(stdout.getvalue().splitlines()[-2]),
+            {
+                "inserted": 1,
+                "renamed": 1,
+                "remarketed": 1,
+                "delisted": 1,
+                "protected": 0,
+                "unverified": 0,
+                "codes": ["000001", "000660", "035720", "247540"],
+            },
+        )
+        self.assertEqual(
+            dict(Stock.objects.values_list("stock_code", "market_type")),
+            {
+                "005930": "KOSPI",
+                "005380": "KOSPI",
+                "000660": "KOSPI",
+                "035720": "KOSDAQ",
+                "247540": "KOSDAQ",
+                "900001": "KONEX",  # 크롤링 대상이 아닌 시장은 그대로
+            },
+        )
+        self.assertEqual(
+            Stock.objects.get(stock_code="000660").stock_name, "SK하이닉스"
+        )
+        # 바뀌지 않은 종목은 다시 쓰지 않음
+        self.assertEqual(
+            Stock.objects.get(stock_code="005930").updated_at, samsung.updated_at
+        )
+
+        # 변경이 없으면 쓰기 쿼리 없음
+        with CaptureQueriesContext(connection) as queries:
+            call_command("crawl_stocks", stdout=StringIO())
+        self.assertFalse(
+            [
+                q["sql"]
+                for q in queries
+                if not q["sql"].startswith(("SELECT", "SAVEPOINT", "RELEASE"))
+            ]
+        )
+
+    @override_settings(STOCK_SYNC={"MARKETS": ["KOSPI"]})
+    @patch("stocks.http_client.get")
+    def test_empty_page_skips_sync(self, mock_get):
+        """종목 행이 없는 페이지(빈 응답/레이아웃 변경)는 실패로 보고 삭제하지 않음"""
+        cache.clear()
+        pages = {
+            1: fake_market_sum_html([("005930", "삼성전자")], last_page=3),
+            2: fake_market_sum_html([], last_page=3),
+            3: fake_market_sum_html([("005380", "현대차")], last_page=3),
+        }
+        mock_get.side_effect = lambda url, **kwargs: MockResponse(
+            pages[int(url.rsplit("=", 1)[1])], 200
+        )
+        Stock.objects.create(stock_code="000660", stock_name="SK하이닉스")
+
+        stderr = StringIO()
+        call_command("crawl_stocks", stdout=StringIO(), stderr=stderr)
+
+        self.assertTrue(Stock.objects.filter(stock_code="000660").exists())
+        self.assertIn("2 페이지 크롤링 중 오류 발생", stderr.getvalue())
+        self.assertIn("동기화를 중단합니다", stderr.getvalue())
+
+    @patch("stocks.http_client.get")
+    def test_single_market_crawl_keeps_moved_stock(self, mock_get):
+        """--market KOSDAQ만 크롤링하면 KOSDAQ에서 빠진 종목(KOSPI 이전 가능)은 삭제하지 않음"""
+        cache.clear()
+        mock_get.return_value = MockResponse(
+            fake_market_sum_html([("035720", "카카오")]), 200
+        )
+        Stock.objects.create(
+            stock_code="035720", stock_name="카카오", market_type="KOSDAQ"
+        )
+        Stock.objects.create(
+            stock_code="247540", stock_name="에코프로비엠", market_type="KOSDAQ"
+        )
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command("crawl_stocks", market=["KOSDAQ"], stdout=stdout, stderr=stderr)
+
+        self.assertTrue(Stock.objects.filter(stock_code="247540").exists())
+        self.assertIn("247540", stderr.getvalue())
+        summary = json.loads(stdout.getvalue().splitlines()[-2])
+        self.assertEqual((summary["delisted"], summary["unverified"]), (0, 1))
+
+    def test_parse_last_page(self):
+        """시가총액 페이지의 '맨뒤'(pgRR) 링크에서 마지막 페이지 번호"""
+        soup = make_soup(
+            load_corpus_page("sise_market_sum.html"), parse_only=MARKET_SUM_STRAINER
+        )
+        self.assertEqual(parse_last_page(soup), 48)
+        self.assertEqual(
+            parse_last_page(BeautifulSoup(fake_market_sum_html([]), "html.parser")), 1
+        )
+        self.assertIsNone(
+            parse_last_page(BeautifulSoup(FAKE_NAVER_FINANCE_HTML, "html.parser"))
+        )
+
 
 # --- 테스트를 위한 가짜 HTML 데이터 ---
 
@@ -172,8 +440,8 @@ FAKE_NAVER_SEARCH_HTML = """
 </html>
 """
 
-# [추가] StockDetailView (5단계 호가)
-FAKE_NAVER_DETAIL_5STEP_HTML = """
+# [추가] StockDetailView (10단계 호가 페이지 - 헤더 포함)
+FAKE_NAVER_DETAIL_10STEP_HTML = """
 <html>
 <head><title>삼성전자 : 네이버 증권</title></head>
 <body>
@@ -182,28 +450,7 @@ FAKE_NAVER_DETAIL_5STEP_HTML = """
         <em class="no_down"><span class="ico minus"></span><span class="no1">1</span><span class="shim">,</span><span class="no0">0</span><span class="no0">0</span><span class="no0">0</span></em>
         <em class="no_down"><span class="ico minus"></span><span class="no1">1</span><span class="jum">.</span><span class="no2">2</span><span class="no3">3</span>%</em>
     </div>
-    
-    <table class="type2" summary="호가 정보에 관한표입니다.">
-        <tbody>
-            <tr class="bg"> </tr>
-            <tr><td class="bg01">80,200</td><td class="bg01">100</td></tr>
-            <tr><td class="bg01">80,100</td><td class="bg01">50</td></tr>
-            <tr><td class="bg02">79,900</td><td class="bg02">200</td></tr>
-            <tr><td class="bg02">79,800</td><td class="bg02">300</td></tr>
-        </tbody>
-    </table>
-    <table class="type2"> <tbody>
-            <tr><td class="bor"><strong>150</strong></td><th class="num"><strong>500</strong></th></tr>
-        </tbody>
-    </table>
-</body>
-</html>
-"""
 
-# [추가] StockDetailView (10단계 호가)
-FAKE_NAVER_DETAIL_10STEP_HTML = """
-<html>
-<body>
     <table class="type2" summary="호가 정보에 관한표입니다.">
         <tbody>
             <tr> <td class="bg01">5</td> <td class="bg01">80,500</td> <td class="bg02">79,500</td> <td class="bg02">10</td> </tr>
@@ -228,6 +475,11 @@ class HelperFunctionTests(TestCase):
     (parse_span_numbers, parse_sign, parse_change_data, get_current_stock_price_for_trading)
     """
 
+    def setUp(self):
+        # 현재가 캐시가 테스트 간에 공유되지 않도록 초기화
+        cache.clear()
+        quote_cache.clear()
+
     def test_get_current_stock_price_for_trading_success(self):
         """
         [get_current_stock_price_for_trading] 성공 케이스:
@@ -235,8 +487,8 @@ class HelperFunctionTests(TestCase):
         """
         stock_code = "005930"
 
-        # 'stocks.views.requests.get'을 mock 객체로 대체
-        with patch("stocks.views.requests.get") as mock_get:
+        # 'stocks.http_client.get'을 mock 객체로 대체
+        with patch("stocks.http_client.get") as mock_get:
             # mock_get이 MockResponse 객체를 반환하도록 설정
             mock_get.return_value = MockResponse(FAKE_NAVER_PRICE_HTML, 200)
 
@@ -257,9 +509,9 @@ class HelperFunctionTests(TestCase):
         [get_current_stock_price_for_trading] 실패 케이스 1:
         네트워크 요청 실패 시 (e.g., 404, 500) ConnectionError를 발생시키는지 확인
         """
-        # requests.get이 RequestException을 발생시키도록 설정
+        # http_client.get이 RequestException을 발생시키도록 설정
         with patch(
-            "stocks.views.requests.get",
+            "stocks.http_client.get",
             side_effect=requests.exceptions.RequestException("Test Error"),
         ):
             # self.assertRaises(예외, 함수, *args)
@@ -272,12 +524,27 @@ class HelperFunctionTests(TestCase):
         HTML 구조가 변경되어 #_nowVal ID를 찾지 못할 때 ValueError를 발생시키는지 확인
         """
         # 비어있는 HTML 반환
-        with patch("stocks.views.requests.get") as mock_get:
+        with patch("stocks.http_client.get") as mock_get:
             mock_get.return_value = MockResponse("<html></html>", 200)
 
             with self.assertRaises(ValueError):
                 get_current_stock_price_for_trading("005930")
 
+    def test_get_current_stock_price_for_trading_uses_cache(self):
+        """
+        [get_current_stock_price_for_trading] 캐시 케이스:
+        TTL 이내의 반복 호출은 네이버에 다시 요청하지 않아야 함
+        """
+        with patch("stocks.http_client.get") as mock_get:
+            mock_get.return_value = MockResponse(FAKE_NAVER_PRICE_HTML, 200)
+
+            first = get_current_stock_price_for_trading("005930")
+            second = get_current_stock_price_for_trading("005930")
+
+            self.assertEqual(first, Decimal("80000"))
+            self.assertEqual(second, Decimal("80000"))
+            self.assertEqual(mock_get.call_count, 1)
+
     def test_parse_change_data(self):
         """
         [parse_change_data] '상승' 또는 '하락' 텍스트를 파싱하는지 테스트
@@ -328,6 +595,633 @@ class HelperFunctionTests(TestCase):
         self.assertEqual(result_none, "")
 
 
+class QuoteCacheTests(TestCase):
+    """
+    stocks.quote_cache.QuoteCache (2단계 현재가 캐시)를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.quote_cache = QuoteCache(ttl=5, max_entries=2, wait_timeout=2)
+
+    def test_get_or_fetch_sets_as_of_and_caches(self):
+        """캐시 미스 시 한 번 조회하고, 이후에는 캐시된 Quote를 반환"""
+        calls = []
+
+        def fetch(code):
+            calls.append(code)
+            return Decimal("80000")
+
+        quote = self.quote_cache.get_or_fetch("005930", fetch)
+        again = self.quote_cache.get_or_fetch("005930", fetch)
+
+        self.assertEqual(quote.price, Decimal("80000"))
+        self.assertIsNotNone(quote.as_of)
+        self.assertEqual(again, quote)
+        self.assertEqual(calls, ["005930"])
+
+    def test_expired_entry_is_refetched(self):
+        """TTL이 지난 항목은 다시 조회"""
+        prices = iter([Decimal("100"), Decimal("200")])
+        short_cache = QuoteCache(ttl=0.01)
+
+        short_cache.get_or_fetch("005930", lambda code: next(prices))
+        time.sleep(0.02)
+        quote = short_cache.get_or_fetch("005930", lambda code: next(prices))
+
+        self.assertEqual(quote.price, Decimal("200"))
+
+    def test_local_lru_evicts_oldest_and_falls_back_to_shared(self):
+        """프로세스 내 LRU에서 밀려난 종목은 공유 캐시(2단계)에서 복원"""
+        for code in ["000001", "000002", "000003"]:
+            self.quote_cache.get_or_fetch(code, lambda code: Decimal("1"))
+
+        self.assertEqual(len(self.quote_cache._entries), 2)
+        self.assertNotIn("000001", self.quote_cache._entries)
+        self.assertIsNotNone(self.quote_cache.get("000001"))
+
+    def test_concurrent_misses_collapse_into_one_fetch(self):
+        """여러 스레드가 동시에 같은 종목을 요청해도 원본 조회는 1번"""
+        calls = []
+        release = threading.Event()
+
+        def slow_fetch(code):
+            calls.append(code)
+            release.wait(timeout=2)
+            return Decimal("80000")
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.quote_cache.get_or_fetch("005930", slow_fetch)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([q.price for q in results], [Decimal("80000")] * 5)
+
+    def test_waits_for_other_process_holding_lock(self):
+        """다른 프로세스가 락을 잡고 있으면 조회하지 않고 그 결과를 기다림"""
+        other_process = QuoteCache(ttl=5)
+        token = other_process._acquire_shared_lock("005930")
+
+        def finish_other_fetch():
+            time.sleep(0.1)
+            other_process.set(
+                Quote(
+                    stock_code="005930",
+                    price=Decimal("70000"),
+                    as_of=timezone.now(),
+                )
+            )
+            other_process._release_shared_lock("005930", token)
+
+        thread = threading.Thread(target=finish_other_fetch)
+        thread.start()
+        quote = self.quote_cache.get_or_fetch(
+            "005930", lambda code: self.fail("원본 조회가 중복 실행되었습니다.")
+        )
+        thread.join()
+
+        self.assertEqual(quote.price, Decimal("70000"))
+
+    def test_fetch_error_is_not_cached(self):
+        """조회 실패는 캐시하지 않고 예외를 그대로 전달"""
+
+        def failing_fetch(code):
+            raise ConnectionError("Test Error")
+
+        with self.assertRaises(ConnectionError):
+            self.quote_cache.get_or_fetch("005930", failing_fetch)
+
+        quote = self.quote_cache.get_or_fetch("005930", lambda code: Decimal("1"))
+        self.assertEqual(quote.price, Decimal("1"))
+
+
+# [추가] 시세 스냅샷을 위한 가짜 시가총액 페이지 HTML (가격 컬럼 포함)
+FAKE_NAVER_MARKET_SUM_HTML = """
+<html>
+<body>
+    <table class="type_2">
+        <tbody>
+            <tr onmouseover="mouseOver(this)">
+                <td class="no">1</td>
+                <td><a href="/item/main.naver?code=005930" class="tltle">삼성전자</a></td>
+                <td class="number">71,300</td>
+                <td class="number"><em class="bu_p bu_pdn"><span class="blind">하락</span></em><span class="tah p11 nv01">1,200</span></td>
+                <td class="number"><span class="tah p11 nv01">-1.66%</span></td>
+                <td class="number">100</td>
+                <td class="number">4,256,431</td>
+                <td class="number">5,969,783</td>
+                <td class="number">53.52</td>
+                <td class="number">12,345,678</td>
+                <td class="number">14.50</td>
+                <td class="number">9.03</td>
+                <td class="center"><a href="/item/board.naver?code=005930"></a></td>
+            </tr>
+            <tr onmouseover="mouseOver(this)">
+                <td class="no">2</td>
+                <td><a href="/item/main.naver?code=000660" class="tltle">SK하이닉스</a></td>
+                <td class="number">150,000</td>
+                <td class="number"><em class="bu_p bu_pup"><span class="blind">상승</span></em><span class="tah p11 red02">3,000</span></td>
+                <td class="number"><span class="tah p11 red02">+2.04%</span></td>
+                <td class="number">5,000</td>
+                <td class="number">1,092,000</td>
+                <td class="number">728,002</td>
+                <td class="number">51.20</td>
+                <td class="number">2,345,678</td>
+                <td class="number">N/A</td>
+                <td class="number">N/A</td>
+                <td class="center"><a href="/item/board.naver?code=000660"></a></td>
+            </tr>
+        </tbody>
+    </table>
+</body>
+</html>
+"""
+
+
+class PriceSnapshotTests(TestCase):
+    """
+    시가총액 페이지 기반 전 종목 시세 스냅샷과 일괄 현재가 조회를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        quote_cache.clear()
+
+    def test_parse_market_sum_rows(self):
+        """현재가/전일비/등락률/시가총액/거래량 컬럼을 숫자로 파싱"""
+        soup = BeautifulSoup(FAKE_NAVER_MARKET_SUM_HTML, "html.parser")
+        rows = parse_market_sum_rows(soup)
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(
+            rows[0],
+            {
+                "code": "005930",
+                "name": "삼성전자",
+                "price": 71300,
+                "change": -1200,
+                "change_rate": -1.66,
+                "market_cap": 4256431,
+                "volume": 12345678,
+            },
+        )
+        self.assertEqual(rows[1]["change"], 3000)
+
+    @patch("stocks.http_client.get")
+    def test_snapshot_mode_stores_prices_without_db_sync(self, mock_get):
+        """--snapshot 모드는 스냅샷만 갱신하고 종목 DB는 건드리지 않음"""
+        mock_get.return_value = MockResponse(FAKE_NAVER_MARKET_SUM_HTML, 200)
+        Stock.objects.create(stock_code="000001", stock_name="상장폐지된 주식")
+
+        call_command("crawl_stocks", snapshot=True, stdout=StringIO())
+
+        self.assertTrue(Stock.objects.filter(stock_code="000001").exists())
+        self.assertFalse(Stock.objects.filter(stock_code="005930").exists())
+        rows = get_snapshot_rows(["005930", "000660", "999999"])
+        self.assertEqual(set(rows), {"005930", "000660"})
+        self.assertEqual(rows["005930"]["price"], 71300)
+
+    @patch("stocks.http_client.get")
+    def test_get_current_prices_for_trading_reads_snapshot(self, mock_get):
+        """스냅샷에 있는 종목은 개별 조회 없이 반환하고, 없는 종목만 개별 조회"""
+        soup = BeautifulSoup(FAKE_NAVER_MARKET_SUM_HTML, "html.parser")
+        store_price_snapshot(parse_market_sum_rows(soup))
+        mock_get.return_value = MockResponse(FAKE_NAVER_PRICE_HTML, 200)
+
+        prices = get_current_prices_for_trading(["005930", "000660", "035720"])
+
+        self.assertEqual(
+            prices,
+            {
+                "005930": Decimal("71300"),
+                "000660": Decimal("150000"),
+                "035720": Decimal("80000"),
+            },
+        )
+        mock_get.assert_called_once()
+
+    @patch("stocks.http_client.get")
+    def test_get_current_prices_for_trading_failure_is_none(self, mock_get):
+        """개별 조회까지 실패한 종목은 None"""
+        mock_get.side_effect = requests.exceptions.RequestException("Test Error")
+
+        prices = get_current_prices_for_trading(["005930"])
+
+        self.assertEqual(prices, {"005930": None})
+
+
+class ParserBackendTests(TestCase):
+    """
+    stocks.parsers (파서 엔진 선택 + 부분 파싱)가 기존 html.parser 전체 파싱과
+    같은 결과를 내는지 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        quote_cache.clear()
+
+    def test_auto_backend_prefers_lxml(self):
+        """auto 설정이면 lxml이 설치된 환경에서 lxml 사용"""
+        with self.settings(HTML_PARSER_BACKEND="auto"):
+            self.assertEqual(get_parser_backend(), "lxml")
+        with self.settings(HTML_PARSER_BACKEND="html.parser"):
+            self.assertEqual(get_parser_backend(), "html.parser")
+
+    @patch("stocks.http_client.get")
+    def test_backends_produce_identical_outputs(self, mock_get):
+        """현재가/시가총액/호가 파싱 결과가 파서 엔진과 무관하게 동일"""
+        full_soup = BeautifulSoup(FAKE_NAVER_MARKET_SUM_HTML, "html.parser")
+        expected_rows = parse_market_sum_rows(full_soup)
+
+        for backend in ("html.parser", "lxml"):
+            with self.subTest(backend=backend), self.settings(
+                HTML_PARSER_BACKEND=backend
+            ):
+                quote_cache.clear()
+                cache.clear()
+                mock_get.return_value = MockResponse(FAKE_NAVER_PRICE_HTML, 200)
+                self.assertEqual(
+                    get_current_stock_price_for_trading("005930"), Decimal("80000")
+                )
+
+                soup = make_soup(
+                    FAKE_NAVER_MARKET_SUM_HTML, parse_only=MARKET_SUM_STRAINER
+                )
+                self.assertEqual(parse_market_sum_rows(soup), expected_rows)
+
+                soup = make_soup(
+                    FAKE_NAVER_DETAIL_10STEP_HTML, parse_only=TYPE2_TABLE_STRAINER
+                )
+                full_soup = BeautifulSoup(FAKE_NAVER_DETAIL_10STEP_HTML, "html.parser")
+                self.assertEqual(
+                    parse_order_book(soup, ask_type=10),
+                    parse_order_book(full_soup, ask_type=10),
+                )
+
+
+class ScraperCorpusTests(TestCase):
+    """
+    저장된 네이버 금융 페이지(stocks/testdata/naver)로 페이지별 파서와
+    bench_scrapers 명령을 테스트합니다.
+    """
+
+    def test_parsers_on_corpus(self):
+        """페이지별 파서가 저장본에서 기대한 행 수와 값을 추출"""
+        expected_rows = {
+            "current_price": 1,
+            "market_index": 2,
+            "search": 12,
+            "detail": 20,
+            "ticks": 10,
+            "daily": 10,
+            "market_sum": 50,
+        }
+        results = {}
+        for name, page in SCRAPER_PAGES.items():
+            with self.subTest(page=name):
+                results[name] = page.parse(load_corpus_page(page.fixture))
+                self.assertEqual(page.count_rows(results[name]), expected_rows[name])
+
+        self.assertEqual(results["current_price"], Decimal("97900"))
+        self.assertEqual(results["market_index"]["kospi"]["index"], "3,748.89")
+        self.assertEqual(results["market_index"]["kosdaq"]["status"], "하락")
+        self.assertEqual(
+            results["search"][0],
+            {
+                "name": "삼성전자",
+                "code": "005930",
+                "price": "97,900",
+                "changeRate": -0.41,
+            },
+        )
+        self.assertEqual(
+            results["detail"]["header"],
+            {
+                "name": "삼성전자",
+                "price": "97,900",
+                "change": "400",
+                "change_rate": "-0.41%",
+                "status": "하락",
+            },
+        )
+        self.assertEqual(
+            results["detail"]["order_book_10"]["bids"][0]["price"], "97,900"
+        )
+        self.assertEqual(
+            results["detail"]["order_book_5"]["asks"][-1]["price"], "98,400"
+        )
+        self.assertEqual(results["ticks"][0]["time"], "15:30")
+        self.assertEqual(results["ticks"][0]["change_status"], "하락")
+        self.assertEqual(results["daily"][0]["date"], "2025.10.17")
+        self.assertEqual(results["daily"][0]["change"], "200")
+        self.assertEqual(results["market_sum"][0]["change"], -400)
+
+    def test_bench_scrapers_reports_every_page(self):
+        """bench_scrapers는 네트워크 없이 페이지별 측정 결과를 출력"""
+        out = StringIO()
+        with patch("stocks.http_client.get") as mock_get:
+            call_command(
+                "bench_scrapers",
+                iterations=1,
+                backend="all",
+                allow_synthetic=True,
+                stdout=out,
+            )
+        mock_get.assert_not_called()
+
+        output = out.getvalue()
+        self.assertIn("[html.parser]", output)
+        self.assertIn("[lxml]", output)
+        for name in SCRAPER_PAGES:
+            self.assertEqual(output.count(f"\n{name} "), 2)
+        # 합성 저장본으로 잰 결과는 기준값이 아니라고 경고
+        self.assertIn("합성", output)
+
+    def test_bench_scrapers_skips_synthetic_by_default(self):
+        """합성 저장본은 기본적으로 측정하지 않음 (기준값으로 오해하지 않도록)"""
+        out, err = StringIO(), StringIO()
+        call_command("bench_scrapers", iterations=1, stdout=out, stderr=err)
+        self.assertNotIn("ms/page", out.getvalue())
+        self.assertIn("측정하지 않습니다", err.getvalue())
+
+    @patch("stocks.http_client.get")
+    def test_record_sends_referer_for_ticks(self, mock_get):
+        """--record는 시간별 시세 페이지에 Referer를 함께 보냄"""
+        mock_get.return_value = MockResponse("<html></html>", 200)
+        corpus = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        with patch.multiple(
+            "stocks.management.commands.bench_scrapers",
+            CORPUS_DIR=corpus,
+            SYNTHETIC_LIST=corpus / "SYNTHETIC",
+        ):
+            call_command("bench_scrapers", "ticks", record=True, stdout=StringIO())
+        self.assertTrue((corpus / "sise_time.html").exists())
+        self.assertEqual(
+            mock_get.call_args.kwargs["headers"],
+            {"Referer": "https://finance.naver.com/item/sise.naver?code=005930"},
+        )
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive 지원
+
+    def do_GET(self):
+        body = b"<html></html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpClientTests(TestCase):
+    """
+    stocks.http_client (공통 keep-alive HTTP 클라이언트)를 테스트합니다.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        http_client.pool_stats.reset()
+
+    def test_connection_is_reused_across_requests(self):
+        """두 번째 요청부터는 풀의 연결을 재사용 (hit)"""
+        for _ in range(3):
+            http_client.get(self.url).raise_for_status()
+
+        stats = http_client.get_pool_stats()["127.0.0.1"]
+        self.assertEqual(stats, {"hits": 2, "misses": 1})
+
+    def test_connection_pool_is_shared_between_threads(self):
+        """스레드별 Session이 같은 연결 풀을 공유"""
+        http_client.get(self.url).raise_for_status()
+        thread = threading.Thread(target=lambda: http_client.get(self.url))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(http_client.get_pool_stats()["127.0.0.1"]["hits"], 1)
+
+    def test_default_timeout_is_applied(self):
+        """timeout을 지정하지 않으면 설정의 (연결, 읽기) 타임아웃을 사용"""
+        with patch.object(http_client.get_session(), "get") as mock_get:
+            http_client.get(self.url)
+
+        self.assertEqual(
+            mock_get.call_args.kwargs["timeout"],
+            (
+                settings.NAVER_HTTP["CONNECT_TIMEOUT"],
+                settings.NAVER_HTTP["READ_TIMEOUT"],
+            ),
+        )
+
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+REDIS_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://{os.environ.get('REDIS_HOST')}:"
+        f"{os.environ.get('REDIS_PORT', '6379')}/1",
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class RateLimiterTests(TestCase):
+    """
+    stocks.rate_limit (호스트별 토큰 버킷 요청 제한기)를 테스트합니다.
+    (CI의 Redis 캐시와 버킷을 공유하지 않도록 locmem 캐시 = 프로세스 내 버킷으로 동작)
+    """
+
+    def test_requests_within_burst_do_not_wait(self):
+        """버킷에 토큰이 남아 있으면 대기 없이 통과"""
+        limiter = RateLimiter(rate=10, burst=3)
+        waits = [limiter.reserve("finance.naver.com") for _ in range(3)]
+        self.assertEqual(waits, [0.0, 0.0, 0.0])
+
+    def test_exhausted_bucket_delays_until_next_token(self):
+        """토큰이 소진되면 다음 토큰까지 대기 시간을 예약 (호스트별로 독립)"""
+        limiter = RateLimiter(rate=10, burst=1, hosts={"slow.host": {"RATE": 2}})
+        limiter.reserve("finance.naver.com")
+        self.assertAlmostEqual(limiter.reserve("finance.naver.com"), 0.1, delta=0.02)
+        self.assertAlmostEqual(limiter.reserve("finance.naver.com"), 0.2, delta=0.02)
+
+        self.assertEqual(limiter.reserve("slow.host"), 0.0)
+        self.assertAlmostEqual(limiter.reserve("slow.host"), 0.5, delta=0.02)
+
+    def test_wait_longer_than_max_wait_raises(self):
+        """MAX_WAIT 안에 토큰을 확보할 수 없으면 요청 실패(RequestException) 처리"""
+        limiter = RateLimiter(rate=1, burst=1, max_wait=0.5)
+        limiter.reserve("finance.naver.com")
+        with self.assertRaises(requests.exceptions.RequestException):
+            limiter.reserve("finance.naver.com")
+
+    def test_http_client_consults_limiter_per_host(self):
+        """http_client.get은 요청 전에 호스트별 제한기를 거침"""
+        with patch("stocks.http_client.rate_limiter.acquire") as mock_acquire, patch(
+            "stocks.http_client.get_session"
+        ):
+            http_client.get("https://finance.naver.com/sise/")
+        mock_acquire.assert_called_once_with("finance.naver.com")
+
+    def test_retry_reserves_token(self):
+        """urllib3 재시도도 재시도 전에 같은 호스트의 토큰을 예약"""
+        retry = http_client.RateLimitedRetry(total=2, backoff_factor=0)
+        retry = retry.increment(
+            "GET", "/sise/", error=ConnectionError(), _pool=MagicMock(host="h.test")
+        )
+        with patch("stocks.http_client.rate_limiter.acquire") as mock_acquire:
+            retry.sleep()
+        mock_acquire.assert_called_once_with("h.test")
+        self.assertEqual(retry.total, 1)
+
+
+@skipUnless(os.environ.get("REDIS_HOST"), "Redis 서버가 필요합니다 (REDIS_HOST)")
+@override_settings(CACHES=REDIS_CACHES)
+class SharedRateLimiterTests(TestCase):
+    """Redis Lua 토큰 버킷 (모든 프로세스가 공유하는 경로)"""
+
+    def setUp(self):
+        # 테스트마다 다른 호스트 키를 쓰고 끝나면 지움
+        self.host = f"ratelimit-{uuid.uuid4().hex}.test"
+        self.limiter = RateLimiter(rate=10, burst=2, max_wait=0.5)
+        self.addCleanup(self.limiter.reset, self.host)
+
+    def test_shared_bucket_reserves_in_redis(self):
+        waits = [self.limiter.reserve(self.host) for _ in range(3)]
+
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, delta=0.02)
+        # 다른 프로세스(새 제한기)도 같은 버킷을 봄
+        other = RateLimiter(rate=10, burst=2, max_wait=0.5)
+        self.assertAlmostEqual(other.reserve(self.host), 0.2, delta=0.02)
+        self.assertFalse(self.limiter._local)
+        self.assertTrue(
+            self.limiter._redis_client().exists(self.limiter.shared_key(self.host))
+        )
+        with self.assertRaises(requests.exceptions.RequestException):
+            for _ in range(5):
+                self.limiter.reserve(self.host)
+
+
+class FetchEngineTests(TestCase):
+    """
+    stocks.fetcher (asyncio 기반 동시 조회 엔진)를 테스트합니다.
+    """
+
+    def test_map_bounds_global_concurrency(self):
+        """동시에 실행되는 조회 수가 MAX_CONCURRENCY를 넘지 않음"""
+        engine = AsyncFetchEngine(max_concurrency=3)
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def fetch(code):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+            return code
+
+        results = engine.map(fetch, [f"{i:06d}" for i in range(12)])
+
+        self.assertEqual(len(results), 12)
+        self.assertEqual(state["peak"], 3)
+
+    def test_map_reuses_threads_between_calls(self):
+        """호출할 때마다 스레드를 새로 만들지 않음"""
+        engine = AsyncFetchEngine(max_concurrency=4)
+        baseline = threading.active_count()
+
+        def fetch(code):
+            time.sleep(0.01)
+            return code
+
+        for _ in range(5):
+            engine.map(fetch, range(8))
+
+        # 이벤트 루프 스레드 1개 + 실행기 스레드 최대 4개
+        self.assertLessEqual(threading.active_count() - baseline, 5)
+
+    def test_map_async_from_another_event_loop(self):
+        """비동기 코드에서도 await 로 사용 가능"""
+        engine = AsyncFetchEngine(max_concurrency=2)
+
+        results = asyncio.run(engine.map_async(lambda code: code * 2, [1, 2]))
+
+        self.assertEqual(results, {1: 2, 2: 4})
+
+    def test_map_timeout_returns_finished_results(self):
+        """시간 초과 시 끝난 항목은 결과, 끝나지 않은 항목은 TimeoutError (예외 없이 반환)"""
+        engine = AsyncFetchEngine(max_concurrency=2, timeout=0.2)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def fetch(code):
+            if code == "slow":
+                release.wait(5)
+            return code
+
+        started = time.monotonic()
+        results = engine.map(fetch, ["fast", "slow"])
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(results["fast"], "fast")
+        self.assertIsInstance(results["slow"], TimeoutError)
+
+        # 호출 측(fetch_prices)은 실패 종목과 같이 None으로 받음
+        with patch("stocks.fetcher.fetch_engine", engine):
+            prices = fetch_prices(["fast", "slow"], fetch=fetch)
+        self.assertEqual(prices, {"fast": "fast", "slow": None})
+
+    def test_map_timeout_scales_with_rate_limit(self):
+        """기본 대기 시간 = TIMEOUT + 건수 / 가장 느린 호스트의 초당 요청 수"""
+        engine = AsyncFetchEngine(timeout=30)
+        with patch.multiple(
+            "stocks.fetcher.rate_limiter",
+            enabled=True,
+            rate=10,
+            hosts={"slow.host": {"RATE": 5}},
+        ):
+            self.assertEqual(engine.timeout_for(300), 90)
+        with patch("stocks.fetcher.rate_limiter.enabled", False):
+            self.assertEqual(engine.timeout_for(300), 30)
+
+    def test_fetch_prices_maps_errors_to_none(self):
+        """조회 실패 종목은 None, 중복 종목은 한 번만 조회"""
+        calls = []
+
+        def fetch(code):
+            calls.append(code)
+            if code == "000660":
+                raise ConnectionError("Test Error")
+            return Decimal("80000")
+
+        prices = fetch_prices(["005930", "000660", "005930"], fetch=fetch)
+
+        self.assertEqual(prices, {"005930": Decimal("80000"), "000660": None})
+        self.assertEqual(sorted(calls), ["000660", "005930"])
+
+
 # ================================================================
 # 2. APIView 테스트 (APITestCase 사용)
 # ================================================================
@@ -338,8 +1232,11 @@ class MarketIndexViewTest(APITestCase):
     MarketIndexView (코스피/코스닥 지수) API를 테스트합니다.
     """
 
-    # 'stocks.views' 모듈의 requests.get을 mock_get으로 대체
-    @patch("stocks.views.requests.get")
+    def setUp(self):
+        cache.clear()  # 응답 캐시 초기화
+
+    # 공통 HTTP 클라이언트(stocks.http_client)의 get을 mock_get으로 대체
+    @patch("stocks.http_client.get")
     def test_market_index_success(self, mock_get):
         """
         [MarketIndexView] 성공 케이스:
@@ -371,7 +1268,7 @@ class MarketIndexViewTest(APITestCase):
         self.assertEqual(data["kosdaq"]["change"], "2.49")
         self.assertEqual(data["kosdaq"]["status"], "하락")
 
-    @patch("stocks.views.requests.get")
+    @patch("stocks.http_client.get")
     def test_market_index_request_failure(self, mock_get):
         """
         [MarketIndexView] 실패 케이스:
@@ -387,7 +1284,7 @@ class MarketIndexViewTest(APITestCase):
         self.assertIn("error", response.data)
         self.assertIn("네이버 금융 서버 요청 실패", response.data["error"])
 
-    @patch("stocks.views.requests.get")
+    @patch("stocks.http_client.get")
     def test_market_index_parsing_failure(self, mock_get):
         """
         [MarketIndexView] 실패 케이스:
@@ -403,17 +1300,354 @@ class MarketIndexViewTest(APITestCase):
         self.assertIn("데이터 파싱 중 오류 발생", response.data["error"])
 
 
+class ResponseCacheTests(APITestCase):
+    """
+    stocks.response_cache (종목 상세 응답 캐시, ETag/304)를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    @patch("stocks.http_client.get")
+    def test_repeated_requests_hit_cache(self, mock_get):
+        """TTL 이내의 반복 요청은 한 번만 스크래핑"""
+        mock_get.return_value = MockResponse(FAKE_NAVER_DETAIL_10STEP_HTML, 200)
+
+        first = self.client.get("/api/stocks/detail/005930/")
+        second = self.client.get("/api/stocks/detail/005930/")
+
+        mock_get.assert_called_once()
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertIn("Last-Modified", second)
+        self.assertIn("stale-while-revalidate=30", second["Cache-Control"])
+
+    @patch("stocks.http_client.get")
+    def test_if_none_match_returns_304(self, mock_get):
+        """ETag가 같으면 본문 없이 304"""
+        mock_get.return_value = MockResponse(FAKE_NAVER_DETAIL_10STEP_HTML, 200)
+        etag = self.client.get("/api/stocks/detail/005930/")["ETag"]
+
+        response = self.client.get(
+            "/api/stocks/detail/005930/", HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+        mock_get.assert_called_once()
+
+        # 다른 종목은 별도의 캐시 항목
+        self.client.get("/api/stocks/detail/000660/")
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("stocks.response_cache._refresh_in_background")
+    @patch("stocks.http_client.get")
+    def test_stale_entry_is_served_while_revalidating(self, mock_get, mock_refresh):
+        """TTL이 지나면 이전 응답을 즉시 반환하고 갱신은 한 번만 예약"""
+        mock_get.return_value = MockResponse(FAKE_NAVER_DETAIL_10STEP_HTML, 200)
+        self.client.get("/api/stocks/detail/005930/")
+
+        with patch("stocks.response_cache.time.time", return_value=time.time() + 10):
+            stale = self.client.get("/api/stocks/detail/005930/")
+            again = self.client.get("/api/stocks/detail/005930/")
+
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale["X-Cache"], "STALE")
+        self.assertEqual(again["X-Cache"], "STALE")
+        mock_refresh.assert_called_once()  # 갱신 락으로 중복 갱신 방지
+
+        # 예약된 갱신 실행 -> 다시 신선한 응답
+        self.assertEqual(mock_get.call_count, 1)
+        response_cache._refresh(*mock_refresh.call_args[0])
+        self.assertEqual(
+            self.client.get("/api/stocks/detail/005930/")["X-Cache"], "HIT"
+        )
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("stocks.http_client.get")
+    def test_error_responses_are_not_cached(self, mock_get):
+        """원본 조회 실패(500)는 캐시하지 않음"""
+        mock_get.side_effect = requests.exceptions.RequestException("Test Error")
+        self.assertEqual(self.client.get("/api/stocks/detail/005930/").status_code, 500)
+
+        mock_get.side_effect = None
+        mock_get.return_value = MockResponse(FAKE_NAVER_DETAIL_10STEP_HTML, 200)
+        self.assertEqual(self.client.get("/api/stocks/detail/005930/").status_code, 200)
+        self.assertEqual(mock_get.call_count, 2)
+
+
+class MarketIndexCacheTests(APITestCase):
+    """
+    stocks.market_index (주기적으로 갱신되는 시장 지수 캐시)를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    @patch("stocks.http_client.get")
+    def test_view_reads_refreshed_cache(self, mock_get):
+        """갱신 Task가 채운 캐시를 읽기만 하고, 조건부 요청에는 304"""
+        mock_get.return_value = MockResponse(FAKE_NAVER_MAIN_HTML, 200)
+        task_refresh_market_index()
+        mock_get.reset_mock()
+
+        first = self.client.get("/api/stocks/market-index/")
+        second = self.client.get("/api/stocks/market-index/")
+
+        mock_get.assert_not_called()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data["kospi"]["index"], "2,500.00")
+        self.assertIn("as_of", first.data)
+        self.assertFalse(first.data["stale"])
+        self.assertEqual(first.data, second.data)
+
+        not_modified = self.client.get(
+            "/api/stocks/market-index/", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    @patch("stocks.http_client.get")
+    def test_stale_fallback_when_upstream_fails(self, mock_get):
+        """갱신이 밀렸고 상위 서버도 실패하면 마지막 값을 stale로 반환"""
+        mock_get.return_value = MockResponse(FAKE_NAVER_MAIN_HTML, 200)
+        as_of = task_refresh_market_index()
+
+        mock_get.side_effect = requests.exceptions.RequestException("Test Error")
+        self.assertIn("Error", task_refresh_market_index())  # 캐시는 그대로
+
+        with patch("stocks.market_index.time.time", return_value=time.time() + 600):
+            response = self.client.get("/api/stocks/market-index/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["stale"])
+        self.assertIn(response.data["as_of"], as_of)
+        self.assertEqual(response.data["kosdaq"]["index"], "800.00")
+        self.assertEqual(mock_get.call_count, 3)  # 요청 경로에서 한 번만 재시도
+
+
+def _fake_tick_page(rows):
+    """(체결시각, 체결가, 누적 거래량) 목록으로 가짜 시간별 시세 페이지 HTML 생성"""
+    trs = "".join(f"""<tr onmouseover="mouseOver(this)">
+            <td>{tick_time}</td><td>{price:,}</td>
+            <td><em class="bu_p bu_pdn"><span class="blind">하락</span></em>100</td>
+            <td>{price + 100:,}</td><td>{price:,}</td><td>{volume:,}</td><td>10</td>
+        </tr>""" for tick_time, price, volume in rows)
+    return f'<html><body><table class="type2">{trs}</table></body></html>'
+
+
+class TickStoreTests(APITestCase):
+    """
+    stocks.tick_store (시간별 시세 저장소)와 시간별 시세 API를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        Stock.objects.create(stock_code="005930", stock_name="삼성전자")
+        self.trade_date = get_trading_date()
+
+    @override_settings(TICK_STORE={"FETCH_BATCH": 4})
+    @patch("stocks.http_client.get")
+    def test_initial_ingest_stores_all_pages(self, mock_get):
+        """처음에는 마지막 페이지(반복되는 페이지)까지 모두 수집"""
+        mock_get.return_value = MockResponse(load_corpus_page("sise_time.html"), 200)
+
+        self.assertEqual(ingest_ticks("005930", self.trade_date), 10)
+
+        # 4페이지를 동시에 받고, 2페이지가 1페이지와 같으므로 다음 묶음은 요청하지 않음
+        self.assertEqual(mock_get.call_count, 4)
+        latest = IntradayTick.objects.first()
+        self.assertEqual(latest.tick_time.strftime("%H:%M"), "15:30")
+        self.assertEqual(latest.price, 97900)
+        self.assertEqual(latest.change, -400)
+        self.assertEqual(latest.volume, 17800000)
+
+    @patch("stocks.http_client.get")
+    def test_incremental_ingest_fetches_only_new_ticks(self, mock_get):
+        """저장된 마지막 시각 이전 행이 나오면 더 내려가지 않고, 마지막 분은 갱신"""
+        mock_get.return_value = MockResponse(
+            _fake_tick_page(
+                [("09:02", 100, 30), ("09:01", 100, 20), ("09:00", 100, 10)]
+            ),
+            200,
+        )
+        ingest_ticks("005930", self.trade_date)
+
+        mock_get.reset_mock()
+        mock_get.return_value = MockResponse(
+            _fake_tick_page(
+                [
+                    ("09:04", 120, 55),
+                    ("09:03", 110, 40),
+                    ("09:02", 105, 35),
+                    ("09:01", 100, 20),
+                ]
+            ),
+            200,
+        )
+        self.assertEqual(ingest_ticks("005930", self.trade_date), 3)
+
+        mock_get.assert_called_once()
+        self.assertEqual(IntradayTick.objects.count(), 5)
+        updated = IntradayTick.objects.get(tick_time=dt_time(9, 2))
+        self.assertEqual((updated.price, updated.volume), (105, 35))
+
+    @patch("stocks.http_client.get")
+    def test_page_route_serves_from_store(self, mock_get):
+        """기존 페이지 API는 같은 형태로 응답하고, 반복 요청은 다시 수집하지 않음"""
+        mock_get.return_value = MockResponse(load_corpus_page("sise_time.html"), 200)
+
+        response = self.client.get("/api/stocks/ticks/005930/1/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data[0],
+            {
+                "time": "15:30",
+                "price": "97,900",
+                "change": "400",
+                "change_status": "하락",
+                "sell_price": "98,000",
+                "buy_price": "97,900",
+                "volume": "17,800,000",
+                "volume_change": "72,898",
+            },
+        )
+        calls = mock_get.call_count
+
+        self.assertEqual(self.client.get("/api/stocks/ticks/005930/2/").data, [])
+        self.assertEqual(mock_get.call_count, calls)  # SYNC_INTERVAL 이내
+        self.assertEqual(
+            self.client.get("/api/stocks/ticks/999999/1/").status_code, 404
+        )
+
+    @patch("stocks.http_client.get")
+    def test_cursor_pagination(self, mock_get):
+        """next_cursor를 before로 넘기면 이어지는 체결을 반환"""
+        mock_get.return_value = MockResponse(load_corpus_page("sise_time.html"), 200)
+
+        first = self.client.get("/api/stocks/ticks/005930/", {"limit": 6}).data
+        self.assertEqual(len(first["results"]), 6)
+        self.assertIsNotNone(first["next_cursor"])
+
+        second = self.client.get(
+            "/api/stocks/ticks/005930/", {"limit": 6, "before": first["next_cursor"]}
+        ).data
+        self.assertEqual(len(second["results"]), 4)
+        self.assertIsNone(second["next_cursor"])
+        times = [row["time"] for row in first["results"] + second["results"]]
+        self.assertEqual(times, sorted(times, reverse=True))
+        self.assertEqual(len(set(times)), 10)
+
+        bad = self.client.get("/api/stocks/ticks/005930/", {"before": "25:00"})
+        self.assertEqual(bad.status_code, 400)
+
+    @patch("stocks.tick_store._shared")
+    @patch("stocks.http_client.get")
+    def test_page_route_survives_cache_failure(self, mock_get, mock_shared):
+        """공유 캐시 장애 시에도 간격/락 없이 수집하여 응답 (500 아님)"""
+        mock_get.return_value = MockResponse(load_corpus_page("sise_time.html"), 200)
+        broken = MagicMock()
+        for method in ("get", "add", "set", "delete"):
+            getattr(broken, method).side_effect = ConnectionError("Redis down")
+        mock_shared.return_value = broken
+
+        response = self.client.get("/api/stocks/ticks/005930/1/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 10)
+
+    @patch("stocks.http_client.get")
+    def test_sync_failure_without_stored_ticks(self, mock_get):
+        """수집 실패 + 저장된 데이터 없음 -> 500"""
+        mock_get.side_effect = requests.exceptions.RequestException("Test Error")
+        response = self.client.get("/api/stocks/ticks/005930/1/")
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("시간별 시세 처리 중 오류", response.data["error"])
+
+    @patch("stocks.http_client.get")
+    def test_range_route(self, mock_get):
+        """시각 범위/페이지 범위로 한 번에 조회"""
+        mock_get.return_value = MockResponse(load_corpus_page("sise_time.html"), 200)
+        url = "/api/stocks/ticks/005930/range/"
+
+        everything = self.client.get(url).data
+        self.assertEqual(everything["count"], 10)
+
+        ranged = self.client.get(url, {"from": "15:13", "to": "15:16"}).data
+        self.assertEqual(
+            [row["time"] for row in ranged["results"]],
+            ["15:16", "15:15", "15:14", "15:13"],
+        )
+
+        self.assertEqual(self.client.get(url, {"pages": "1-2"}).data["count"], 10)
+        self.assertEqual(self.client.get(url, {"pages": "2-1"}).status_code, 400)
+
+    @patch("stocks.http_client.get")
+    def test_columnar_format(self, mock_get):
+        """?format=columnar -> 컬럼별 숫자 배열"""
+        mock_get.return_value = MockResponse(load_corpus_page("sise_time.html"), 200)
+
+        response = self.client.get(
+            "/api/stocks/ticks/005930/1/", {"format": "columnar"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["price"]), 10)
+        self.assertEqual(response.json()["time"][0], "15:30:00")
+        self.assertEqual(response.json()["price"][0], 97900)
+        self.assertEqual(response.json()["change"][0], -400)
+
+        bars = self.client.get(
+            "/api/stocks/bars/005930/", {"interval": "15m", "format": "columnar"}
+        ).json()["results"]
+        self.assertEqual(bars["close"][-1], 97900)
+        self.assertEqual(
+            self.client.get("/api/stocks/ticks/005930/1/").data[0]["price"], "97,900"
+        )
+
+
 class StockSearchViewTest(APITestCase):
     """
-    StockSearchView (주식 검색) API를 테스트합니다.
+    StockSearchView (주식 검색) API와 stocks.search_index를 테스트합니다.
     """
 
     def setUp(self):
-        # 테스트를 위해 DB에 '삼성전자' 주식을 미리 생성
+        cache.clear()
+        quote_cache.clear()
+        reset_search_index()
+        # 테스트를 위해 DB에 종목을 미리 생성
         Stock.objects.create(
             stock_code="005930", stock_name="삼성전자", market_type="KOSPI"
         )
+        Stock.objects.create(
+            stock_code="006400", stock_name="삼성SDI", market_type="KOSPI"
+        )
+        Stock.objects.create(
+            stock_code="028260", stock_name="삼성물산", market_type="KOSPI"
+        )
+        Stock.objects.create(
+            stock_code="000810", stock_name="삼성화재", market_type="KOSPI"
+        )
+        Stock.objects.create(
+            stock_code="005380", stock_name="현대차", market_type="KOSPI"
+        )
         # 'SK하이닉스'는 DB에 없다고 가정
+        # 시세 스냅샷에 모든 종목이 있으면 검색은 네이버에 요청하지 않음
+        store_price_snapshot(
+            [
+                {
+                    "code": stock.stock_code,
+                    "name": stock.stock_name,
+                    "price": 10000,
+                    "change": 0,
+                    "change_rate": 0.0,
+                    "market_cap": 1,
+                    "volume": 1,
+                }
+                for stock in Stock.objects.all()
+            ]
+        )
 
     def test_search_no_query(self):
         """
@@ -424,69 +1658,218 @@ class StockSearchViewTest(APITestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data, {"error": "검색어('query')를 입력해주세요."})
 
-    @patch("stocks.views.requests.get")
+    @patch("stocks.http_client.get")
     def test_search_success_and_db_filter(self, mock_get):
         """
         [StockSearchView] 성공 케이스:
-        '삼성'으로 검색 시, 네이버에서 2개(삼성전자, SK하이닉스)를 찾고,
-        DB와 비교 필터링하여 '삼성전자' 1개만 반환하는지 확인
+        '삼성'으로 검색 시 네이버 요청 없이 DB의 종목만, 짧은 이름부터(같으면 가나다순) 반환하는지 확인
         """
-        mock_get.return_value = MockResponse(FAKE_NAVER_SEARCH_HTML, 200)
-
         response = self.client.get("/api/stocks/search/?query=삼성")
 
         self.assertEqual(response.status_code, 200)
+        mock_get.assert_not_called()
+        self.assertEqual(
+            [item["name"] for item in response.data],
+            ["삼성물산", "삼성전자", "삼성화재", "삼성SDI"],
+        )
+        self.assertEqual(response.data[1]["code"], "005930")
 
-        # 네이버 검색 결과는 2개였지만, DB에 있는 '삼성전자' 1개만 반환되어야 함
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["name"], "삼성전자")
-        self.assertEqual(response.data[0]["code"], "005930")
-
-    @patch("stocks.views.requests.get")
+    @patch("stocks.http_client.get")
     def test_search_by_code(self, mock_get):
         """
         [StockSearchView] 성공 케이스:
-        '005930' 코드로 검색 시, DB에서 '삼성전자' 이름을 찾아 네이버에 검색하는지 확인
+        '005930' 코드로 검색 시 해당 종목이 먼저 나오는지 확인
         """
-        mock_get.return_value = MockResponse(FAKE_NAVER_SEARCH_HTML, 200)
-
         response = self.client.get("/api/stocks/search/?query=005930")
 
         self.assertEqual(response.status_code, 200)
+        mock_get.assert_not_called()
+        self.assertEqual(response.data[0]["name"], "삼성전자")
+        self.assertEqual(
+            [
+                item["code"]
+                for item in self.client.get("/api/stocks/search/?query=0053").data
+            ],
+            ["005380"],
+        )
+
+    def test_choseong_and_ranking(self):
+        """초성 검색, 일치 > 접두어 > 포함 순위, 대소문자/공백 무시"""
+        index = get_search_index()
+        self.assertEqual(to_choseong("삼성SDI"), "ㅅㅅSDI")
+        self.assertEqual(
+            [entry.name for entry in index.search("ㅅㅅㅈㅈ")], ["삼성전자"]
+        )
+        self.assertEqual(
+            [entry.name for entry in index.search("ㅅㅅ")],
+            ["삼성물산", "삼성전자", "삼성화재", "삼성SDI"],
+        )
+        self.assertEqual([entry.name for entry in index.search("성 전")], ["삼성전자"])
+        self.assertEqual([entry.name for entry in index.search("sdi")], ["삼성SDI"])
+        self.assertEqual(len(index.search("삼성", limit=2)), 2)
+        self.assertEqual(index.search("삼성전자")[0].name, "삼성전자")
+        self.assertEqual([entry.name for entry in index.search("대차")], ["현대차"])
+
+    def test_price_from_snapshot(self):
+        """price는 쉼표 형식 현재가, changeRate는 전일비(원) (등락률은 프론트엔드에서 계산)"""
+        store_price_snapshot(
+            [
+                {
+                    "code": "005930",
+                    "name": "삼성전자",
+                    "price": 97900,
+                    "change": -400,
+                    "change_rate": -0.41,
+                    "market_cap": 1,
+                    "volume": 1,
+                }
+            ]
+        )
+        results = {
+            item["code"]: item
+            for item in self.client.get("/api/stocks/search/?query=삼성전").data
+        }
+        self.assertEqual(results["005930"]["price"], "97,900")
+        self.assertEqual(results["005930"]["changeRate"], -400)
+
+    @patch("stocks.http_client.get")
+    def test_price_without_snapshot_uses_quote_cache_only(self, mock_get):
+        """스냅샷에 없는 종목은 현재가 캐시만 보고(네이버 요청 없음), 둘 다 없으면 null"""
+        cache.clear()
+        quote_cache.set(Quote("005930", Decimal("58100"), timezone.now()))
+
+        results = {
+            item["code"]: item
+            for item in self.client.get("/api/stocks/search/?query=삼성").data
+        }
+        mock_get.assert_not_called()
+        self.assertEqual(
+            (results["005930"]["price"], results["005930"]["changeRate"]),
+            ("58,100", None),
+        )
+        self.assertEqual(
+            (results["006400"]["price"], results["006400"]["changeRate"]),
+            (None, None),
+        )
 
-        # '005930' 코드로 DB를 조회하여 '삼성전자'로 변환한 뒤,
-        # 'euc-kr'로 인코딩하여 네이버에 요청했는지 확인
-        encoded_query = "https://finance.naver.com/search/search.naver?query=%BB%EF%BC%BA%C0%FC%C0%DA"
-        called_url = mock_get.call_args[0][0]  # mock_get이 호출된 첫 번째 인자(URL)
+    def test_index_reloads_after_version_bump(self):
+        """종목 DB가 바뀌어도 버전이 바뀌기 전까지는 기존 색인을 사용"""
+        self.assertEqual(len(get_search_index()), 5)
+        Stock.objects.create(stock_code="000660", stock_name="SK하이닉스")
 
-        # 실제 호출된 URL과 예상 URL이 동일한지 확인
-        self.assertEqual(called_url, encoded_query)
-        self.assertEqual(response.data[0]["name"], "삼성전자")
+        self.assertEqual(len(get_search_index()), 5)
+        bump_search_index_version()
+        self.assertEqual(
+            [entry.code for entry in get_search_index().search("하이닉스")],
+            ["000660"],
+        )
+
+
+class StockAutocompleteViewTest(APITestCase):
+    """
+    StockAutocompleteView (종목 자동완성) API를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        reset_search_index()
+        Stock.objects.create(
+            stock_code="005930", stock_name="삼성전자", market_type="KOSPI"
+        )
+        Stock.objects.create(
+            stock_code="006400", stock_name="삼성SDI", market_type="KOSPI"
+        )
+        Stock.objects.create(
+            stock_code="005380", stock_name="현대차", market_type="KOSPI"
+        )
+        store_price_snapshot(
+            [
+                {
+                    "code": "005930",
+                    "name": "삼성전자",
+                    "price": 97900,
+                    "change": -400,
+                    "change_rate": -0.41,
+                    "market_cap": 1,
+                    "volume": 1,
+                }
+            ]
+        )
+
+    @patch("stocks.http_client.get")
+    def test_autocomplete_with_snapshot_prices(self, mock_get):
+        """상위 N개 종목에 스냅샷의 현재가/등락률(숫자)을 붙이고, 없으면 None"""
+        response = self.client.get("/api/stocks/autocomplete/?q=삼성&limit=5")
+
+        self.assertEqual(response.status_code, 200)
+        mock_get.assert_not_called()
+        self.assertEqual(response.data["query"], "삼성")
+        self.assertEqual(
+            response.data["results"][0],
+            {
+                "code": "005930",
+                "name": "삼성전자",
+                "market_type": "KOSPI",
+                "price": 97900,
+                "change_rate": -0.41,
+            },
+        )
+        self.assertIsNone(response.data["results"][1]["price"])
+        self.assertEqual(
+            len(
+                self.client.get("/api/stocks/autocomplete/?q=삼성&limit=1").data[
+                    "results"
+                ]
+            ),
+            1,
+        )
+        self.assertEqual(
+            self.client.get("/api/stocks/autocomplete/?q=").data["results"], []
+        )
+
+    def test_cached_per_normalized_prefix(self):
+        """정규화한 접두어가 같으면 캐시된 결과, 종목 DB 동기화(버전 갱신) 후에는 새로 조회"""
+        self.client.get("/api/stocks/autocomplete/?q=ㅎㄷ")
+        Stock.objects.create(
+            stock_code="012330", stock_name="현대모비스", market_type="KOSPI"
+        )
+        cached = self.client.get("/api/stocks/autocomplete/?q=ㅎ ㄷ")
+        self.assertEqual([item["code"] for item in cached.data["results"]], ["005380"])
+
+        with patch("stocks.autocomplete.get_snapshot_rows") as mock_rows:
+            self.client.get("/api/stocks/autocomplete/?q=ㅎㄷ")
+            mock_rows.assert_not_called()
+
+        bump_search_index_version()
+        response = self.client.get("/api/stocks/autocomplete/?q=ㅎㄷ")
+        self.assertEqual(
+            [item["code"] for item in response.data["results"]], ["005380", "012330"]
+        )
 
 
 class StockDetailViewTest(APITestCase):
     """
     StockDetailView (주식 상세) API를 테스트합니다.
-    (주의: 이 View는 2번의 requests.get()을 호출합니다)
+    (10단계 호가 페이지 한 번만 http_client.get()으로 요청합니다)
     """
 
-    @patch("stocks.views.requests.get")
+    def setUp(self):
+        cache.clear()  # 응답 캐시 초기화
+
+    @patch("stocks.http_client.get")
     def test_stock_detail_success(self, mock_get):
         """
         [StockDetailView] 성공 케이스:
-        5단계, 10단계 호가 HTML을 순차적으로 반환하도록 side_effect를 설정하고,
-        모든 데이터가 정상적으로 파싱되는지 확인
-        """
-        # 1. 첫 번째 호출(5단계) -> 5단계 HTML 반환
-        # 2. 두 번째 호출(10단계) -> 10단계 HTML 반환
-        mock_get.side_effect = [
-            MockResponse(FAKE_NAVER_DETAIL_5STEP_HTML, 200),
-            MockResponse(FAKE_NAVER_DETAIL_10STEP_HTML, 200),
-        ]
+        10단계 호가 페이지 한 번만 요청하여 헤더, 10단계 호가,
+        (10단계에서 골라낸) 5단계 호가가 모두 정상적으로 파싱되는지 확인
+        """
+        mock_get.return_value = MockResponse(FAKE_NAVER_DETAIL_10STEP_HTML, 200)
 
         response = self.client.get("/api/stocks/detail/005930/")
 
         self.assertEqual(response.status_code, 200)
+        mock_get.assert_called_once()
+        self.assertIn("asktype=10", mock_get.call_args[0][0])
 
         data = response.data
 
@@ -497,14 +1880,7 @@ class StockDetailViewTest(APITestCase):
         self.assertEqual(data["change_rate"], "-1.23%")
         self.assertEqual(data["status"], "")
 
-        # 2. 5단계 호가 파싱 확인
-        self.assertEqual(len(data["order_book_5"]["asks"]), 2)
-        self.assertEqual(len(data["order_book_5"]["bids"]), 2)
-        self.assertEqual(data["order_book_5"]["total_ask_volume"], "150")
-        self.assertEqual(data["order_book_5"]["total_bid_volume"], "500")
-        self.assertEqual(data["order_book_5"]["asks"][0]["price"], "50")
-
-        # 3. 10단계 호가 파싱 확인
+        # 2. 10단계 호가 파싱 확인
         self.assertEqual(len(data["order_book_10"]["asks"]), 2)
         self.assertEqual(len(data["order_book_10"]["bids"]), 2)
         self.assertEqual(data["order_book_10"]["total_ask_volume"], "15")
@@ -513,6 +1889,654 @@ class StockDetailViewTest(APITestCase):
             data["order_book_10"]["bids"][0]["price"], "79,500"
         )  # 순서대로 정렬됨
 
+        # 3. 5단계 호가는 10단계 호가의 최우선 호가로 구성
+        self.assertEqual(
+            data["order_book_5"]["asks"], data["order_book_10"]["asks"][:5]
+        )
+        self.assertEqual(data["order_book_5"]["asks"][0]["price"], "80,400")
+        self.assertEqual(data["order_book_5"]["bids"][0]["price"], "79,500")
+        self.assertEqual(data["order_book_5"]["total_ask_volume"], "15")
+        self.assertEqual(data["order_book_5"]["total_bid_volume"], "30")
+
+    def test_derive_order_book_keeps_best_levels(self):
+        """10단계 중 최우선 5단계만 남기고 잔량합계를 다시 계산"""
+        order_book_10 = {
+            "asks": [
+                {"price": f"{80_000 + i * 100:,}", "volume": "10"}
+                for i in reversed(range(1, 11))
+            ],
+            "bids": [
+                {"price": f"{80_000 - i * 100:,}", "volume": "1,000"} for i in range(10)
+            ],
+            "total_ask_volume": "100",
+            "total_bid_volume": "10,000",
+        }
+
+        order_book_5 = derive_order_book(order_book_10, levels=5)
+
+        self.assertEqual(
+            [level["price"] for level in order_book_5["asks"]],
+            ["80,100", "80,200", "80,300", "80,400", "80,500"],
+        )
+        self.assertEqual(
+            [level["price"] for level in order_book_5["bids"]],
+            ["80,000", "79,900", "79,800", "79,700", "79,600"],
+        )
+        self.assertEqual(order_book_5["total_ask_volume"], "50")
+        self.assertEqual(order_book_5["total_bid_volume"], "5,000")
+
+
+class IntradayBarTests(APITestCase):
+    """
+    stocks.bars (분봉 집계)와 분봉 API를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.stock = Stock.objects.create(stock_code="005930", stock_name="삼성전자")
+        self.trade_date = get_trading_date()
+
+    def _store(self, rows):
+        for tick_time, price, volume in rows:
+            IntradayTick.objects.update_or_create(
+                stock=self.stock,
+                trade_date=self.trade_date,
+                tick_time=tick_time,
+                defaults={
+                    "price": price,
+                    "change": 0,
+                    "volume": volume,
+                    "volume_change": 0,
+                },
+            )
+
+    def test_aggregate_bars(self):
+        """누적 거래량 차이로 봉 거래량을 계산하고, 체결 없는 구간은 생략"""
+        ticks = [
+            {"tick_time": dt_time(9, 4), "price": 105, "volume": 30},
+            {"tick_time": dt_time(9, 0), "price": 100, "volume": 10},
+            {"tick_time": dt_time(9, 2), "price": 90, "volume": 20},
+            {"tick_time": dt_time(9, 17), "price": 95, "volume": 50},
+        ]
+        self.assertEqual(
+            aggregate_bars(ticks, "5m"),
+            [
+                {
+                    "time": "09:00",
+                    "open": 100,
+                    "high": 105,
+                    "low": 90,
+                    "close": 105,
+                    "volume": 30,
+                },
+                {
+                    "time": "09:15",
+                    "open": 95,
+                    "high": 95,
+                    "low": 95,
+                    "close": 95,
+                    "volume": 20,
+                },
+            ],
+        )
+        self.assertEqual(len(aggregate_bars(ticks, "1m")), 4)
+        self.assertEqual(aggregate_bars([], "1m"), [])
+
+    def test_cache_follows_new_ticks(self):
+        """같은 체결 상태면 캐시를 쓰고, 새 체결이 저장되면 다시 계산"""
+        self._store([(dt_time(9, 0), 100, 10), (dt_time(9, 1), 110, 25)])
+        first = get_intraday_bars("005930", self.trade_date, "5m")
+        self.assertEqual(first[0]["volume"], 25)
+
+        with patch("stocks.bars.aggregate_bars") as mock_aggregate:
+            self.assertEqual(get_intraday_bars("005930", self.trade_date, "5m"), first)
+            mock_aggregate.assert_not_called()
+
+        self._store([(dt_time(9, 1), 120, 40)])  # 진행 중인 분 갱신
+        bars = get_intraday_bars("005930", self.trade_date, "5m")
+        self.assertEqual((bars[0]["close"], bars[0]["volume"]), (120, 40))
+
+    @patch("stocks.http_client.get")
+    def test_bars_route(self, mock_get):
+        mock_get.return_value = MockResponse(load_corpus_page("sise_time.html"), 200)
+        url = "/api/stocks/bars/005930/"
+
+        response = self.client.get(url, {"interval": "15m"})
+        self.assertEqual(response.status_code, 200)
+        times = [bar["time"] for bar in response.data["results"]]
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(response.data["results"][-1]["close"], 97900)
+
+        self.assertEqual(self.client.get(url, {"interval": "2m"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/stocks/bars/999999/").status_code, 404)
+
+
+def _fake_daily_page(dates):
+    """일자 목록으로 가짜 일별 시세 페이지 HTML 생성"""
+    trs = "".join(f"""<tr onmouseover="mouseOver(this)">
+            <td>{day}</td><td>97,900</td>
+            <td><em class="bu_p bu_pdn"><span class="blind">하락</span></em>400</td>
+            <td>98,200</td><td>98,400</td><td>97,400</td><td>22,123,865</td>
+        </tr>""" for day in dates)
+    return f'<html><body><table class="type2">{trs}</table></body></html>'
+
+
+# 2025-10-17(금)부터 거슬러 올라가는 평일 19일
+FAKE_DAILY_DATES = [
+    day.strftime("%Y.%m.%d")
+    for day in pd.bdate_range(end="2025-10-17", periods=19)[::-1]
+]
+FAKE_DAILY_PAGES = {
+    "1": _fake_daily_page(FAKE_DAILY_DATES[:10]),
+    # 조회 사이 새 거래일이 추가되어 앞 페이지의 마지막 일자가 밀려 내려온 경우
+    "2": _fake_daily_page(FAKE_DAILY_DATES[9:]),
+}
+
+
+def _daily_page_response(url, **kwargs):
+    # 마지막 페이지를 넘기면 네이버는 마지막 페이지를 다시 보여줌
+    page = url.rsplit("page=", 1)[1]
+    return MockResponse(FAKE_DAILY_PAGES.get(page, FAKE_DAILY_PAGES["2"]), 200)
+
+
+@override_settings(DAILY_STORE={"INITIAL_PAGES": 1})
+class DailyStoreTests(APITestCase):
+    """
+    stocks.daily_store (일별 시세 저장소), stocks.ranges와 일별 시세 API를 테스트합니다.
+    """
+
+    url = "/api/stocks/daily/005930/range/"
+
+    def setUp(self):
+        cache.clear()
+        Stock.objects.create(stock_code="005930", stock_name="삼성전자")
+
+    def test_parse_page_range(self):
+        self.assertEqual(parse_page_range("3"), [3])
+        self.assertEqual(parse_page_range("1-4"), [1, 2, 3, 4])
+        for text in ("0-2", "5-1", "a-b", "1-100"):
+            with self.assertRaises(ValueError):
+                parse_page_range(text)
+
+    def test_daily_pages_for(self):
+        """평일 수로 필요한 페이지 수를 추정 (한 페이지 여유)"""
+        today = date(2025, 10, 17)  # 금요일
+        self.assertEqual(daily_pages_for(date(2025, 10, 13), today), [1, 2])
+        self.assertEqual(len(daily_pages_for(date(2025, 1, 2), today)), 22)
+        with self.assertRaises(ValueError):
+            daily_pages_for(date(2020, 1, 2), today)
+        with self.assertRaises(ValueError):
+            daily_pages_for(date(2025, 12, 31), today)
+
+    @patch("stocks.http_client.get", side_effect=_daily_page_response)
+    def test_page_route_serves_from_store(self, mock_get):
+        """기존 페이지 API는 같은 형태로 응답하고, 저장된 페이지는 다시 수집하지 않음"""
+        response = self.client.get("/api/stocks/daily/005930/1/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data[0],
+            {
+                "date": "2025.10.17",
+                "close": "97,900",
+                "change": "400",
+                "change_status": "하락",
+                "open": "98,200",
+                "high": "98,400",
+                "low": "97,400",
+                "volume": "22,123,865",
+            },
+        )
+        self.assertEqual(mock_get.call_count, 1)
+
+        # 2페이지: 모자란 과거 페이지만 수집 (1페이지와 겹치는 일자는 한 번만)
+        second = self.client.get("/api/stocks/daily/005930/2/").data
+        self.assertEqual([row["date"] for row in second], FAKE_DAILY_DATES[10:])
+        self.assertEqual(DailyBar.objects.count(), 19)
+
+        calls = mock_get.call_count
+        self.client.get("/api/stocks/daily/005930/1/")
+        self.assertEqual(mock_get.call_count, calls)  # SYNC_INTERVAL 이내
+        self.assertEqual(
+            self.client.get("/api/stocks/daily/999999/1/").status_code, 404
+        )
+
+    @patch("stocks.http_client.get", side_effect=_daily_page_response)
+    def test_incremental_ingest_fetches_only_new_days(self, mock_get):
+        """저장된 마지막 일자 이전 행이 나오면 중단, 마지막 일자는 갱신"""
+        stock = Stock.objects.get(stock_code="005930")
+        DailyBar.objects.create(
+            stock=stock,
+            date=date(2025, 10, 15),
+            open=1,
+            high=1,
+            low=1,
+            close=1,
+            volume=1,
+        )
+
+        self.assertEqual(ingest_daily_bars("005930"), 3)
+
+        mock_get.assert_called_once()
+        self.assertEqual(DailyBar.objects.get(date=date(2025, 10, 15)).close, 97900)
+
+    def _store_days(self, days):
+        stock = Stock.objects.get(stock_code="005930")
+        DailyBar.objects.bulk_create(
+            DailyBar(
+                stock=stock,
+                date=datetime.strptime(day, "%Y.%m.%d").date(),
+                open=1,
+                high=1,
+                low=1,
+                close=1,
+                volume=1,
+            )
+            for day in days
+        )
+
+    @patch("stocks.http_client.get", side_effect=_daily_page_response)
+    def test_incremental_ingest_fills_gap_below_newest_day(self, mock_get):
+        """마지막 일자만 따로 저장된(중간이 빈) 경우에도 빠진 일자를 채움"""
+        self._store_days(FAKE_DAILY_DATES[:1] + FAKE_DAILY_DATES[5:])
+
+        self.assertEqual(ingest_daily_bars("005930"), 5)
+
+        mock_get.assert_called_once()
+        self.assertEqual(
+            [
+                bar.date.strftime("%Y.%m.%d")
+                for bar in DailyBar.objects.order_by("-date")
+            ],
+            FAKE_DAILY_DATES,
+        )
+
+    @patch("stocks.http_client.get")
+    def test_backfill_finds_gaps_from_dates(self, mock_get):
+        """행 수로는 채워진 페이지도 일자를 확인해 빠진 일자가 있으면 다시 받음"""
+        days = [
+            day.strftime("%Y.%m.%d")
+            for day in pd.bdate_range(end="2025-10-17", periods=30)[::-1]
+        ]
+        mock_get.side_effect = lambda url, **kwargs: MockResponse(
+            _fake_daily_page(days[(int(url.rsplit("page=", 1)[1]) - 1) * 10 :][:10]),
+            200,
+        )
+        self._store_days(days[:4] + days[5:])  # 29일 저장 -> 행 수로는 2페이지
+
+        self.assertEqual(backfill_daily_bars("005930", 3), 1)
+
+        self.assertEqual(DailyBar.objects.count(), 30)
+        self.assertEqual(
+            mock_get.call_count, 3
+        )  # 확인용 2페이지, 3페이지, 다시 받은 1페이지
+        backfill_daily_bars("005930", 3)
+        self.assertEqual(mock_get.call_count, 3)  # 확인한 범위는 다시 받지 않음
+
+    @patch("stocks.http_client.get", side_effect=_daily_page_response)
+    def test_pages_range_merges_and_dedupes(self, mock_get):
+        response = self.client.get(self.url, {"pages": "1-3"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["date"] for row in response.data["results"]], FAKE_DAILY_DATES
+        )
+        # 3페이지는 2페이지와 같으므로 상장일까지 모두 받은 것으로 보고 다시 요청하지 않음
+        calls = mock_get.call_count
+        cache.delete("stocks:daily-synced:005930")
+        self.client.get(self.url, {"pages": "1-5"})
+        self.assertEqual(mock_get.call_count, calls + 1)  # 새 일자 확인만
+
+    @patch("stocks.http_client.get", side_effect=_daily_page_response)
+    def test_columnar_format(self, mock_get):
+        """?format=columnar -> 컬럼별 숫자 배열 (기간 API는 results만)"""
+        data = self.client.get("/api/stocks/daily/005930/1/?format=columnar").json()
+        self.assertEqual(
+            list(data), ["date", "open", "high", "low", "close", "change", "volume"]
+        )
+        self.assertEqual(data["date"][0], "2025-10-17")
+        self.assertEqual(data["close"][:2], [97900, 97900])
+        self.assertEqual(data["change"][0], -400)
+
+        ranged = self.client.get(self.url, {"pages": "1", "format": "columnar"}).json()
+        self.assertEqual(ranged["count"], 10)
+        self.assertEqual(len(ranged["results"]["volume"]), 10)
+
+    @patch("stocks.views.daily_pages_for", return_value=[1, 2])
+    @patch("stocks.http_client.get", side_effect=_daily_page_response)
+    def test_date_range_filters_rows(self, mock_get, mock_pages):
+        response = self.client.get(self.url, {"from": "2025-10-14", "to": "2025-10-16"})
+
+        self.assertEqual(response.status_code, 200)
+        mock_pages.assert_called_once_with(date(2025, 10, 14))
+        self.assertEqual(
+            [row["date"] for row in response.data["results"]],
+            ["2025.10.16", "2025.10.15", "2025.10.14"],
+        )
+
+    def test_bad_params(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(
+            self.client.get(
+                self.url, {"from": "2025-10-17", "to": "2025-10-01"}
+            ).status_code,
+            400,
+        )
+        future = (date.today() + timedelta(days=30)).isoformat()
+        self.assertEqual(self.client.get(self.url, {"from": future}).status_code, 400)
+        with patch("stocks.views.daily_pages_for", return_value=[]):
+            self.assertEqual(
+                self.client.get(self.url, {"from": "2025-10-17"}).status_code, 400
+            )
+
+    @patch("stocks.http_client.get")
+    def test_page_failure(self, mock_get):
+        """과거 페이지 수집 실패 -> 범위 API 503, 저장된 데이터가 없는 페이지 API 500"""
+
+        def fail_second_page(url, **kwargs):
+            if url.endswith("page=2"):
+                raise requests.exceptions.RequestException("Test Error")
+            return _daily_page_response(url)
+
+        mock_get.side_effect = fail_second_page
+        response = self.client.get(self.url, {"pages": "1-2"})
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("2 페이지 조회 실패", response.data["error"])
+
+        response = self.client.get("/api/stocks/daily/005930/2/")
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("일별 시세 처리 중 오류", response.data["error"])
+
+    def test_parse_error_returns_503(self):
+        """파싱/저장 오류(ValueError 등)도 500이 아니라 503"""
+        with patch(
+            "stocks.views.backfill_daily_bars", side_effect=ValueError("Bad Row")
+        ), patch("stocks.views.sync_daily_bars"):
+            response = self.client.get(self.url, {"pages": "1-2"})
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Bad Row", response.data["error"])
+
+
+def _fake_krx_ohlcv(rows):
+    """(종목코드, 종가, 등락률) 목록으로 pykrx 전 종목 OHLCV 형태의 DataFrame 생성"""
+    return pd.DataFrame(
+        [
+            {
+                "시가": close,
+                "고가": close,
+                "저가": close,
+                "종가": close,
+                "거래량": 1000,
+                "거래대금": close * 1000,
+                "등락률": rate,
+            }
+            for _, close, rate in rows
+        ],
+        index=pd.Index([code for code, _, _ in rows], name="티커"),
+    )
+
+
+class EodIngestTests(TestCase):
+    """
+    stocks.eod_ingest (pykrx 전 종목 일별 시세 일괄 수집)를 테스트합니다.
+    """
+
+    def setUp(self):
+        Stock.objects.create(stock_code="005930", stock_name="삼성전자")
+        Stock.objects.create(stock_code="000660", stock_name="SK하이닉스")
+
+    def test_frame_to_bar_fields(self):
+        """
+        거래정지(종가 0) 종목은 제외, 거래 없는 종목의 시가/고가/저가 0은 종가로 채움,
+        전일비는 전일 종가와의 차이 (없으면 등락률로 역산)
+        """
+        frame = _fake_krx_ohlcv(
+            [
+                ("005930", 97900, -0.41),
+                ("000660", 200000, 1.0),
+                ("123456", 0, 0.0),
+                ("035720", 40000, 0.0),
+            ]
+        )
+        frame.loc["035720", ["시가", "고가", "저가", "거래량"]] = 0
+        fields = frame_to_bar_fields(frame, {"005930": 98300})
+        self.assertEqual(list(fields), ["005930", "000660", "035720"])
+        self.assertEqual(
+            [fields["035720"][key] for key in ("open", "high", "low", "volume")],
+            [40000, 40000, 40000, 0],
+        )
+        self.assertEqual(fields["005930"]["close"], 97900)
+        self.assertEqual(fields["005930"]["change"], -400)
+        self.assertEqual(fields["000660"]["change"], 1980)
+
+    @patch("stocks.eod_ingest.fetch_market_ohlcv")
+    def test_range_ingest_resumes(self, mock_fetch):
+        """
+        완료 일자는 다시 조회하지 않고, 실패/미공개 일자만 다시 수집
+        (결과가 없던 일자는 이후 거래일이 수집된 뒤 다시 비어 있으면 휴장으로 확정)
+        """
+        frame = _fake_krx_ohlcv(
+            [("005930", 97900, -0.41), ("000660", 200000, 1.0), ("999999", 10, 0.0)]
+        )
+
+        def fetch(day, market):
+            if day == date(2025, 10, 16):
+                raise ValueError("KRX Error")
+            if day == date(2025, 10, 15):
+                return pd.DataFrame()  # 휴장일 (이 시점에는 미공개와 구분 불가)
+            return frame
+
+        mock_fetch.side_effect = fetch
+        ingest_market_range(date(2025, 10, 14), date(2025, 10, 17), markets=["KOSPI"])
+
+        self.assertEqual(mock_fetch.call_count, 4)
+        self.assertEqual(DailyBar.objects.count(), 4)  # DB에 있는 2종목 x 2일
+        # 17일 전일비는 14일 종가 기준 (15일 휴장, 16일 실패)
+        self.assertEqual(
+            DailyBar.objects.get(stock_id="005930", date=date(2025, 10, 17)).change, 0
+        )
+        statuses = dict(
+            DailyBarIngestion.objects.values_list("date", "status").order_by("date")
+        )
+        self.assertEqual(
+            list(statuses.values()), ["success", "empty", "failed", "success"]
+        )
+
+        mock_fetch.reset_mock()
+        mock_fetch.side_effect = lambda day, market: (
+            pd.DataFrame() if day == date(2025, 10, 15) else frame
+        )
+        call_command(
+            "ingest_daily_bars",
+            "--from",
+            "2025-10-14",
+            "--to",
+            "2025-10-17",
+            "--market",
+            "KOSPI",
+            stdout=StringIO(),
+        )
+        self.assertEqual(
+            [call.args for call in mock_fetch.call_args_list],
+            [(date(2025, 10, 15), "KOSPI"), (date(2025, 10, 16), "KOSPI")],
+        )
+        self.assertEqual(DailyBar.objects.count(), 6)
+        self.assertEqual(
+            DailyBarIngestion.objects.get(date=date(2025, 10, 15)).status, "holiday"
+        )
+
+    @patch("stocks.eod_ingest.fetch_market_ohlcv")
+    def test_catch_up_from_last_stored_date(self, mock_fetch):
+        """종목별 마지막 저장 일자 중 가장 이른 날 다음 날부터 오늘까지 (실패한 일자도 다시)"""
+        Stock.objects.filter(stock_code="005930").update(market_type="KOSPI")
+        Stock.objects.filter(stock_code="000660").update(market_type="KOSPI")
+        for code, day in [
+            ("005930", date(2025, 10, 14)),
+            ("000660", date(2025, 10, 16)),
+        ]:
+            DailyBar.objects.create(
+                stock_id=code, date=day, open=1, high=1, low=1, close=1, volume=1
+            )
+        frame = _fake_krx_ohlcv([("005930", 97900, -0.41), ("000660", 200000, 1.0)])
+
+        def fetch(day, market):
+            if day == date(2025, 10, 16):
+                raise ValueError("KRX Error")
+            return frame
+
+        mock_fetch.side_effect = fetch
+        ingest_market_catch_up(date(2025, 10, 17), markets=["KOSPI"])
+
+        self.assertEqual(
+            [call.args[0] for call in mock_fetch.call_args_list],
+            [date(2025, 10, 15), date(2025, 10, 16), date(2025, 10, 17)],
+        )
+
+        # 다음 실행: 실패했던 16일만 다시 조회 (완료된 15/17일은 건너뜀)
+        mock_fetch.reset_mock()
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = frame
+        ingest_market_catch_up(date(2025, 10, 17), markets=["KOSPI"])
+        mock_fetch.assert_called_once_with(date(2025, 10, 16), "KOSPI")
+        self.assertEqual(
+            DailyBar.objects.filter(
+                stock_id="005930", date__gt=date(2025, 10, 14)
+            ).count(),
+            3,
+        )
+        self.assertEqual(
+            catch_up_start("KOSPI", date(2025, 10, 17)), date(2025, 10, 17)
+        )
+
+    @patch("stocks.eod_ingest.fetch_market_ohlcv")
+    def test_catch_up_retries_unpublished_day(self, mock_fetch):
+        """평일 저녁에 KRX 데이터가 아직 없으면 미공개로 남기고 다음 실행에서 다시 수집"""
+        mock_fetch.return_value = pd.DataFrame()
+        ingest_market_catch_up(date(2025, 10, 17), markets=["KOSPI"])
+        self.assertEqual(
+            DailyBarIngestion.objects.get(date=date(2025, 10, 17)).status, "empty"
+        )
+
+        mock_fetch.reset_mock()
+        mock_fetch.return_value = _fake_krx_ohlcv([("005930", 97900, -0.41)])
+        ingest_market_catch_up(date(2025, 10, 20), markets=["KOSPI"])
+        self.assertEqual(
+            [call.args[0] for call in mock_fetch.call_args_list],
+            [date(2025, 10, 17), date(2025, 10, 20)],
+        )
+        self.assertTrue(
+            DailyBar.objects.filter(stock_id="005930", date=date(2025, 10, 17)).exists()
+        )
+
+
+class IndicatorTests(APITestCase):
+    """
+    stocks.indicators (기술적 지표)와 지표 API를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        stock = Stock.objects.create(stock_code="005930", stock_name="삼성전자")
+        closes = [100 + (i % 7) * 3 - (i % 5) * 2 + i for i in range(80)]
+        self.closes = closes
+        DailyBar.objects.bulk_create(
+            DailyBar(
+                stock=stock,
+                date=day.date(),
+                open=close,
+                high=close,
+                low=close,
+                close=close,
+                volume=1000,
+            )
+            for day, close in zip(pd.bdate_range(end="2025-10-17", periods=80), closes)
+        )
+
+    def test_parse_spec(self):
+        self.assertEqual(parse_spec("macd"), ("macd", (12, 26, 9)))
+        self.assertEqual(parse_spec("Bollinger:20:2.5"), ("bollinger", (20, 2.5)))
+        for spec in ("foo:1", "sma:0", "macd:12:26", "sma:x"):
+            with self.assertRaises(ValueError):
+                parse_spec(spec)
+
+    def test_compute_matches_reference(self):
+        """pandas 기준 계산과 같은 값"""
+        close = pd.Series(self.closes, dtype="float64")
+
+        sma = compute_indicator(self.closes, "sma", (20,))["sma"]
+        self.assertIsNone(sma[18])
+        self.assertAlmostEqual(sma[-1], round(close.rolling(20).mean().iloc[-1], 2))
+
+        macd = compute_indicator(self.closes, "macd", (12, 26, 9))
+        expected = (
+            close.ewm(span=12, adjust=False).mean()
+            - close.ewm(span=26, adjust=False).mean()
+        )
+        self.assertAlmostEqual(macd["macd"][-1], round(expected.iloc[-1], 2))
+        self.assertIsNone(macd["signal"][32])
+        self.assertIsNotNone(macd["signal"][33])
+
+        rsi = compute_indicator(self.closes, "rsi", (14,))["rsi"]
+        self.assertTrue(all(0 <= v <= 100 for v in rsi if v is not None))
+
+        # Wilder 평활을 직접 계산한 기준값과 비교 (첫 값은 등락폭 14개가 쌓인 index 14)
+        alpha = 1 / 14
+        avg_gain = avg_loss = None
+        expected_rsi = []
+        for prev, cur in zip(self.closes, self.closes[1:]):
+            gain, loss = max(cur - prev, 0), max(prev - cur, 0)
+            if avg_gain is None:
+                avg_gain, avg_loss = gain, loss
+            else:
+                avg_gain = (1 - alpha) * avg_gain + alpha * gain
+                avg_loss = (1 - alpha) * avg_loss + alpha * loss
+            expected_rsi.append(
+                100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+            )
+        self.assertIsNone(rsi[13])
+        self.assertAlmostEqual(rsi[14], round(expected_rsi[13], 2))
+        self.assertAlmostEqual(rsi[-1], round(expected_rsi[-1], 2))
+        self.assertEqual(compute_indicator([1, 2, 3, 4], "rsi", (2,))["rsi"][-1], 100)
+
+        bands = compute_indicator(self.closes, "bollinger", (20, 2))
+        self.assertGreater(bands["upper"][-1], bands["middle"][-1])
+        self.assertAlmostEqual(bands["middle"][-1], sma[-1])
+
+    @patch("stocks.indicators.compute_indicator", wraps=compute_indicator)
+    @patch("stocks.http_client.get")
+    def test_indicator_route_and_cache(self, mock_get, mock_compute):
+        """수집에 실패해도 저장된 봉으로 계산하고, 같은 마지막 봉이면 캐시 사용"""
+        mock_get.side_effect = requests.exceptions.RequestException("Test Error")
+        url = "/api/stocks/indicators/005930/"
+        params = {"indicators": "sma:5,rsi:14", "days": 30}
+
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["dates"]), 30)
+        self.assertEqual(response.data["dates"][-1], "2025-10-17")
+        self.assertEqual(response.data["close"][-1], self.closes[-1])
+        self.assertEqual(set(response.data["indicators"]), {"sma:5", "rsi:14"})
+        self.assertEqual(len(response.data["indicators"]["rsi:14"]["rsi"]), 30)
+        self.assertEqual(mock_compute.call_count, 2)
+
+        self.client.get(url, params)
+        self.assertEqual(mock_compute.call_count, 2)
+
+        self.assertEqual(self.client.get(url, {"indicators": "foo"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"days": 0}).status_code, 400)
+        self.assertEqual(
+            self.client.get("/api/stocks/indicators/999999/").status_code, 404
+        )
+
+    def test_no_bars_without_error_is_404(self):
+        """수집 오류 없이 일별 시세가 하나도 없으면 'None'이 아니라 명시적인 404"""
+        Stock.objects.create(stock_code="000660", stock_name="SK하이닉스")
+        with patch("stocks.views.sync_daily_bars"), patch(
+            "stocks.views.backfill_daily_bars"
+        ):
+            response = self.client.get("/api/stocks/indicators/000660/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["error"], "일별 시세가 없습니다.")
+
 
 # (참고) StockTimeTicksView, StockDailyPriceView 테스트
 # 위와 동일한 방식으로 가짜 HTML을 정의하고,
@@ -0,0 +1,287 @@
+# backend/stocks/tick_store.py
+
+import logging
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Max
+
+from . import http_client
+from .fetcher import fetch_engine
+from .models import IntradayTick, Stock
+from .parsers import parse_time_ticks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICK_STORE_SETTINGS = {
+    "SYNC_INTERVAL": 10,  # 같은 종목을 다시 수집하기까지의 최소 간격 (초)
+    "MAX_PAGES": 40,  # 한 번에 수집하는 최대 페이지 수 (페이지당 10건, 하루 약 390분)
+    "LOCK_TIMEOUT": 60,  # 종목별 수집 락 유지 시간 (초)
+    "FETCH_BATCH": 8,  # 처음 수집할 때 동시에 가져오는 페이지 수
+    "CACHE_ALIAS": "default",
+}
+
+TICKS_PAGE_SIZE = 10  # 네이버 시간별 시세 한 페이지의 행 수 (기존 페이지 API와 동일)
+
+SYNCED_KEY_PREFIX = "stocks:ticks-synced:"
+LOCK_KEY_PREFIX = "stocks:ticks-lock:"
+
+TICK_URL = (
+    "https://finance.naver.com/item/sise_time.naver"
+    "?code={code}&page={page}&thistime={thistime}"
+)
+
+
+def _tick_store_settings():
+    return {**DEFAULT_TICK_STORE_SETTINGS, **getattr(settings, "TICK_STORE", {})}
+
+
+def _shared():
+    return caches[_tick_store_settings()["CACHE_ALIAS"]]
+
+
+def _recently_synced(key):
+    """최근 수집 여부. Redis 장애 시에는 수집하도록 False"""
+    try:
+        return bool(_shared().get(key))
+    except Exception as e:
+        logger.warning(f"시간별 시세 수집 기록 조회 실패({key}): {e}")
+        return False
+
+
+def _try_lock(lock_key, timeout):
+    """락 획득 여부. Redis 장애 시에는 락 없이 수집하도록 True"""
+    try:
+        return _shared().add(lock_key, 1, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"시간별 시세 수집 락 획득 실패({lock_key}): {e}")
+        return True
+
+
+def get_trading_date(today=None):
+    """
+    시간별 시세를 조회할 거래일.
+    토요일/일요일이면 가장 최근의 금요일로 맞춥니다. (공휴일은 고려하지 않음)
+    """
+    today = today or datetime.now().date()
+    if today.weekday() == 5:  # 토요일
+        return today - timedelta(days=1)
+    if today.weekday() == 6:  # 일요일
+        return today - timedelta(days=2)
+    return today
+
+
+def _to_int(text):
+    """'17,813,592' -> 17813592, 비어 있거나 숫자가 아니면 None"""
+    cleaned = text.replace(",", "").strip()
+    try:
+        return int(cleaned)
+    except ValueError:
+        return None
+
+
+def _parse_tick_time(text):
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            return datetime.strptime(text, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def to_tick_fields(row):
+    """
+    parse_time_ticks()의 문자열 행을 IntradayTick 필드 값으로 변환합니다.
+    체결시각/체결가를 해석할 수 없는 행은 None
+    """
+    tick_time = _parse_tick_time(row["time"])
+    price = _to_int(row["price"])
+    if tick_time is None or price is None:
+        return None
+    change = _to_int(row["change"]) or 0
+    if row["change_status"] in ("하락", "하한가"):
+        change = -change
+    return {
+        "tick_time": tick_time,
+        "price": price,
+        "change": change,
+        "sell_price": _to_int(row["sell_price"]),
+        "buy_price": _to_int(row["buy_price"]),
+        "volume": _to_int(row["volume"]) or 0,
+        "volume_change": _to_int(row["volume_change"]) or 0,
+    }
+
+
+def serialize_tick(tick):
+    """IntradayTick -> 기존 시간별 시세 API와 같은 형태의 딕셔너리"""
+    if tick.change > 0:
+        change_status = "상승"
+    elif tick.change < 0:
+        change_status = "하락"
+    else:
+        change_status = ""
+    return {
+        "time": tick.tick_time.strftime("%H:%M"),
+        "price": f"{tick.price:,}",
+        "change": f"{abs(tick.change):,}",
+        "change_status": change_status,
+        "sell_price": f"{tick.sell_price:,}" if tick.sell_price is not None else "",
+        "buy_price": f"{tick.buy_price:,}" if tick.buy_price is not None else "",
+        "volume": f"{tick.volume:,}",
+        "volume_change": f"{tick.volume_change:,}",
+    }
+
+
+def fetch_tick_page(stock_code, page, trade_date):
+    """네이버 시간별 시세 한 페이지를 가져와 파싱합니다. (최신 체결부터 10건)"""
+    url = TICK_URL.format(
+        code=stock_code,
+        page=page,
+        thistime=trade_date.strftime("%Y%m%d") + "180000",  # 장 마감 이후 시각
+    )
+    headers = {
+        "Referer": f"https://finance.naver.com/item/sise.naver?code={stock_code}",
+    }
+    response = http_client.get(url, headers=headers)
+    response.raise_for_status()
+    return parse_time_ticks(response.text)
+
+
+def _iter_tick_pages(stock_code, trade_date, batch_size):
+    """
+    1페이지부터 차례로 (페이지의 행 리스트)를 내보냅니다.
+    batch_size 페이지씩 공용 조회 엔진으로 동시에 가져오며, 호출 측이 중단하면
+    다음 묶음은 요청하지 않습니다. 실패한 페이지에 도달하면 그 예외를 발생시킵니다.
+    """
+    max_pages = _tick_store_settings()["MAX_PAGES"]
+    for start in range(1, max_pages + 1, batch_size):
+        pages = list(range(start, min(start + batch_size, max_pages + 1)))
+        if len(pages) == 1:
+            yield fetch_tick_page(stock_code, start, trade_date)
+            continue
+        results = fetch_engine.map(
+            lambda page: fetch_tick_page(stock_code, page, trade_date), pages
+        )
+        for page in pages:
+            if isinstance(results[page], Exception):
+                raise results[page]
+            yield results[page]
+
+
+def ingest_ticks(stock_code, trade_date=None):
+    """
+    저장된 마지막 체결시각 이후의 시간별 시세만 수집하여 저장합니다.
+    - 1페이지(최신)부터 내려가며, 저장된 마지막 시각보다 이전 행이 나오면 중단
+    - 마지막 시각의 행은 진행 중인 분일 수 있으므로 다시 받아 갱신
+    - 저장된 데이터가 없으면 FETCH_BATCH 페이지씩 동시에 가져옴 (새 체결만 받을 때는 1페이지씩)
+    저장(추가/갱신)한 행 수를 반환합니다.
+    """
+    trade_date = trade_date or get_trading_date()
+    stock = Stock.objects.get(stock_code=stock_code)
+    last_time = IntradayTick.objects.filter(
+        stock=stock, trade_date=trade_date
+    ).aggregate(last=Max("tick_time"))["last"]
+
+    batch_size = 1 if last_time is not None else _tick_store_settings()["FETCH_BATCH"]
+    collected = {}
+    for rows in _iter_tick_pages(stock_code, trade_date, max(batch_size, 1)):
+        fields = [to_tick_fields(row) for row in rows]
+        fields = [f for f in fields if f is not None]
+        if not fields:
+            break
+
+        # 마지막 페이지를 넘기면 네이버는 마지막 페이지를 다시 보여주므로 중단
+        if all(f["tick_time"] in collected for f in fields):
+            break
+
+        reached_stored = False
+        for f in fields:
+            if last_time is not None and f["tick_time"] < last_time:
+                reached_stored = True
+                continue
+            collected.setdefault(f["tick_time"], f)
+
+        if reached_stored or len(fields) < TICKS_PAGE_SIZE:
+            break
+
+    if not collected:
+        return 0
+
+    IntradayTick.objects.bulk_create(
+        [
+            IntradayTick(stock=stock, trade_date=trade_date, **f)
+            for f in collected.values()
+        ],
+        update_conflicts=True,
+        unique_fields=["stock", "trade_date", "tick_time"],
+        update_fields=[
+            "price",
+            "change",
+            "sell_price",
+            "buy_price",
+            "volume",
+            "volume_change",
+        ],
+    )
+    return len(collected)
+
+
+def sync_ticks(stock_code, trade_date=None):
+    """
+    요청 경로에서 호출하는 수집 진입점.
+    SYNC_INTERVAL 이내에 이미 수집했거나 다른 요청/프로세스가 수집 중이면 건너뜁니다.
+    (공유 캐시에 접근할 수 없으면 간격/락 없이 수집)
+    수집한 경우 저장 행 수, 건너뛴 경우 None을 반환합니다.
+    """
+    trade_date = trade_date or get_trading_date()
+    options = _tick_store_settings()
+    suffix = f"{stock_code}:{trade_date.isoformat()}"
+
+    if _recently_synced(SYNCED_KEY_PREFIX + suffix):
+        return None
+    if not _try_lock(LOCK_KEY_PREFIX + suffix, options["LOCK_TIMEOUT"]):
+        return None
+    try:
+        count = ingest_ticks(stock_code, trade_date)
+        try:
+            _shared().set(
+                SYNCED_KEY_PREFIX + suffix, 1, timeout=options["SYNC_INTERVAL"]
+            )
+        except Exception as e:
+            logger.warning(f"시간별 시세 수집 기록 저장 실패({suffix}): {e}")
+        return count
+    finally:
+        try:
+            _shared().delete(LOCK_KEY_PREFIX + suffix)
+        except Exception as e:
+            logger.warning(f"시간별 시세 수집 락 해제 실패({suffix}): {e}")
+
+
+def get_ticks(
+    stock_code,
+    trade_date,
+    before=None,
+    limit=TICKS_PAGE_SIZE,
+    offset=0,
+    since=None,
+    until=None,
+):
+    """
+    저장된 시간별 시세를 최신 체결부터 조회합니다.
+    - before: 이 시각 이전만 (커서)
+    - since/until: 이 시각 이후/까지 (둘 다 포함)
+    - limit: None이면 offset 이후 전부
+    """
+    queryset = IntradayTick.objects.filter(
+        stock_id=stock_code, trade_date=trade_date
+    ).order_by("-tick_time")
+    if before is not None:
+        queryset = queryset.filter(tick_time__lt=before)
+    if since is not None:
+        queryset = queryset.filter(tick_time__gte=since)
+    if until is not None:
+        queryset = queryset.filter(tick_time__lte=until)
+    if limit is None:
+        return list(queryset[offset:])
+    return list(queryset[offset : offset + limit])
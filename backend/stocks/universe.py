@@ -0,0 +1,350 @@
+# backend/stocks/universe.py
+
+import logging
+import uuid
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import ProtectedError
+
+from . import http_client
+from .fetcher import fetch_engine
+from .models import Stock
+from .parsers import MARKET_SUM_STRAINER, make_soup
+from .snapshot import (
+    MARKET_SUM_URL,
+    parse_last_page,
+    parse_market_sum_rows,
+    store_price_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+# 시장 구분 -> 시가총액 페이지의 sosok 파라미터
+MARKET_SOSOK = {"KOSPI": 0, "KOSDAQ": 1}
+
+DEFAULT_STOCK_SYNC_SETTINGS = {
+    "MARKETS": list(MARKET_SOSOK),
+    # 1페이지에서 마지막 페이지 번호(pgRR)를 읽지 못했을 때 사용할 페이지 수
+    "PAGES": {"KOSPI": 48, "KOSDAQ": 36},
+    "CHECKPOINT_TTL": 60 * 60,  # 완료된 페이지 보관 시간 (초) - --resume 가능 시간
+    "BATCH_SIZE": 1000,  # bulk_create 배치 크기
+    "CACHE_ALIAS": "default",
+}
+
+CHECKPOINT_RUN_KEY = "stocks:crawl-run"
+CHECKPOINT_KEY_PREFIX = "stocks:crawl-page:"
+PAGE_COUNT_KEY_PREFIX = "stocks:crawl-pages:"
+EMPTY_PAGE_ERROR = "종목 행이 없는 페이지 (레이아웃 변경 또는 빈 응답)"
+
+
+def stock_sync_settings():
+    return {**DEFAULT_STOCK_SYNC_SETTINGS, **getattr(settings, "STOCK_SYNC", {})}
+
+
+def _shared():
+    return caches[stock_sync_settings()["CACHE_ALIAS"]]
+
+
+def fetch_market_sum_page(market, page):
+    """
+    시가총액 페이지 하나를 조회합니다. (종목 행 목록, 마지막 페이지 번호 또는 None)
+    실패 시 예외
+    """
+    url = MARKET_SUM_URL.format(sosok=MARKET_SOSOK[market], page=page)
+    response = http_client.get(url, headers={"User-Agent": "Mozilla/5.0"})
+    response.raise_for_status()
+    soup = make_soup(response.text, parse_only=MARKET_SUM_STRAINER)
+    return parse_market_sum_rows(soup), parse_last_page(soup)
+
+
+@dataclass
+class CrawlResult:
+    market: str
+    pages: int = 0  # 마지막 페이지 번호 (1페이지 조회 실패 시 0)
+    rows_by_page: dict = field(default_factory=dict)  # {페이지: 종목 행 목록}
+    failed: dict = field(default_factory=dict)  # {페이지: 예외}
+    fetched: int = 0  # 이번 실행에서 새로 조회한 페이지 수 (나머지는 체크포인트)
+    snapshot_count: int = 0
+
+    @property
+    def stocks(self):
+        """{종목코드: 종목명} (페이지 순서대로)"""
+        return {
+            row["code"]: row["name"]
+            for page in sorted(self.rows_by_page)
+            for row in self.rows_by_page[page]
+        }
+
+    @property
+    def complete(self):
+        """
+        1~마지막 페이지를 모두 가져왔고 모든 페이지에 종목이 있는지
+        (아니면 빠진 페이지의 종목이 상장 폐지로 삭제되므로 종목 DB 동기화 불가)
+        """
+        return (
+            not self.failed
+            and self.pages > 0
+            and set(self.rows_by_page) == set(range(1, self.pages + 1))
+            and all(self.rows_by_page.values())
+        )
+
+
+class _Checkpoints:
+    """
+    완료된 페이지를 실행(run) 단위로 공유 캐시에 기록합니다.
+    새 실행은 새 run id를 쓰므로 이전 실행의 기록은 읽지 않고 TTL로 만료됩니다.
+    """
+
+    def __init__(self, enabled, resume):
+        self.enabled = enabled
+        self.shared = _shared()
+        self.ttl = stock_sync_settings()["CHECKPOINT_TTL"]
+        self.run = None
+        if not enabled:
+            return
+        try:
+            if resume:
+                self.run = self.shared.get(CHECKPOINT_RUN_KEY)
+            if self.run is None:
+                self.run = uuid.uuid4().hex
+            self.shared.set(CHECKPOINT_RUN_KEY, self.run, timeout=self.ttl)
+        except Exception as e:
+            logger.warning(f"크롤링 체크포인트 초기화 실패: {e}")
+            self.enabled = False
+
+    def _page_key(self, market, page):
+        return f"{CHECKPOINT_KEY_PREFIX}{self.run}:{market}:{page}"
+
+    def _count_key(self, market):
+        return f"{PAGE_COUNT_KEY_PREFIX}{self.run}:{market}"
+
+    def _get_many(self, keys):
+        if not self.enabled or not keys:
+            return {}
+        try:
+            return self.shared.get_many(keys)
+        except Exception as e:
+            logger.warning(f"크롤링 체크포인트 조회 실패: {e}")
+            return {}
+
+    def page_counts(self, markets):
+        keys = {self._count_key(market): market for market in markets}
+        return {keys[key]: count for key, count in self._get_many(list(keys)).items()}
+
+    def pages(self, market_pages):
+        """[(시장, 페이지)] 중 기록된 페이지 {(시장, 페이지): 행 목록}"""
+        keys = {self._page_key(*key): key for key in market_pages}
+        return {keys[key]: rows for key, rows in self._get_many(list(keys)).items()}
+
+    def save(self, page_counts, rows_by_key):
+        if not self.enabled:
+            return
+        entries = {self._count_key(m): count for m, count in page_counts.items()}
+        entries.update(
+            {self._page_key(*key): rows for key, rows in rows_by_key.items()}
+        )
+        try:
+            self.shared.set_many(entries, timeout=self.ttl)
+        except Exception as e:
+            logger.warning(f"크롤링 체크포인트 저장 실패: {e}")
+
+
+def clear_checkpoints():
+    """이번 실행의 체크포인트를 버립니다. (다음 --resume은 처음부터)"""
+    try:
+        _shared().delete(CHECKPOINT_RUN_KEY)
+    except Exception as e:
+        logger.warning(f"크롤링 체크포인트 삭제 실패: {e}")
+
+
+def crawl_markets(markets=None, resume=False, checkpoint=True):
+    """
+    시장별 시가총액 페이지를 조회 엔진(공유 요청 제한)으로 동시에 조회합니다. {시장: CrawlResult}
+    - 시장별 1페이지를 먼저 조회하여 마지막 페이지 번호(pgRR)를 알아낸 뒤 나머지를 한 번에 조회
+    - 조회한 행의 현재가/등락/거래량/시가총액은 시세 스냅샷으로 저장
+    - checkpoint면 완료된 페이지를 기록하고, resume이면 이전 실행에서 기록된 페이지는
+      다시 조회하지 않습니다.
+    """
+    options = stock_sync_settings()
+    markets = list(markets or options["MARKETS"])
+    checkpoints = _Checkpoints(checkpoint, resume)
+    results = {market: CrawlResult(market=market) for market in markets}
+    fetched = {}  # {(시장, 페이지): 행 목록}
+
+    # --- 1. 시장별 1페이지 (마지막 페이지 번호) ---
+    page_counts = checkpoints.page_counts(markets) if resume else {}
+    first = [market for market in markets if market not in page_counts]
+    for market, outcome in fetch_engine.map(
+        lambda market: fetch_market_sum_page(market, 1), first
+    ).items():
+        if isinstance(outcome, Exception):
+            logger.error(f"{market} 1 페이지 크롤링 실패: {outcome}")
+            results[market].failed[1] = outcome
+            continue
+        rows, last_page = outcome
+        if not rows:
+            logger.error(f"{market} 1 페이지에 종목이 없습니다.")
+            results[market].failed[1] = ValueError(EMPTY_PAGE_ERROR)
+            continue
+        if last_page is None:
+            last_page = options["PAGES"][market]
+            logger.warning(
+                f"{market} 마지막 페이지를 찾지 못해 {last_page}페이지로 조회합니다."
+            )
+        page_counts[market] = last_page
+        fetched[(market, 1)] = rows
+
+    # --- 2. 나머지 페이지 (체크포인트에 없는 페이지만 동시 조회) ---
+    remaining = [
+        (market, page)
+        for market, count in page_counts.items()
+        for page in range(1, count + 1)
+        if (market, page) not in fetched
+    ]
+    stored = checkpoints.pages(remaining) if resume else {}
+    missing = [key for key in remaining if key not in stored]
+    for key, outcome in fetch_engine.map(
+        lambda key: fetch_market_sum_page(*key)[0], missing
+    ).items():
+        if not isinstance(outcome, Exception) and not outcome:
+            # 레이아웃 변경/요청 제한으로 빈 응답을 받은 페이지는 실패로 처리 (체크포인트 제외)
+            outcome = ValueError(EMPTY_PAGE_ERROR)
+        if isinstance(outcome, Exception):
+            logger.error(f"{key[0]} {key[1]} 페이지 크롤링 실패: {outcome}")
+            results[key[0]].failed[key[1]] = outcome
+        else:
+            fetched[key] = outcome
+
+    checkpoints.save(page_counts, fetched)
+    for market, result in results.items():
+        result.pages = page_counts.get(market, 0)
+        result.rows_by_page.update(
+            {page: rows for (m, page), rows in stored.items() if m == market}
+        )
+        fresh = {page: rows for (m, page), rows in fetched.items() if m == market}
+        result.rows_by_page.update(fresh)
+        result.fetched = len(fresh)
+        result.snapshot_count = store_price_snapshot(
+            [row for rows in fresh.values() for row in rows], market_type=market
+        )
+    return results
+
+
+@dataclass
+class StockChanges:
+    """종목 DB 동기화 결과 (변경된 종목만)"""
+
+    inserted: dict = field(default_factory=dict)  # {종목코드: 종목명}
+    renamed: dict = field(default_factory=dict)  # {종목코드: (이전 이름, 새 이름)}
+    remarketed: dict = field(default_factory=dict)  # {종목코드: (이전 시장, 새 시장)}
+    delisted: set = field(default_factory=set)
+    protected: set = field(
+        default_factory=set
+    )  # 상장 폐지됐지만 주문/거래/보유 내역으로 남긴 종목
+    unverified: set = field(
+        default_factory=set
+    )  # 일부 시장만 크롤링해 다른 시장으로 옮겼는지 알 수 없어 남긴 종목
+
+    def __bool__(self):
+        return bool(self.inserted or self.renamed or self.remarketed or self.delisted)
+
+    @property
+    def codes(self):
+        """변경된(캐시를 무효화해야 하는) 종목코드 집합"""
+        return {*self.inserted, *self.renamed, *self.remarketed, *self.delisted}
+
+    def summary(self):
+        return {
+            "inserted": len(self.inserted),
+            "renamed": len(self.renamed),
+            "remarketed": len(self.remarketed),
+            "delisted": len(self.delisted),
+            "protected": len(self.protected),
+            "unverified": len(self.unverified),
+            "codes": sorted(self.codes),
+        }
+
+
+def diff_stocks(crawled, existing, markets):
+    """
+    크롤링 결과와 종목 DB의 차이를 계산합니다. (둘 다 {종목코드: (종목명, 시장)})
+    상장 폐지는 이번에 크롤링한 시장(markets)에서 빠진 종목만 대상이며, 설정된 시장을
+    모두 크롤링했을 때만 확정합니다. 일부 시장만 크롤링했으면 크롤링하지 않은 시장으로
+    옮겼을 수 있으므로 삭제하지 않고 unverified로 남깁니다.
+    """
+    changes = StockChanges()
+    for code, (name, market) in crawled.items():
+        if code not in existing:
+            changes.inserted[code] = name
+            continue
+        old_name, old_market = existing[code]
+        if name != old_name:
+            changes.renamed[code] = (old_name, name)
+        if market != old_market:
+            changes.remarketed[code] = (old_market, market)
+    missing = {
+        code
+        for code, (_, market) in existing.items()
+        if market in markets and code not in crawled
+    }
+    if set(markets) >= set(stock_sync_settings()["MARKETS"]):
+        changes.delisted = missing
+    else:
+        changes.unverified = missing
+    return changes
+
+
+def delete_stocks(codes):
+    """
+    종목들을 한 번에 삭제합니다. 주문/거래/보유 내역이 있는 종목(on_delete=PROTECT)은
+    남겨두고, 남긴 종목코드 집합을 반환합니다.
+    """
+    if not codes:
+        return set()
+    try:
+        Stock.objects.filter(stock_code__in=codes).delete()
+        return set()
+    except ProtectedError as e:
+        protected = {obj.stock_id for obj in e.protected_objects}
+        Stock.objects.filter(stock_code__in=set(codes) - protected).delete()
+        return protected
+
+
+def sync_stocks(crawled, markets):
+    """
+    크롤링한 종목 {종목코드: (종목명, 시장)}과 종목 DB를 메모리에서 비교하여
+    추가/이름 변경/시장 변경 종목만 한 번의 bulk_create(update_conflicts)로 쓰고,
+    상장 폐지 종목은 한 번에 삭제합니다. 변경이 없으면 쓰기 쿼리가 없습니다. (StockChanges)
+    """
+    with transaction.atomic():
+        existing = {
+            code: (name, market)
+            for code, name, market in Stock.objects.values_list(
+                "stock_code", "stock_name", "market_type"
+            )
+        }
+        changes = diff_stocks(crawled, existing, markets)
+        upserts = dict.fromkeys(
+            [*changes.inserted, *changes.renamed, *changes.remarketed]
+        )
+        if upserts:
+            Stock.objects.bulk_create(
+                [
+                    Stock(
+                        stock_code=code,
+                        stock_name=crawled[code][0],
+                        market_type=crawled[code][1],
+                    )
+                    for code in upserts
+                ],
+                batch_size=stock_sync_settings()["BATCH_SIZE"],
+                update_conflicts=True,
+                unique_fields=["stock_code"],
+                update_fields=["stock_name", "market_type", "updated_at"],
+            )
+        changes.protected = delete_stocks(changes.delisted)
+        changes.delisted -= changes.protected
+    return changes
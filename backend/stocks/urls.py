@@ -4,9 +4,15 @@ from django.urls import path
 
 from .views import (
     MarketIndexView,
+    StockAutocompleteView,
     StockDailyPriceView,
+    StockDailyRangeView,
     StockDetailView,
+    StockIndicatorView,
+    StockIntradayBarView,
     StockSearchView,
+    StockTickCursorView,
+    StockTickRangeView,
     StockTimeTicksView,
 )
 
@@ -14,12 +20,42 @@ urlpatterns = [
     # GET /api/stocks/market-index/ 로 요청이 오면 MarketIndexView를 실행
     path("market-index/", MarketIndexView.as_view(), name="market-index"),
     path("search/", StockSearchView.as_view(), name="stock-search"),
+    path(
+        "autocomplete/",
+        StockAutocompleteView.as_view(),
+        name="stock-autocomplete",
+    ),
     path("detail/<str:stockCode>/", StockDetailView.as_view(), name="stock-detail"),
+    path(
+        "ticks/<str:stockCode>/",
+        StockTickCursorView.as_view(),
+        name="stock-ticks-cursor",
+    ),
+    path(
+        "ticks/<str:stockCode>/range/",
+        StockTickRangeView.as_view(),
+        name="stock-ticks-range",
+    ),
     path(
         "ticks/<str:stockCode>/<int:page>/",
         StockTimeTicksView.as_view(),
         name="stock-ticks",
     ),
+    path(
+        "bars/<str:stockCode>/",
+        StockIntradayBarView.as_view(),
+        name="stock-intraday-bars",
+    ),
+    path(
+        "indicators/<str:stockCode>/",
+        StockIndicatorView.as_view(),
+        name="stock-indicators",
+    ),
+    path(
+        "daily/<str:stockCode>/range/",
+        StockDailyRangeView.as_view(),
+        name="stock-daily-range",
+    ),
     path(
         "daily/<str:stockCode>/<int:page>/",
         StockDailyPriceView.as_view(),
@@ -3,22 +3,88 @@
 import logging
 import re
 import time
-import urllib.parse
-from datetime import datetime, timedelta
+from datetime import date
+from datetime import time as dt_time
 from decimal import Decimal, InvalidOperation
 
 import requests
-from bs4 import BeautifulSoup
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
 # Django Rest Framework의 APIView와 Response를 사용합니다.
 from rest_framework.views import APIView
 
+from . import http_client
+from .autocomplete import autocomplete_settings, get_suggestions
+from .bars import BAR_INTERVALS, get_intraday_bars
+from .columnar import (
+    ColumnarJSONRenderer,
+    daily_bars_to_columnar,
+    intraday_bars_to_columnar,
+    is_columnar,
+    ticks_to_columnar,
+)
+from .daily_store import (
+    backfill_daily_bars,
+    get_daily_bars,
+    serialize_daily_bar,
+    sync_daily_bars,
+)
+from .fetcher import fetch_prices
+from .indicators import (
+    DEFAULT_SPECS,
+    get_indicators,
+    parse_spec,
+    spec_key,
+    warmup_length,
+)
+from .market_index import (
+    get_cached_market_index,
+    is_stale,
+    market_index_settings,
+    try_refresh_market_index,
+)
 from .models import Stock
+from .parsers import (  # noqa: F401 (헬퍼 함수는 기존 경로로도 임포트 가능하도록 유지)
+    derive_order_book,
+    make_soup,
+    parse_change_data,
+    parse_current_price,
+    parse_daily_prices,
+    parse_market_index,
+    parse_order_book,
+    parse_search_results,
+    parse_sign,
+    parse_span_numbers,
+    parse_stock_header,
+    parse_time_ticks,
+)
+from .quote_cache import Quote, quote_cache
+from .ranges import (
+    DAILY_PAGE_SIZE,
+    MAX_RANGE_PAGES,
+    daily_pages_for,
+    parse_page_range,
+)
+from .response_cache import cache_response
+from .search_index import get_search_index
+from .snapshot import get_snapshot_rows
+from .tick_store import (
+    TICKS_PAGE_SIZE,
+    get_ticks,
+    get_trading_date,
+    serialize_tick,
+    sync_ticks,
+)
 
 logger = logging.getLogger(__name__)
 
+# 차트용 API는 ?format=columnar 로 컬럼별 숫자 배열 응답을 받을 수 있음
+CHART_RENDERER_CLASSES = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+
 
 # ================================================================
 # ✨ [신규 추가] 거래(Trading) 앱을 위한 헬퍼 함수
@@ -26,121 +92,133 @@ logger = logging.getLogger(__name__)
 def get_current_stock_price_for_trading(stock_code: str) -> Decimal:
     """
     [거래 로직 전용 함수]
-    주문 처리에 필요한 '현재가'만 빠르게 크롤링하여 Decimal 타입으로 반환합니다.
+    주문 처리에 필요한 '현재가'를 Decimal 타입으로 반환합니다.
     이 함수는 trading 앱에서 직접 임포트하여 사용합니다.
+    (현재가 캐시를 거치므로 TTL 이내의 반복 호출은 네이버에 요청하지 않습니다)
     """
-    url = f"https://finance.naver.com/item/sise.naver?code={stock_code}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-
-    try:
-        response = requests.get(url, headers=headers, timeout=5)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+    return get_current_quote_for_trading(stock_code).price
 
-        # 네이버 증권의 현재가 ID 선택자
-        price_strong = soup.select_one("#_nowVal")
-        if not price_strong:
-            raise ValueError(f"'{stock_code}'의 현재가 정보를 찾을 수 없습니다.")
 
-        price_str = price_strong.get_text(strip=True).replace(",", "")
-        return Decimal(price_str)
-
-    except requests.exceptions.RequestException as e:
-        # 이 에러들은 주문 실패로 이어져야 하므로, 다시 raise 합니다.
-        raise ConnectionError(f"네이버 금융 서버 요청 실패: {e}")
-    except (ValueError, InvalidOperation, AttributeError) as e:
-        raise ValueError(f"'{stock_code}'의 현재가 파싱 중 오류 발생: {e}")
+def get_current_quote_for_trading(stock_code: str) -> Quote:
+    """
+    [거래 로직 전용 함수]
+    현재가와 조회 시각(as_of)을 함께 담은 Quote를 반환합니다.
+    캐시 미스가 동시에 발생하면 한 번만 네이버에 요청합니다.
+    """
+    return quote_cache.get_or_fetch(stock_code, fetch_current_stock_price)
 
 
-def parse_change_data(change_element):
+def get_current_prices_for_trading(stock_codes) -> dict:
     """
-    등락률 정보를 담은 HTML 요소를 파싱하여 딕셔너리로 반환하는 헬퍼 함수
-    예: "91.09 +2.49%상승" -> {'change': '91.09', 'change_percent': '+2.49%', 'status': '상승'}
+    [거래 로직 전용 함수]
+    여러 종목의 현재가를 {종목코드: Decimal} 형태로 한 번에 반환합니다.
+    1) 현재가 캐시 -> 2) 전 종목 시세 스냅샷 -> 3) 종목별 개별 조회 순으로 찾으며,
+    끝내 조회에 실패한 종목의 값은 None 입니다.
     """
-    full_text = change_element.get_text(strip=True)
-    status_text = change_element.find("span", class_="blind").get_text(
-        strip=True
-    )  # "상승" 또는 "하락"
+    stock_codes = list(dict.fromkeys(stock_codes))
+    prices = {
+        code: quote.price for code, quote in quote_cache.get_many(stock_codes).items()
+    }
 
-    # "상승" 또는 "하락" 텍스트를 제외한 나머지 부분
-    data_part = full_text.replace(status_text, "").strip()
+    missing = [code for code in stock_codes if code not in prices]
+    for code, row in get_snapshot_rows(missing).items():
+        prices[code] = Decimal(row["price"])
 
-    parts = data_part.split()
-    change_value = parts[0]
-    change_rate = parts[1] if len(parts) > 1 else ""
+    # 캐시와 스냅샷에 모두 없는 종목만 공용 조회 엔진으로 동시에 개별 조회
+    missing = [code for code in stock_codes if code not in prices]
+    if missing:
+        prices.update(fetch_prices(missing, fetch=get_current_stock_price_for_trading))
 
-    return {
-        "change": change_value,
-        "change_percent": change_rate,
-        "status": status_text,
-    }
+    return prices
 
 
-class MarketIndexView(APIView):
+def fetch_current_stock_price(stock_code: str) -> Decimal:
     """
-    네이버 금융에서 KOSPI, KOSDAQ 지수와 차트 정보를 스크래핑하는 API
+    캐시를 거치지 않고 네이버 금융에서 '현재가'만 크롤링하여 Decimal 타입으로 반환합니다.
     """
+    url = f"https://finance.naver.com/item/sise.naver?code={stock_code}"
+    headers = {"User-Agent": "Mozilla/5.0"}
 
-    def get(self, request, *args, **kwargs):
-        url = "https://finance.naver.com/sise/"
-        headers = {"User-Agent": "Mozilla/5.0"}
+    try:
+        response = http_client.get(url, headers=headers, timeout=5)
+        response.raise_for_status()
+        return parse_current_price(response.text)
 
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+    except requests.exceptions.RequestException as e:
+        # 이 에러들은 주문 실패로 이어져야 하므로, 다시 raise 합니다.
+        raise ConnectionError(f"네이버 금융 서버 요청 실패: {e}")
+    except (ValueError, InvalidOperation, AttributeError) as e:
+        raise ValueError(f"'{stock_code}'의 현재가 파싱 중 오류 발생: {e}")
 
-            # --- KOSPI 데이터 추출 ---
-            kospi_now = soup.select_one("#KOSPI_now").get_text(strip=True)
-            kospi_change_element = soup.select_one("#KOSPI_change")
-            kospi_change_data = parse_change_data(kospi_change_element)
-            kospi_chart_url = soup.select_one("#tab_sel1_sise_main_chart img")["src"]
 
-            # --- KOSDAQ 데이터 추출 ---
-            kosdaq_now = soup.select_one("#KOSDAQ_now").get_text(strip=True)
-            kosdaq_change_element = soup.select_one("#KOSDAQ_change")
-            kosdaq_change_data = parse_change_data(kosdaq_change_element)
-            kosdaq_chart_url = soup.select_one("#tab_sel2_sise_main_chart img")["src"]
+class MarketIndexView(APIView):
+    """
+    KOSPI, KOSDAQ 지수와 차트 정보를 반환하는 API
+    Celery beat가 주기적으로 갱신해 두는 캐시(stocks.market_index)를 읽기만 하므로
+    대시보드 탭 수와 관계없이 네이버 요청은 갱신 주기당 한 번입니다.
+    - as_of: 지수를 가져온 시각
+    - stale: 갱신이 STALE_AFTER 넘게 밀린 경우 (상위 서버 장애 시 마지막 값을 반환)
+    """
 
-            # --- 최종 데이터 구조화 ---
-            data = {
-                "kospi": {
-                    "index": kospi_now,
-                    "change": kospi_change_data["change"],
-                    "change_percent": kospi_change_data["change_percent"],
-                    "status": kospi_change_data["status"],
-                    "chart_url": kospi_chart_url,
-                },
-                "kosdaq": {
-                    "index": kosdaq_now,
-                    "change": kosdaq_change_data["change"],
-                    "change_percent": kosdaq_change_data["change_percent"],
-                    "status": kosdaq_change_data["status"],
-                    "chart_url": kosdaq_chart_url,
-                },
-            }
+    def get(self, request, *args, **kwargs):
+        entry = get_cached_market_index()
 
-            # 성공적으로 데이터를 가져오면 JSON 형태로 반환
-            return Response(data, status=status.HTTP_200_OK)
+        # 캐시가 비었거나(최초 실행) 갱신이 밀린 경우에만 요청 경로에서 한 번 갱신
+        if entry is None or is_stale(entry):
+            try:
+                entry = try_refresh_market_index(previous=entry)
+            except requests.exceptions.RequestException as e:
+                if entry is None:
+                    return Response(
+                        {"error": f"네이버 금융 서버 요청 실패: {e}"},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    )
+                logger.warning(f"시장 지수 갱신 실패, 마지막 값을 반환합니다: {e}")
+            except Exception as e:
+                if entry is None:
+                    return Response(
+                        {"error": f"데이터 파싱 중 오류 발생: {e}"},
+                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    )
+                logger.warning(f"시장 지수 갱신 실패, 마지막 값을 반환합니다: {e}")
 
-        except requests.exceptions.RequestException as e:
+        if entry is None:
             return Response(
-                {"error": f"네이버 금융 서버 요청 실패: {e}"},
+                {"error": "시장 지수를 아직 가져오지 못했습니다."},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
-        except Exception as e:
-            return Response(
-                {"error": f"데이터 파싱 중 오류 발생: {e}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+
+        last_modified = int(entry["fetched_at"])
+        response = get_conditional_response(
+            request, etag=entry["etag"], last_modified=last_modified
+        )
+        if response is None:
+            response = Response(
+                {**entry["data"], "as_of": entry["as_of"], "stale": is_stale(entry)},
+                status=status.HTTP_200_OK,
             )
+        interval = market_index_settings()["INTERVAL"]
+        response["ETag"] = entry["etag"]
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = (
+            f"max-age={max(0, int(entry['fetched_at'] + interval - time.time()))}"
+        )
+        return response
 
 
 class StockSearchView(APIView):
     """
     쿼리 파라미터로 받은 검색어로 주식을 검색하는 API.
-    네이버 증권에서 검색된 결과를 기준으로, 우리 DB에 존재하는 종목만 필터링하여 반환합니다.
+    종목 DB로 만든 프로세스 내 검색 색인(stocks.search_index)에서 찾으므로 네이버 요청이 없습니다.
+    종목코드, 종목명 접두어/포함, 초성(예: "ㅅㅅㅈㅈ") 검색을 지원하며 순위대로 반환합니다.
+    price는 "58,100" 형식의 현재가, changeRate는 전일비(원)입니다. (등락률은 프론트엔드에서 계산)
+    시세는 스냅샷과 현재가 캐시에서만 읽어 키 입력마다 네이버에 요청하지 않으며,
+    둘 다 없는 종목은 price/changeRate가 null입니다. (전일비를 모르면 changeRate도 null)
     """
 
+    default_limit = 20
+    max_limit = 50
+
     def get(self, request, *args, **kwargs):
         query = request.query_params.get("query", None)
         if not query:
@@ -148,79 +226,64 @@ class StockSearchView(APIView):
                 {"error": "검색어('query')를 입력해주세요."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
-        search_term = query
-        # 종목 코드로 검색 시, DB에서 종목명을 찾아 검색어로 사용
-        if query.isdigit() and len(query) == 6:
-            try:
-                stock = Stock.objects.get(stock_code=query)
-                search_term = stock.stock_name
-            except Stock.DoesNotExist:
-                pass
-
-        encoded_query = urllib.parse.quote(search_term, encoding="euc-kr")
-        url = f"https://finance.naver.com/search/search.naver?query={encoded_query}"
-        headers = {"User-Agent": "Mozilla/5.0"}
-
         try:
-            # (기존의 네이버 목록 검색 및 DB 필터링 로직)
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            search_table = soup.find(
-                "table", class_="tbl_search", summary="국내종목 검색 결과"
-            )
-            if not search_table:
-                return Response([], status=status.HTTP_200_OK)
-
-            scraped_results = []
-            stock_rows = search_table.find("tbody").find_all("tr")
-            for row in stock_rows:
-                columns = row.find_all("td")
-                if len(columns) < 3:
-                    continue
-                name_tag = columns[0].find("a")
-                if not name_tag:
-                    continue
-                name = name_tag.get_text(strip=True)
-                code = name_tag["href"].split("code=")[1]
-                price = columns[1].get_text(strip=True)
-                change_rate_text = columns[2].get_text(strip=True).replace("%", "")
-                try:
-                    change_rate = float(change_rate_text)
-                except ValueError:
-                    change_rate = 0.0
-                scraped_results.append(
-                    {
-                        "name": name,
-                        "code": code,
-                        "price": price,
-                        "changeRate": change_rate,
-                    }
-                )
+            limit = min(
+                int(request.query_params.get("limit", self.default_limit)),
+                self.max_limit,
+            )
+        except ValueError:
+            limit = self.default_limit
 
-            if not scraped_results:
-                return Response([], status=status.HTTP_200_OK)
+        entries = get_search_index().search(query, limit=limit)
+        snapshot = get_snapshot_rows([entry.code for entry in entries])
+        quotes = quote_cache.get_many(
+            [entry.code for entry in entries if entry.code not in snapshot]
+        )
 
-            scraped_codes = [item["code"] for item in scraped_results]
-            existing_codes_in_db = set(
-                Stock.objects.filter(stock_code__in=scraped_codes).values_list(
-                    "stock_code", flat=True
-                )
+        results = []
+        for entry in entries:
+            row = snapshot.get(entry.code)
+            price, change = None, None
+            if row is not None:
+                price, change = row["price"], row["change"]
+            elif entry.code in quotes:
+                price = quotes[entry.code].price
+            results.append(
+                {
+                    "name": entry.name,
+                    "code": entry.code,
+                    "market_type": entry.market_type,
+                    "price": f"{int(price):,}" if price is not None else None,
+                    "changeRate": change,
+                }
             )
-            final_results = [
-                item for item in scraped_results if item["code"] in existing_codes_in_db
-            ]
+        return Response(results, status=status.HTTP_200_OK)
 
-            return Response(final_results, status=status.HTTP_200_OK)
 
-        except Exception as e:
-            logger.error(f"💥 종목명({query}) 처리 중 예외 발생: {e}")
-            return Response(
-                {"error": f"목록 페이지 처리 중 오류: {e}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+# ----------------------------------------------------------------
+# ✨ [신규] API 2-1: 종목 자동완성 (입력 중 매 키 입력마다 호출)
+# ----------------------------------------------------------------
+class StockAutocompleteView(APIView):
+    """
+    ?q= 로 받은 입력값의 상위 N개 종목을 현재가/등락률과 함께 반환합니다.
+    - 종목은 프로세스 내 검색 색인, 시세는 전 종목 시세 스냅샷에서 읽으므로 외부 요청 없음
+    - 결과는 정규화한 입력값(접두어)별로 캐시 (stocks.autocomplete)
+    응답의 query로 클라이언트가 늦게 도착한 이전 입력의 응답을 버릴 수 있습니다.
+    """
+
+    def get(self, request, *args, **kwargs):
+        options = autocomplete_settings()
+        query = request.query_params.get("q", "")
+        try:
+            limit = int(request.query_params.get("limit", options["LIMIT"]))
+        except ValueError:
+            limit = options["LIMIT"]
+        limit = max(1, min(limit, options["MAX_LIMIT"]))
+
+        return Response(
+            {"query": query, "results": get_suggestions(query, limit)},
+            status=status.HTTP_200_OK,
+        )
 
 
 # ----------------------------------------------------------------
@@ -233,144 +296,31 @@ class StockDetailView(APIView):
     """
     종목 코드를 받아 해당 종목의 핵심 시세 정보, 차트,
     5단계/10단계 호가 정보를 반환합니다.
+    (10단계 호가 페이지 한 번만 요청하고, 5단계 호가는 그중 최우선 5단계로 구성)
     """
 
-    def _parse_order_book(self, soup, ask_type):
-        """
-        [수정됨] 5단계/10단계 HTML 구조를 구분하여
-        호가창 정보를 파싱하는 헬퍼 메서드
-        """
-        asks = []  # 매도
-        bids = []  # 매수
-        total_ask_vol = ""
-        total_bid_vol = ""
-
-        order_book_table = soup.select_one(
-            'table.type2[summary="호가 정보에 관한표입니다."]'
-        )
-
-        if order_book_table:
-            rows = order_book_table.select("tbody > tr")
-
-            if ask_type == 10:
-                # --- 10단계 파서 (한 행에 매도/매수가 모두 있음) ---
-                data_rows = [
-                    r for r in rows if r.select("td.bg01") and r.select("td.bg02")
-                ]
-                for row in reversed(data_rows):  # 매도는 가격 높은 순 -> 낮은 순
-                    ask_cols = row.select("td.bg01")
-                    if len(ask_cols) == 2:
-                        asks.append(
-                            {
-                                "price": ask_cols[1].get_text(strip=True),
-                                "volume": ask_cols[0].get_text(strip=True),
-                            }
-                        )
-
-                for row in data_rows:  # 매수는 가격 높은 순 -> 낮은 순
-                    bid_cols = row.select("td.bg02")
-                    if len(bid_cols) == 2:
-                        bids.append(
-                            {
-                                "price": bid_cols[0].get_text(strip=True),
-                                "volume": bid_cols[1].get_text(strip=True),
-                            }
-                        )
-
-            else:
-                # --- 5단계 파서 (매도/매수 행이 분리됨) ---
-                ask_rows = [
-                    r for r in rows if r.select("td.bg01") and not r.select("td.bg02")
-                ]
-                for row in reversed(ask_rows):
-                    cols = row.select("td.bg01")
-                    if len(cols) == 2:
-                        asks.append(
-                            {
-                                "price": cols[1].get_text(strip=True),
-                                "volume": cols[0].get_text(strip=True),
-                            }
-                        )
-
-                bid_rows = [
-                    r for r in rows if r.select("td.bg02") and not r.select("td.bg01")
-                ]
-                for row in bid_rows:
-                    cols = row.select("td.bg02")
-                    if len(cols) == 2:
-                        bids.append(
-                            {
-                                "price": cols[0].get_text(strip=True),
-                                "volume": cols[1].get_text(strip=True),
-                            }
-                        )
-
-        # --- 잔량합계 파싱 (공통) ---
-        totals_table = soup.select_one(
-            'table.type2[summary="호가 정보에 관한표입니다."] + table.type2'
-        )
-        if totals_table:
-            total_ask_vol_element = totals_table.select_one("td.bor strong")
-            if total_ask_vol_element:
-                total_ask_vol = total_ask_vol_element.get_text(strip=True)
-
-            total_bid_vol_element = totals_table.select_one("th.num strong")
-            if total_bid_vol_element:
-                total_bid_vol = total_bid_vol_element.get_text(strip=True)
-
-        return {
-            "asks": asks,
-            "bids": bids,
-            "total_ask_volume": total_ask_vol,
-            "total_bid_volume": total_bid_vol,
-        }
-
+    @cache_response("stock-detail")
     def get(self, request, stockCode, *args, **kwargs):
         headers = {"User-Agent": "Mozilla/5.0"}
 
         try:
-            # --- 1. [수정] 5단계 호가 요청 (기본 페이지) ---
-            url_5step = (
-                f"https://finance.naver.com/item/sise.naver?code={stockCode}&asktype=5"
+            # --- 1. 10단계 호가 페이지 요청 (헤더/5단계 호가도 이 페이지에서 파싱) ---
+            url = (
+                f"https://finance.naver.com/item/sise.naver?code={stockCode}&asktype=10"
             )
-            response_5step = requests.get(url_5step, headers=headers)
-            response_5step.raise_for_status()
-            soup_5step = BeautifulSoup(response_5step.text, "html.parser")
+            response = http_client.get(url, headers=headers)
+            response.raise_for_status()
+            # 헤더(title, #rate_info_krx)와 호가표가 모두 필요하므로 전체 파싱
+            soup = make_soup(response.text)
 
-            # --- 2. 헤더 정보 파싱 (5단계 페이지에서) ---
-            rate_info = soup_5step.select_one("div#rate_info_krx")
-            if not rate_info:
+            # --- 2. 헤더 정보 파싱 ---
+            header = parse_stock_header(soup)
+            if header is None:
                 return Response(
                     {"error": "페이지 구조가 변경되었거나 잘못된 종목 코드입니다."},
                     status=500,
                 )
 
-            # (헤더 파싱 로직은 동일)
-            all_ems = rate_info.select('em[class*="no_"]')
-            price_em, change_price_em, change_rate_em = (
-                all_ems[0],
-                all_ems[1],
-                all_ems[2],
-            )
-            price = parse_span_numbers(
-                price_em.select('span[class*="no"], span[class*="shim"]')
-            )
-            status_text = (
-                change_price_em.select_one("span.ico").get_text(strip=True)
-                if change_price_em.select_one("span.ico")
-                else "보합"
-            )
-            change = parse_span_numbers(change_price_em.select('span[class*="no"]'))
-            sign = parse_sign(change_rate_em.select_one("span.ico"))
-            change_rate = (
-                sign
-                + parse_span_numbers(
-                    change_rate_em.select('span[class*="no"], span[class*="jum"]')
-                )
-                + "%"
-            )
-            name = soup_5step.title.get_text().split(" : ")[0]
-
             # --- 3. 차트 URL 생성 ---
             base_chart_url = "https://ssl.pstatic.net/imgfinance/chart/item/candle"
             chart_data = {
@@ -379,25 +329,14 @@ class StockDetailView(APIView):
                 "month": f"{base_chart_url}/month/{stockCode}.png",
             }
 
-            # --- 4. 5단계 호가 정보 파싱 ---
-            order_book_5 = self._parse_order_book(soup_5step, ask_type=5)
-
-            # --- 5. [수정] 10단계 호가 정보 파싱 (별도 요청) ---
-            url_10step = (
-                f"https://finance.naver.com/item/sise.naver?code={stockCode}&asktype=10"
-            )
-            response_10step = requests.get(url_10step, headers=headers)
-            soup_10step = BeautifulSoup(response_10step.text, "html.parser")
-            order_book_10 = self._parse_order_book(soup_10step, ask_type=10)
+            # --- 4. 10단계 호가 파싱 후, 최우선 5단계만 골라 5단계 호가 구성 ---
+            order_book_10 = parse_order_book(soup, ask_type=10)
+            order_book_5 = derive_order_book(order_book_10, levels=5)
 
-            # --- 6. 최종 데이터 조합 ---
+            # --- 5. 최종 데이터 조합 ---
             data = {
-                "name": name,
+                **header,
                 "code": stockCode,
-                "price": price,
-                "change": change,
-                "change_rate": change_rate,
-                "status": status_text,
                 "charts": chart_data,
                 "order_book_5": order_book_5,
                 "order_book_10": order_book_10,
@@ -413,207 +352,460 @@ class StockDetailView(APIView):
             )
 
 
-# 헬퍼 함수 (로그 제거)
-def parse_span_numbers(span_elements):
-    number_str = ""
-    for span in span_elements:
-        class_list = span.get("class", [])
-        if not class_list:
-            continue
+# ----------------------------------------------------------------
+# ✨ [신규] API 4: 시간별 시세 조회 (페이지네이션)
+# ----------------------------------------------------------------
+def _sync_ticks_for_request(stock_code, trade_date):
+    """
+    요청 처리 전에 시간별 시세 저장소를 새 체결까지 채웁니다.
+    수집에 실패하면 예외를 반환하고(저장된 데이터로 응답), 성공하면 None
+    """
+    try:
+        sync_ticks(stock_code, trade_date)
+    except Exception as e:
+        logger.warning(f"시간별 시세({stock_code}) 수집 실패: {e}")
+        return e
+    return None
 
-        class_name = class_list[0]
-        if "no" in class_name:
-            digit = class_name.replace("no", "")
-            number_str += digit
-        elif "jum" in class_name:
-            number_str += "."
-        elif "shim" in class_name:
-            number_str += ","
 
-    return number_str
+def _serialize_ticks(request, ticks):
+    """?format=columnar면 컬럼별 숫자 배열, 아니면 기존 문자열 행 리스트"""
+    if is_columnar(request):
+        return ticks_to_columnar(ticks)
+    return [serialize_tick(tick) for tick in ticks]
 
 
-# 헬퍼 함수 (로그 제거)
-def parse_sign(span_element):
-    if span_element is None:
-        return ""
+class StockTimeTicksView(APIView):
+    """
+    종목 코드와 페이지 번호를 받아 '시간별 시세' 데이터를 반환합니다.
+    (시간별 시세 저장소에서 최신 체결부터 10건씩, 새 체결만 네이버에서 수집)
+    """
 
-    class_list = span_element.get("class", [])
+    renderer_classes = CHART_RENDERER_CLASSES
 
-    if "plus" in class_list:
-        return "+"
-    elif "minus" in class_list:
-        return "-"
+    def get(self, request, stockCode, page, *args, **kwargs):
+        if not Stock.objects.filter(stock_code=stockCode).exists():
+            return Response(
+                {"error": "종목을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
-    return ""
+        trade_date = get_trading_date()
+        sync_error = _sync_ticks_for_request(stockCode, trade_date)
 
+        ticks = get_ticks(
+            stockCode,
+            trade_date,
+            limit=TICKS_PAGE_SIZE,
+            offset=(max(page, 1) - 1) * TICKS_PAGE_SIZE,
+        )
+        if not ticks and sync_error is not None:
+            return Response(
+                {"error": f"시간별 시세 처리 중 오류: {sync_error}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
-# ----------------------------------------------------------------
-# ✨ [신규] API 4: 시간별 시세 조회 (페이지네이션)
-# ----------------------------------------------------------------
+        return Response(_serialize_ticks(request, ticks), status=status.HTTP_200_OK)
 
 
-class StockTimeTicksView(APIView):
+class StockTickCursorView(APIView):
     """
-    종목 코드와 페이지 번호를 받아 '시간별 시세' 데이터를 반환합니다.
+    시간별 시세를 체결시각 커서로 조회합니다.
+    GET /api/stocks/ticks/<종목코드>/?before=15:20&limit=30&date=2025-10-17
+    - before: 이 체결시각 이전의 데이터만 (응답의 next_cursor를 그대로 전달)
+    - limit: 최대 200 (기본 30)
+    - date: 거래일 (기본: 최근 거래일, 최근 거래일일 때만 새 체결을 수집)
     """
 
-    def get(self, request, stockCode, page, *args, **kwargs):
+    renderer_classes = CHART_RENDERER_CLASSES
 
-        # ✨ [개선 1] thistime을 동적으로 생성합니다.
-        # 오늘 날짜를 가져옵니다.
-        now = datetime.now()
-        # 만약 오늘이 토요일(5)이나 일요일(6)이라면, 가장 최근의 금요일로 날짜를 맞춥니다.
-        if now.weekday() == 5:  # 토요일
-            now -= timedelta(days=1)
-        elif now.weekday() == 6:  # 일요일
-            now -= timedelta(days=2)
+    default_limit = 30
+    max_limit = 200
 
-        # YYYYMMDD180000 형식으로 포맷팅 (장 마감 이후 시간으로 넉넉하게 설정)
-        thistime_str = now.strftime("%Y%m%d") + "180000"
+    def get(self, request, stockCode, *args, **kwargs):
+        if not Stock.objects.filter(stock_code=stockCode).exists():
+            return Response(
+                {"error": "종목을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
-        url = f"https://finance.naver.com/item/sise_time.naver?code={stockCode}&page={page}&thistime={thistime_str}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
-            "Referer": f"https://finance.naver.com/item/sise.naver?code={stockCode}",
-        }
+        try:
+            trade_date = (
+                date.fromisoformat(request.query_params["date"])
+                if request.query_params.get("date")
+                else get_trading_date()
+            )
+            before = (
+                dt_time.fromisoformat(request.query_params["before"])
+                if request.query_params.get("before")
+                else None
+            )
+            limit = min(
+                int(request.query_params.get("limit", self.default_limit)),
+                self.max_limit,
+            )
+            if limit < 1:
+                raise ValueError("limit은 1 이상이어야 합니다.")
+        except ValueError as e:
+            return Response(
+                {"error": f"잘못된 요청 파라미터: {e}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
+        sync_error = None
+        if trade_date == get_trading_date():
+            sync_error = _sync_ticks_for_request(stockCode, trade_date)
+
+        ticks = get_ticks(stockCode, trade_date, before=before, limit=limit)
+        if not ticks and before is None and sync_error is not None:
+            return Response(
+                {"error": f"시간별 시세 처리 중 오류: {sync_error}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return Response(
+            {
+                "date": trade_date.isoformat(),
+                "results": _serialize_ticks(request, ticks),
+                # 마지막 페이지가 아니면 다음 요청의 before 값
+                "next_cursor": (
+                    ticks[-1].tick_time.isoformat() if len(ticks) == limit else None
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class StockTickRangeView(APIView):
+    """
+    하루치 시간별 시세를 한 번에 조회합니다. (최신 체결부터)
+    GET /api/stocks/ticks/<종목코드>/range/?from=09:00&to=15:30&date=2025-10-17
+    GET /api/stocks/ticks/<종목코드>/range/?pages=1-20
+    - from/to: 체결시각 범위 (둘 다 포함, 생략 시 전체)
+    - pages: 기존 페이지 API(10건 단위)의 페이지 범위
+    새 체결은 저장소가 한 번에 수집하며 (처음에는 여러 페이지를 동시에), 응답은 저장소에서 만듭니다.
+    """
+
+    renderer_classes = CHART_RENDERER_CLASSES
+
+    def get(self, request, stockCode, *args, **kwargs):
+        if not Stock.objects.filter(stock_code=stockCode).exists():
+            return Response(
+                {"error": "종목을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        params = request.query_params
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            ticks_data = []
-            tick_rows = soup.select("table.type2 > tr[onmouseover]")
-            print(
-                f"Page {page} for {stockCode} ({thistime_str}): Found {len(tick_rows)} rows"
-            )
-
-            for row in tick_rows:
-                cols = row.select("td")
-                if len(cols) != 7:
-                    continue
-
-                try:
-                    # ✨ [개선 2] 더 안정적인 파싱 로직으로 복귀
-                    # ✨ [핵심 수정] 변수 'time'을 'tick_time'으로 변경하여 충돌 방지
-                    tick_time = cols[0].get_text(strip=True)
-                    price = cols[1].get_text(strip=True)
-
-                    change_status_span = cols[2].select_one("em span.blind")
-                    change_status = (
-                        change_status_span.get_text(strip=True)
-                        if change_status_span
-                        else ""
-                    )
-                    change = (
-                        cols[2].get_text(strip=True).replace(change_status, "").strip()
-                    )
+            trade_date = (
+                date.fromisoformat(params["date"])
+                if params.get("date")
+                else get_trading_date()
+            )
+            since = (
+                dt_time.fromisoformat(params["from"]) if params.get("from") else None
+            )
+            until = dt_time.fromisoformat(params["to"]) if params.get("to") else None
+            pages = parse_page_range(params["pages"]) if params.get("pages") else None
+        except ValueError as e:
+            return Response(
+                {"error": f"잘못된 요청 파라미터: {e}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-                    sell_price = cols[3].get_text(strip=True)
-                    buy_price = cols[4].get_text(strip=True)
-                    volume = cols[5].get_text(strip=True)
-                    volume_change = cols[6].get_text(strip=True)
-
-                    if not tick_time or not price:
-                        # 이 로그는 이제 페이지 하단의 진짜 빈 줄에만 나타날 것입니다.
-                        print(f"Skipping empty row: {row.get_text(strip=True)}")
-                        continue
-
-                    ticks_data.append(
-                        {
-                            "time": tick_time,
-                            "price": price,
-                            "change": change,
-                            "change_status": change_status,
-                            "sell_price": sell_price,
-                            "buy_price": buy_price,
-                            "volume": volume,
-                            "volume_change": volume_change,
-                        }
-                    )
-                except Exception as ex:
-                    print(
-                        f"Skipping row due to parsing error: {ex} in row: {row.get_text(strip=True)}"
-                    )
-                    continue
+        sync_error = None
+        if trade_date == get_trading_date():
+            sync_error = _sync_ticks_for_request(stockCode, trade_date)
+
+        if pages is not None:
+            ticks = get_ticks(
+                stockCode,
+                trade_date,
+                since=since,
+                until=until,
+                limit=len(pages) * TICKS_PAGE_SIZE,
+                offset=(pages[0] - 1) * TICKS_PAGE_SIZE,
+            )
+        else:
+            ticks = get_ticks(
+                stockCode, trade_date, since=since, until=until, limit=None
+            )
+        if not ticks and sync_error is not None:
+            return Response(
+                {"error": f"시간별 시세 처리 중 오류: {sync_error}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
-            # ✨ [핵심 수정] time 모듈을 직접 호출
-            time.sleep(
-                0.5
-            )  # 과도한 요청을 막기 위해 약간의 딜레이를 줍니다 (1초는 너무 길 수 있습니다).
+        return Response(
+            {
+                "date": trade_date.isoformat(),
+                "count": len(ticks),
+                "results": _serialize_ticks(request, ticks),
+            },
+            status=status.HTTP_200_OK,
+        )
 
-            if not ticks_data:
-                print(f"No valid data found on page {page}")
 
-            return Response(ticks_data, status=status.HTTP_200_OK)
+class StockIntradayBarView(APIView):
+    """
+    시간별 시세를 분봉(OHLCV)으로 묶어 반환합니다. (시각 오름차순)
+    GET /api/stocks/bars/<종목코드>/?interval=5m&date=2025-10-17
+    - interval: 1m, 5m, 15m (기본 1m)
+    - date: 거래일 (기본: 최근 거래일, 최근 거래일일 때만 새 체결을 수집)
+    """
 
-        except Exception as e:
-            print(f"💥 시간별 시세({stockCode}, page={page}) 처리 중 예외 발생: {e}")
+    renderer_classes = CHART_RENDERER_CLASSES
+
+    def get(self, request, stockCode, *args, **kwargs):
+        if not Stock.objects.filter(stock_code=stockCode).exists():
+            return Response(
+                {"error": "종목을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        interval = request.query_params.get("interval", "1m")
+        try:
+            if interval not in BAR_INTERVALS:
+                raise ValueError(
+                    f"interval은 {', '.join(BAR_INTERVALS)} 중 하나입니다."
+                )
+            trade_date = (
+                date.fromisoformat(request.query_params["date"])
+                if request.query_params.get("date")
+                else get_trading_date()
+            )
+        except ValueError as e:
+            return Response(
+                {"error": f"잘못된 요청 파라미터: {e}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        sync_error = None
+        if trade_date == get_trading_date():
+            sync_error = _sync_ticks_for_request(stockCode, trade_date)
+
+        bars = get_intraday_bars(stockCode, trade_date, interval)
+        if not bars and sync_error is not None:
             return Response(
-                {"error": f"시간별 시세 처리 중 오류: {e}"},
+                {"error": f"시간별 시세 처리 중 오류: {sync_error}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+        return Response(
+            {
+                "date": trade_date.isoformat(),
+                "interval": interval,
+                "results": (
+                    intraday_bars_to_columnar(bars) if is_columnar(request) else bars
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
 # ----------------------------------------------------------------
 # ✨ [신규] API 5: 일별 시세 조회 (페이지네이션)
 # ----------------------------------------------------------------
+def _sync_daily_for_request(stock_code):
+    """
+    요청 처리 전에 일별 시세 저장소를 최근 일자까지 채웁니다.
+    수집에 실패하면 예외를 반환하고(저장된 데이터로 응답), 성공하면 None
+    """
+    try:
+        sync_daily_bars(stock_code)
+    except Exception as e:
+        logger.warning(f"일별 시세({stock_code}) 수집 실패: {e}")
+        return e
+    return None
+
+
 class StockDailyPriceView(APIView):
     """
     종목 코드와 페이지 번호를 받아 '일별 시세' 데이터를 반환합니다.
+    (일별 시세 저장소에서 최근 일자부터 10건씩, 새 일자와 모자란 과거 페이지만 네이버에서 수집)
     """
 
+    renderer_classes = CHART_RENDERER_CLASSES
+
     def get(self, request, stockCode, page, *args, **kwargs):
-        url = f"https://finance.naver.com/item/sise_day.naver?code={stockCode}&page={page}"
-        headers = {"User-Agent": "Mozilla.5.0"}
+        if not Stock.objects.filter(stock_code=stockCode).exists():
+            return Response(
+                {"error": "종목을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
+        page = max(page, 1)
+        error = _sync_daily_for_request(stockCode)
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            daily_data = []
-            daily_rows = soup.select("table.type2 > tr[onmouseover]")
-
-            for row in daily_rows:
-                cols = row.select("td")
-                if len(cols) != 7:
-                    continue
-
-                # --- ✨ [핵심 수정] ---
-                # cols[2] ('전일비' td) 안에서 'em span.blind'를 직접 찾습니다.
-                change_status_span = cols[2].select_one("em span.blind")
-                change_status = (
-                    change_status_span.get_text(strip=True)
-                    if change_status_span
-                    else ""
-                )
-                # ---------------------
-
-                # 종가(close)와 전일비(change) 값은 그대로 가져옵니다.
-                close_price = cols[1].get_text(strip=True)
-                change_value = (
-                    cols[2].get_text(strip=True).replace(change_status, "").strip()
-                )  # 상태 텍스트 제거
-
-                daily_data.append(
-                    {
-                        "date": cols[0].get_text(strip=True),
-                        "close": close_price,
-                        "change": change_value,
-                        "change_status": change_status,  # <-- 이제 "상승" 또는 "하락"이 들어갑니다.
-                        "open": cols[3].get_text(strip=True),
-                        "high": cols[4].get_text(strip=True),
-                        "low": cols[5].get_text(strip=True),
-                        "volume": cols[6].get_text(strip=True),
-                    }
-                )
+            backfill_daily_bars(stockCode, page)
+        except Exception as e:
+            logger.warning(f"일별 시세({stockCode}) 과거 데이터 수집 실패: {e}")
+            error = e
+
+        bars = get_daily_bars(
+            stockCode, limit=DAILY_PAGE_SIZE, offset=(page - 1) * DAILY_PAGE_SIZE
+        )
+        if not bars and error is not None:
+            return Response(
+                {"error": f"일별 시세 처리 중 오류: {error}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        if is_columnar(request):
+            return Response(daily_bars_to_columnar(bars), status=status.HTTP_200_OK)
+        return Response(
+            [serialize_daily_bar(bar) for bar in bars], status=status.HTTP_200_OK
+        )
+
+
+class StockDailyRangeView(APIView):
+    """
+    여러 페이지(또는 기간)의 일별 시세를 한 번에 조회합니다. (최근 일자부터)
+    GET /api/stocks/daily/<종목코드>/range/?from=2025-01-02&to=2025-10-17
+    GET /api/stocks/daily/<종목코드>/range/?pages=1-20
+    저장소에 없는 과거 페이지만 요청 제한 안에서 동시에 가져오고, 응답은 저장소의 기간 조회로 만듭니다.
+    """
+
+    renderer_classes = CHART_RENDERER_CLASSES
+
+    def get(self, request, stockCode, *args, **kwargs):
+        if not Stock.objects.filter(stock_code=stockCode).exists():
+            return Response(
+                {"error": "종목을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
-            return Response(daily_data, status=status.HTTP_200_OK)
+        params = request.query_params
+        try:
+            start = date.fromisoformat(params["from"]) if params.get("from") else None
+            end = date.fromisoformat(params["to"]) if params.get("to") else None
+            if params.get("pages"):
+                pages = parse_page_range(params["pages"])
+            elif start is not None:
+                if end is not None and end < start:
+                    raise ValueError("to는 from 이후 날짜여야 합니다.")
+                pages = daily_pages_for(start)
+            else:
+                raise ValueError("pages 또는 from 파라미터가 필요합니다.")
+            if not pages:
+                raise ValueError("조회할 페이지가 없습니다.")
+        except ValueError as e:
+            return Response(
+                {"error": f"잘못된 요청 파라미터: {e}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
+        _sync_daily_for_request(stockCode)
+        try:
+            backfill_daily_bars(stockCode, pages[-1])
         except Exception as e:
+            # 페이지 조회 실패뿐 아니라 파싱/저장 오류도 다른 일별 시세 API처럼 처리
+            logger.warning(f"일별 시세({stockCode}) 과거 데이터 수집 실패: {e}")
             return Response(
                 {"error": f"일별 시세 처리 중 오류: {e}"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        if params.get("pages"):
+            bars = get_daily_bars(
+                stockCode,
+                start=start,
+                end=end,
+                limit=len(pages) * DAILY_PAGE_SIZE,
+                offset=(pages[0] - 1) * DAILY_PAGE_SIZE,
+            )
+        else:
+            bars = get_daily_bars(stockCode, start=start, end=end)
+
+        return Response(
+            {
+                "count": len(bars),
+                "results": (
+                    daily_bars_to_columnar(bars)
+                    if is_columnar(request)
+                    else [serialize_daily_bar(bar) for bar in bars]
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+# ----------------------------------------------------------------
+# ✨ [신규] API 6: 기술적 지표 (이동평균, EMA, RSI, MACD, 볼린저 밴드)
+# ----------------------------------------------------------------
+class StockIndicatorView(APIView):
+    """
+    일별 시세 저장소의 종가로 기술적 지표를 계산하여 반환합니다. (오래된 일자부터)
+    GET /api/stocks/indicators/<종목코드>/?indicators=sma:20,rsi:14,macd:12:26:9&days=120
+    - indicators: 지표:파라미터 목록 (sma:기간, ema:기간, rsi:기간,
+      macd:단기:장기:시그널, bollinger:기간:배수), 생략 시 기본 지표
+    - days: 반환할 거래일 수 (기본 120, 최대 400)
+    """
+
+    default_days = 120
+    max_days = 400
+
+    def get(self, request, stockCode, *args, **kwargs):
+        if not Stock.objects.filter(stock_code=stockCode).exists():
+            return Response(
+                {"error": "종목을 찾을 수 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        params = request.query_params
+        try:
+            raw_specs = (
+                [spec for spec in params["indicators"].split(",") if spec.strip()]
+                if params.get("indicators")
+                else DEFAULT_SPECS
+            )
+            specs = list(dict.fromkeys(parse_spec(spec) for spec in raw_specs))
+            days = int(params.get("days", self.default_days))
+            if not 1 <= days <= self.max_days:
+                raise ValueError(f"days는 1~{self.max_days} 사이여야 합니다.")
+        except ValueError as e:
+            return Response(
+                {"error": f"잘못된 요청 파라미터: {e}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # 앞쪽 지표 값이 안정되도록 출력 구간보다 긴 기간으로 계산
+        needed = days + warmup_length(specs)
+        error = _sync_daily_for_request(stockCode)
+        try:
+            backfill_daily_bars(
+                stockCode, min(-(-needed // DAILY_PAGE_SIZE), MAX_RANGE_PAGES)
+            )
+        except Exception as e:
+            logger.warning(f"일별 시세({stockCode}) 과거 데이터 수집 실패: {e}")
+            error = e
+
+        bars = get_daily_bars(stockCode, limit=needed)[::-1]
+        if not bars and error is None:
+            return Response(
+                {"error": "일별 시세가 없습니다."},
+                status=status.HTTP_404_NOT_FOUND,
             )
+        if not bars:
+            return Response(
+                {"error": f"일별 시세 처리 중 오류: {error}"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        results = get_indicators(stockCode, bars, specs)
+        return Response(
+            {
+                "dates": [bar.date.isoformat() for bar in bars[-days:]],
+                "close": [bar.close for bar in bars[-days:]],
+                "indicators": {
+                    spec_key(name, spec_params): {
+                        series: values[-days:]
+                        for series, values in results[
+                            spec_key(name, spec_params)
+                        ].items()
+                    }
+                    for name, spec_params in specs
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TradingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "trading"
+
+    def ready(self):
+        # 주문 저장/삭제 시그널로 지정가 주문 장부 변경을 기록
+        from . import order_book  # noqa: F401
@@ -0,0 +1,229 @@
+# backend/trading/execution.py
+
+import logging
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from users.models import User
+
+from .models import Order, Portfolio, Transaction
+from .order_book import record_orders_closed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXECUTION_SETTINGS = {
+    "BATCH_SIZE": 500,  # bulk_create/bulk_update 한 쿼리당 행 수
+}
+
+# 평균 매수 단가 자릿수 (Portfolio.average_purchase_price의 decimal_places=2)
+CENT = Decimal("0.01")
+
+
+def execution_settings():
+    return {**DEFAULT_EXECUTION_SETTINGS, **getattr(settings, "EXECUTION", {})}
+
+
+@dataclass(frozen=True)
+class Fill:
+    """체결할 주문 하나와 체결 가격"""
+
+    order: Order
+    price: Decimal
+
+
+@dataclass
+class Settlement:
+    """settle_fills 결과"""
+
+    executed: list = field(default_factory=list)  # 체결(COMPLETED)된 주문
+    failed: dict = field(default_factory=dict)  # {주문 ID: 실패 사유} (FAILED)
+    skipped: list = field(default_factory=list)  # PENDING이 아니라 건너뛴 주문 ID
+    elapsed: float = 0.0  # 정산에 걸린 시간 (초)
+
+    @property
+    def fills_per_second(self):
+        return len(self.executed) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _apply(fill, user, portfolio):
+    """
+    체결 하나를 메모리의 사용자 잔고/포트폴리오에 반영합니다.
+    체결할 수 없으면 아무것도 바꾸지 않고 실패 사유를 반환합니다.
+    """
+    order = fill.order
+    total_cost = fill.price * order.quantity
+
+    if order.order_type == Order.OrderType.BUY:
+        if user.cash_balance < total_cost:
+            return "체결 시점 예수금 부족."
+        user.cash_balance -= total_cost
+        total_quantity_new = portfolio.total_quantity + order.quantity
+        # 평단가 재계산
+        portfolio.average_purchase_price = (
+            (portfolio.average_purchase_price * portfolio.total_quantity + total_cost)
+            / total_quantity_new
+        ).quantize(CENT)
+        portfolio.total_quantity = total_quantity_new
+    else:
+        if portfolio.pk is None and portfolio.total_quantity == 0:
+            return "체결 시점 포트폴리오 없음."
+        if portfolio.total_quantity < order.quantity:
+            return "체결 시점 보유 수량 부족."
+        user.cash_balance += total_cost
+        portfolio.total_quantity -= order.quantity
+    return None
+
+
+def _existing_pairs(pair_filter):
+    """이미 있는 포트폴리오의 (사용자 ID, 종목코드) 집합 (잠그지 않음)"""
+    return set(Portfolio.objects.filter(pair_filter).values_list("user_id", "stock_id"))
+
+
+def settle_fills(fills):
+    """
+    체결 묶음을 하나의 DB 트랜잭션으로 정산합니다. (Settlement)
+    - 사용자 -> 주문 -> 포트폴리오 순서로, 각각 ID 순으로 행 잠금 (교착 상태 방지)
+    - 매수로 새로 생길 포트폴리오는 먼저 빈 행으로 넣고(충돌 시 무시) 함께 잠금
+      (아직 없는 행은 잠글 수 없어 동시 매수가 같은 행을 넣으면 IntegrityError로
+      묶음 전체가 롤백되므로)
+    - 주문 ID 순으로 메모리에서 잔고/보유 수량을 반영하고, 예수금/보유 수량이 부족한
+      체결은 그 주문만 FAILED로 처리 (같은 사용자의 나머지 체결은 계속 진행)
+    - 거래 내역은 bulk_create, 주문/포트폴리오/예수금은 bulk_update로 한 번에 씀
+      (보유 수량이 0이 된 포트폴리오는 한 번에 삭제)
+    쿼리 수는 체결 건수와 무관하게 일정하며(BATCH_SIZE 단위), DB 오류가 나면
+    묶음 전체가 롤백되어 주문은 PENDING으로 남습니다.
+    """
+    started_at = time.perf_counter()
+    result = Settlement()
+    if not fills:
+        return result
+
+    batch_size = execution_settings()["BATCH_SIZE"]
+    fills = sorted(fills, key=lambda fill: fill.order.id)
+
+    with transaction.atomic():
+        # --- 1. 행 잠금 (ID 순) ---
+        users = {
+            user.id: user
+            for user in User.objects.select_for_update()
+            .filter(id__in={fill.order.user_id for fill in fills})
+            .only("id", "cash_balance")
+            .order_by("id")
+        }
+        pending_ids = set(
+            Order.objects.select_for_update()
+            .filter(
+                id__in=[fill.order.id for fill in fills],
+                status=Order.StatusType.PENDING,
+            )
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        pairs = sorted({(fill.order.user_id, fill.order.stock_id) for fill in fills})
+        pair_filter = reduce(
+            or_, (Q(user_id=user, stock_id=stock) for user, stock in pairs)
+        )
+        buy_pairs = {
+            (fill.order.user_id, fill.order.stock_id)
+            for fill in fills
+            if fill.order.order_type == Order.OrderType.BUY
+        }
+        inserted = buy_pairs - _existing_pairs(pair_filter)
+        if inserted:
+            Portfolio.objects.bulk_create(
+                [Portfolio(user_id=user, stock_id=stock) for user, stock in inserted],
+                batch_size=batch_size,
+                ignore_conflicts=True,
+            )
+        portfolios = {
+            (portfolio.user_id, portfolio.stock_id): portfolio
+            for portfolio in Portfolio.objects.select_for_update()
+            .filter(pair_filter)
+            .order_by("id")
+        }
+
+        # --- 2. 메모리에서 체결 반영 ---
+        transactions, closed, touched_users, touched_keys = [], [], {}, set()
+        for fill in fills:
+            order = fill.order
+            if order.id not in pending_ids:
+                # 다른 작업자가 먼저 체결했거나 사용자가 취소한 주문
+                result.skipped.append(order.id)
+                continue
+
+            key = (order.user_id, order.stock_id)
+            user = users[order.user_id]
+            portfolio = portfolios.setdefault(
+                key, Portfolio(user_id=order.user_id, stock_id=order.stock_id)
+            )
+            reason = _apply(fill, user, portfolio)
+            if reason is not None:
+                logger.warning(f"주문 ID {order.id} 체결 실패: {reason}")
+                order.status = Order.StatusType.FAILED
+                result.failed[order.id] = reason
+            else:
+                order.status = Order.StatusType.COMPLETED
+                result.executed.append(order)
+                touched_users[user.id] = user
+                touched_keys.add(key)
+                transactions.append(
+                    Transaction(
+                        user_id=order.user_id,
+                        stock_id=order.stock_id,
+                        order=order,
+                        transaction_type=order.order_type,
+                        quantity=order.quantity,
+                        executed_price=fill.price,
+                    )
+                )
+            closed.append(order)
+
+        # --- 3. 한 번에 쓰기 ---
+        # (미리 넣은 빈 포트폴리오 중 체결이 실패해 수량이 0인 행은 삭제)
+        created, updated, emptied = [], [], []
+        for key in touched_keys | (inserted & portfolios.keys()):
+            portfolio = portfolios[key]
+            if portfolio.total_quantity == 0:
+                if portfolio.pk is not None:
+                    emptied.append(portfolio.pk)
+            elif portfolio.pk is None:
+                created.append(portfolio)
+            else:
+                updated.append(portfolio)
+
+        Transaction.objects.bulk_create(transactions, batch_size=batch_size)
+        if created:
+            Portfolio.objects.bulk_create(created, batch_size=batch_size)
+        if updated:
+            Portfolio.objects.bulk_update(
+                updated,
+                ["total_quantity", "average_purchase_price"],
+                batch_size=batch_size,
+            )
+        if emptied:
+            Portfolio.objects.filter(id__in=emptied).delete()
+        if touched_users:
+            User.objects.bulk_update(
+                list(touched_users.values()), ["cash_balance"], batch_size=batch_size
+            )
+        if closed:
+            Order.objects.bulk_update(closed, ["status"], batch_size=batch_size)
+
+    # bulk_update는 post_save 신호를 보내지 않으므로 지정가 주문 장부에 직접 기록
+    record_orders_closed(
+        [order.id for order in closed if order.price_type == Order.PriceType.LIMIT]
+    )
+
+    result.elapsed = time.perf_counter() - started_at
+    logger.info(
+        f"체결 정산: 체결 {len(result.executed)}건, 실패 {len(result.failed)}건, "
+        f"{result.elapsed:.3f}s (초당 {result.fills_per_second:.1f}건)"
+    )
+    return result
@@ -0,0 +1,235 @@
+# backend/trading/order_book.py
+
+import bisect
+import logging
+import math
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Order
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ORDER_BOOK_SETTINGS = {
+    "JOURNAL_TTL": 60
+    * 60,  # 주문 변경 기록 보관 시간 (초) - 지나면 다음 동기화에서 DB로 재구성
+    "CACHE_ALIAS": "default",
+}
+
+JOURNAL_SEQ_KEY = "trading:order-book-seq"
+JOURNAL_KEY_PREFIX = "trading:order-book-journal:"
+
+
+def order_book_settings():
+    return {**DEFAULT_ORDER_BOOK_SETTINGS, **getattr(settings, "ORDER_BOOK", {})}
+
+
+def _shared():
+    return caches[order_book_settings()["CACHE_ALIAS"]]
+
+
+class OrderBook:
+    """
+    한 종목의 미체결 지정가 주문 장부.
+    - 매수(bids): 지정가 내림차순, 매도(asks): 지정가 오름차순 (같은 가격은 주문 ID 순)
+    - match(현재가)는 이진 탐색으로 체결 조건을 만족하는 앞부분만 잘라 O(log n + k)
+    """
+
+    def __init__(self):
+        self._bids = []  # (-지정가, 주문 ID)
+        self._asks = []  # (지정가, 주문 ID)
+        self._entries = {}  # 주문 ID -> (장부, 키)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, order_id, order_type, limit_price):
+        self.remove(order_id)
+        if order_type == Order.OrderType.BUY:
+            side, key = self._bids, (-limit_price, order_id)
+        else:
+            side, key = self._asks, (limit_price, order_id)
+        bisect.insort(side, key)
+        self._entries[order_id] = (side, key)
+
+    def remove(self, order_id):
+        entry = self._entries.pop(order_id, None)
+        if entry is None:
+            return False
+        side, key = entry
+        del side[bisect.bisect_left(side, key)]
+        return True
+
+    def match(self, price):
+        """
+        현재가에 체결되는 주문 ID 목록 (장부에서 빼지는 않음)
+        매수: 현재가 <= 지정가 (높은 지정가부터), 매도: 현재가 >= 지정가 (낮은 지정가부터)
+        """
+        bids = self._bids[: bisect.bisect_right(self._bids, (-price, math.inf))]
+        asks = self._asks[: bisect.bisect_right(self._asks, (price, math.inf))]
+        return [order_id for _, order_id in bids] + [order_id for _, order_id in asks]
+
+
+class OrderBookRegistry:
+    """
+    종목별 OrderBook 묶음 (프로세스 내).
+    처음 사용할 때 DB의 미체결 지정가 주문으로 만들고, 이후에는 공유 캐시의
+    주문 변경 기록(journal)을 순서대로 반영합니다. 기록이 빠져 있으면 DB로 다시 만듭니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._books = {}
+        self._stock_of = {}  # 주문 ID -> 종목코드
+        self._seq = None  # 반영한 마지막 변경 기록 번호 (None: 아직 만들지 않음)
+
+    def stock_codes(self):
+        with self._lock:
+            return {code for code, book in self._books.items() if len(book)}
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(book) for book in self._books.values())
+
+    def add(self, order_id, stock_code, order_type, limit_price):
+        with self._lock:
+            self.remove(order_id)
+            book = self._books.setdefault(stock_code, OrderBook())
+            book.add(order_id, order_type, limit_price)
+            self._stock_of[order_id] = stock_code
+
+    def remove(self, order_id):
+        with self._lock:
+            stock_code = self._stock_of.pop(order_id, None)
+            if stock_code is None:
+                return False
+            return self._books[stock_code].remove(order_id)
+
+    def match(self, stock_code, price):
+        with self._lock:
+            book = self._books.get(stock_code)
+            return book.match(price) if book is not None else []
+
+    def rebuild(self):
+        """DB의 미체결 지정가 주문으로 장부를 다시 만듭니다."""
+        with self._lock:
+            seq = _current_seq()
+            self._books, self._stock_of = {}, {}
+            for order_id, stock_code, order_type, limit_price in Order.objects.filter(
+                status=Order.StatusType.PENDING, price_type=Order.PriceType.LIMIT
+            ).values_list("id", "stock_id", "order_type", "limit_price"):
+                self.add(order_id, stock_code, order_type, limit_price)
+            self._seq = seq
+            logger.info(f"지정가 주문 장부 재구성: {len(self)}건")
+
+    def sync(self):
+        """
+        마지막으로 반영한 뒤의 주문 변경 기록을 반영합니다.
+        기록 번호가 없거나(캐시 초기화) 중간 기록이 만료되었으면 DB로 다시 만듭니다.
+        """
+        with self._lock:
+            seq = _current_seq()
+            if self._seq is None or seq is None or seq < self._seq:
+                return self.rebuild()
+            if seq == self._seq:
+                return
+
+            keys = [f"{JOURNAL_KEY_PREFIX}{n}" for n in range(self._seq + 1, seq + 1)]
+            try:
+                entries = _shared().get_many(keys)
+            except Exception as e:
+                logger.warning(f"주문 변경 기록 조회 실패: {e}")
+                entries = {}
+            if len(entries) != len(keys):
+                return self.rebuild()
+
+            for key in keys:
+                entry = entries[key]
+                if entry["op"] == "add":
+                    self.add(entry["id"], entry["stock"], entry["type"], entry["price"])
+                else:
+                    self.remove(entry["id"])
+            self._seq = seq
+
+    def reset(self):
+        with self._lock:
+            self._books, self._stock_of = {}, {}
+            self._seq = None
+
+
+def _current_seq():
+    try:
+        return _shared().get(JOURNAL_SEQ_KEY)
+    except Exception as e:
+        logger.warning(f"주문 변경 기록 번호 조회 실패: {e}")
+        return None
+
+
+def record_order_change(order_id, entry):
+    """
+    주문 변경을 공유 캐시의 기록에 추가합니다. 모든 프로세스의 장부가 다음 sync()에서 반영합니다.
+    - 기록에 실패하면 번호를 비워 다음 sync()가 DB로 다시 만들도록 함
+    - 저장 직후 기록하므로 롤백된 주문이 장부에 남을 수 있으나, 체결 전에 DB 상태를 다시 확인함
+    """
+    shared = _shared()
+    try:
+        shared.add(JOURNAL_SEQ_KEY, 0, timeout=None)
+        seq = shared.incr(JOURNAL_SEQ_KEY)
+        shared.set(
+            f"{JOURNAL_KEY_PREFIX}{seq}",
+            {"id": order_id, **entry},
+            timeout=order_book_settings()["JOURNAL_TTL"],
+        )
+    except Exception as e:
+        logger.warning(
+            f"주문 {order_id} 변경 기록 실패, 장부를 다시 만들도록 합니다: {e}"
+        )
+        try:
+            shared.delete(JOURNAL_SEQ_KEY)
+        except Exception:
+            pass
+
+
+def record_orders_closed(order_ids):
+    """체결/실패로 닫힌 지정가 주문들을 장부에서 제거하도록 기록 (bulk_update는 신호가 없음)"""
+    for order_id in order_ids:
+        record_order_change(order_id, {"op": "remove"})
+
+
+@receiver(post_save, sender=Order)
+def _order_saved(sender, instance, **kwargs):
+    """지정가 주문이 접수되면 장부에 추가, 상태가 바뀌면(체결/실패/취소) 장부에서 제거"""
+    if instance.price_type != Order.PriceType.LIMIT:
+        return
+    if instance.status == Order.StatusType.PENDING:
+        record_order_change(
+            instance.id,
+            {
+                "op": "add",
+                "stock": instance.stock_id,
+                "type": instance.order_type,
+                "price": instance.limit_price,
+            },
+        )
+    else:
+        record_order_change(instance.id, {"op": "remove"})
+
+
+@receiver(post_delete, sender=Order)
+def _order_deleted(sender, instance, **kwargs):
+    if instance.price_type == Order.PriceType.LIMIT:
+        record_order_change(instance.id, {"op": "remove"})
+
+
+# 프로세스 전역 장부 (Celery 워커에서는 지정가 주문 Task가 사용)
+order_book = OrderBookRegistry()
+
+
+def get_order_book():
+    """주문 변경 기록까지 반영한 프로세스 전역 장부"""
+    order_book.sync()
+    return order_book
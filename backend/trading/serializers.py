@@ -1,19 +1,22 @@
 # backend/trading/serializers.py
 
+import logging
 from datetime import datetime
 from decimal import ROUND_HALF_UP, Decimal  # [추가] 반올림 설정
 
-from django.db import transaction
+from django.db import DatabaseError
 from rest_framework import serializers
 
 from stocks.models import Stock
 
+from .execution import Fill, settle_fills
+from .models import Order, Portfolio
+
+logger = logging.getLogger(__name__)
+
 # [삭제] View에서 직접 임포트하므로 Serializer에서는 불필요
 # from stocks.views import get_current_stock_price_for_trading
-from users.models import User
 
-# [수정] Transaction 모델도 임포트
-from .models import Order, Portfolio, Transaction
 
 # --- 출력용 Serializers ---
 
@@ -212,68 +215,32 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             user=user, status=Order.StatusType.PENDING, **validated_data
         )
         if price_type == Order.PriceType.MARKET:
-            stock = validated_data["stock"]
-            quantity = validated_data["quantity"]
-            order_type = validated_data["order_type"]
+            # 여기서는 stocks.views의 헬퍼 함수를 직접 사용
+            from stocks.views import get_current_stock_price_for_trading
+
+            # 현재가는 행 잠금 전에 조회 (네트워크 대기 중에 사용자 행을 잠그지 않음)
             try:
-                with transaction.atomic():
-                    locked_user = User.objects.select_for_update().get(id=user.id)
-                    # 여기서는 stocks.views의 헬퍼 함수를 직접 사용
-                    from stocks.views import get_current_stock_price_for_trading
-
-                    current_price = get_current_stock_price_for_trading(
-                        stock.stock_code
-                    )
-                    total_cost = current_price * quantity
-                    if order_type == Order.OrderType.BUY:
-                        if locked_user.cash_balance < total_cost:
-                            raise serializers.ValidationError("...")
-                        locked_user.cash_balance -= total_cost
-                        portfolio, created = Portfolio.objects.get_or_create(
-                            user=user, stock=stock
-                        )
-                        # ... 평단가 계산 ...
-                        portfolio.average_purchase_price = (
-                            (
-                                portfolio.average_purchase_price
-                                * portfolio.total_quantity
-                            )
-                            + total_cost
-                        ) / (portfolio.total_quantity + quantity)
-                        portfolio.total_quantity += quantity
-                        portfolio.save()
-                    elif order_type == Order.OrderType.SELL:
-                        portfolio = Portfolio.objects.get(user=user, stock=stock)
-                        if portfolio.total_quantity < quantity:
-                            raise serializers.ValidationError("...")
-                        locked_user.cash_balance += total_cost
-                        portfolio.total_quantity -= quantity
-                        if portfolio.total_quantity == 0:
-                            portfolio.delete()
-                        else:
-                            portfolio.save()
-                    locked_user.save(update_fields=["cash_balance"])
-                    Transaction.objects.create(
-                        user=user,
-                        stock=stock,
-                        order=order,
-                        transaction_type=order_type,
-                        quantity=quantity,
-                        executed_price=current_price,
-                    )
-                    order.status = Order.StatusType.COMPLETED
-                    order.save(update_fields=["status"])
-                    return order
-            except (
-                ValueError,
-                ConnectionError,
-                serializers.ValidationError,
-                Portfolio.DoesNotExist,
-            ) as e:
+                current_price = get_current_stock_price_for_trading(
+                    validated_data["stock"].stock_code
+                )
+            except (ValueError, ConnectionError) as e:
                 order.status = Order.StatusType.FAILED
                 order.save(update_fields=["status"])
-                if isinstance(e, Portfolio.DoesNotExist):
-                    raise serializers.ValidationError("...")
                 raise serializers.ValidationError(str(e))
+
+            # 지정가 주문 Task와 같은 체결 엔진으로 정산 (예수금/보유 수량 부족 시 FAILED)
+            # DB 오류로 정산이 롤백되면 주문이 PENDING으로 남지 않도록 FAILED 처리
+            try:
+                settlement = settle_fills([Fill(order, current_price)])
+            except DatabaseError as e:
+                logger.error(f"시장가 주문 {order.id} 체결 정산 실패: {e}")
+                order.status = Order.StatusType.FAILED
+                order.save(update_fields=["status"])
+                raise serializers.ValidationError(
+                    "체결 처리 중 오류가 발생했습니다. 다시 시도해주세요."
+                )
+            if order.id in settlement.failed:
+                raise serializers.ValidationError(settlement.failed[order.id])
+            return order
         elif price_type == Order.PriceType.LIMIT:
             return order
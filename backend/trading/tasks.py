@@ -1,171 +1,157 @@
 # backend/trading/tasks.py
 
 import logging
+import time
+from collections import defaultdict
 from decimal import Decimal
 
 from celery import shared_task
-from django.db import transaction as db_transaction
+
+from stocks.feeder import feed_quotes, quote_feed_settings
+from stocks.fetcher import fetch_prices
+from stocks.quote_cache import quote_cache
 
 # 현재가 조회 함수 경로 확인 필요
 from stocks.views import get_current_stock_price_for_trading
-from users.models import User
 
-from .models import Order, Portfolio, Transaction
+from .execution import Fill, settle_fills
+from .models import Order, Portfolio
+from .order_book import get_order_book
 
 logger = logging.getLogger(__name__)
 
+FEEDER_LOCK_KEY = "trading:feed-watched-quotes-lock"
+
+
+def get_watched_stock_codes():
+    """
+    현재가를 항상 최신으로 유지해야 하는 종목 코드 집합
+    (누군가 보유 중인 종목 + 미체결 주문이 걸린 종목)
+    """
+    held = Portfolio.objects.filter(total_quantity__gt=0).values_list(
+        "stock_id", flat=True
+    )
+    ordered = Order.objects.filter(status=Order.StatusType.PENDING).values_list(
+        "stock_id", flat=True
+    )
+    return set(held) | set(ordered)
+
+
+@shared_task
+def feed_watched_quotes():
+    """
+    [시세 피더] 보유/미체결 종목의 현재가를 일정 주기로 공유 캐시에 갱신합니다.
+    Celery Beat에 의해 QUOTE_FEED["INTERVAL"] 초마다 실행됩니다.
+    이전 실행이 아직 진행 중이면 이번 주기는 건너뜁니다.
+    (락은 현재가 캐시와 같은 캐시(QUOTE_CACHE["CACHE_ALIAS"])에 둡니다)
+    """
+    lock_timeout = quote_feed_settings()["INTERVAL"] * 3
+    shared = quote_cache.shared
+    try:
+        locked = shared.add(FEEDER_LOCK_KEY, True, timeout=lock_timeout)
+    except Exception as e:
+        logger.warning(f"시세 피더 락 획득 실패, 락 없이 진행합니다: {e}")
+        locked = True
+    if not locked:
+        logger.info("시세 피더: 이전 갱신이 진행 중이므로 건너뜁니다.")
+        return "Skipped: previous feed still running."
+
+    try:
+        stock_codes = get_watched_stock_codes()
+        updated, failed = feed_quotes(stock_codes)
+    finally:
+        try:
+            shared.delete(FEEDER_LOCK_KEY)
+        except Exception as e:
+            logger.warning(f"시세 피더 락 해제 실패: {e}")
+
+    result_message = f"시세 피더 갱신 완료. 대상: {len(stock_codes)}, 성공: {updated}, 실패: {failed}"
+    logger.info(result_message)
+    return result_message
+
 
 @shared_task
 def process_pending_limit_orders():
     """
     보류 중인 모든 지정가 주문을 확인하고 시장 가격 조건이 충족되면 실행합니다.
     이 작업은 Celery Beat에 의해 주기적으로 (예: 매 분마다) 실행되어야 합니다.
+    지정가 주문 장부(trading.order_book)에서 현재가에 체결되는 주문만 골라 DB에서 읽으므로
+    비용은 미체결 주문 수가 아니라 체결되는 주문 수에 비례합니다.
     """
-    pending_orders = Order.objects.filter(
-        status=Order.StatusType.PENDING, price_type=Order.PriceType.LIMIT
-    ).select_related(
-        "user", "stock"
-    )  # DB 쿼리 최적화
+    book = get_order_book()
+    stock_codes = book.stock_codes()
+    logger.info(
+        f"{len(stock_codes)}개 종목, {len(book)}개의 미체결 지정가 주문을 확인합니다..."
+    )
 
-    logger.info(f"{pending_orders.count()}개의 미체결 지정가 주문을 확인합니다...")
-    executed_count = 0
-    failed_count = 0
+    # 미체결 주문에 포함된 종목들의 현재가를 공용 조회 엔진으로 동시에 조회
+    # (조회 실패 종목은 None)
+    started_at = time.perf_counter()
+    current_prices = fetch_prices(
+        stock_codes, fetch=get_current_stock_price_for_trading
+    )
+    fetched_at = time.perf_counter()
+
+    # 장부에서 현재가에 체결되는 주문만 골라 DB에서 읽음 (나머지 주문은 읽지 않음)
+    matched_ids = []
+    for stock_code, current_price in current_prices.items():
+        if current_price is None:
+            logger.warning(f"{stock_code}의 현재가를 가져올 수 없습니다. 건너뜁니다.")
+            continue
+        matched_ids.extend(book.match(stock_code, current_price))
+
+    pending_orders = list(
+        Order.objects.filter(
+            id__in=matched_ids,
+            status=Order.StatusType.PENDING,
+            price_type=Order.PriceType.LIMIT,
+        )
+        .select_related("stock")  # DB 쿼리 최적화 (사용자는 정산 시 잠그며 읽음)
+        .order_by("id")
+    )
+    # 장부에만 남아 있던 주문(롤백 등)은 장부에서 제거
+    for order_id in set(matched_ids) - {order.id for order in pending_orders}:
+        book.remove(order_id)
 
+    # 종목별로 묶어 한 번 조회한 현재가로 그 종목의 주문들을 모두 평가
+    orders_by_stock = defaultdict(list)
     for order in pending_orders:
-        try:
-            # 1. 현재 시장가 가져오기
-            current_price = get_current_stock_price_for_trading(order.stock.stock_code)
-            if current_price is None:
-                logger.warning(
-                    f"{order.stock.stock_name} (주문 ID: {order.id})의 현재가를 가져올 수 없습니다. 건너<0xEB><0x9B><0x81>니다."
-                )
-                continue
-
-            # 2. 주문 유형에 따라 체결 조건 확인
-            should_execute = False
-            execution_price = (
-                order.limit_price
-            )  # 지정가 또는 더 유리한 가격으로 체결 (일반적으로 지정가 사용)
-            if (
-                order.order_type == Order.OrderType.BUY
-                and current_price <= order.limit_price
-            ):
-                should_execute = True
-                # 실제 체결가는 지정가 또는 현재가 중 유리한 쪽으로 할 수 있으나, 여기서는 지정가로 통일
-            elif (
-                order.order_type == Order.OrderType.SELL
-                and current_price >= order.limit_price
-            ):
-                should_execute = True
-                # 실제 체결가는 지정가 또는 현재가 중 유리한 쪽으로 할 수 있으나, 여기서는 지정가로 통일
-
-            # 3. 조건 충족 시 체결 실행
-            if should_execute:
+        orders_by_stock[order.stock_id].append(order)
+    matched_at = time.perf_counter()
+
+    # 다시 확인한 체결 조건을 만족하는 주문만 지정가로 체결 (하나의 트랜잭션으로 정산)
+    fills = []
+    for stock_code, orders in orders_by_stock.items():
+        current_price = current_prices[stock_code]
+        for order in orders:
+            if order.order_type == Order.OrderType.BUY:
+                crossing = current_price <= order.limit_price
+            else:
+                crossing = current_price >= order.limit_price
+            if crossing:
                 logger.info(
-                    f"주문 ID 실행: {order.id} ({order.order_type} {order.stock.stock_name} @ {execution_price} vs 현재가 {current_price})"
+                    f"주문 ID 실행: {order.id} ({order.order_type} {order.stock.stock_name} @ {order.limit_price} vs 현재가 {current_price})"
                 )
-                try:
-                    # 각 주문 체결 시도를 원자적 트랜잭션으로 처리
-                    with db_transaction.atomic():
-                        # 동시성 문제를 방지하기 위해 사용자 및 포트폴리오 행에 Lock 설정
-                        user = User.objects.select_for_update().get(id=order.user.id)
-
-                        total_cost = execution_price * order.quantity
-
-                        if order.order_type == Order.OrderType.BUY:
-                            # 체결 시점에 잔고 재확인
-                            if user.cash_balance < total_cost:
-                                raise ValueError(
-                                    "체결 시점 예수금 부족."
-                                )  # 주문 실패 처리
-
-                            user.cash_balance -= total_cost
-
-                            # 포트폴리오 행이 존재하면 Lock 설정
-                            (
-                                portfolio,
-                                created,
-                            ) = Portfolio.objects.select_for_update().get_or_create(
-                                user=user, stock=order.stock
-                            )
-                            total_cost_prev = (
-                                portfolio.average_purchase_price
-                                * portfolio.total_quantity
-                            )
-                            total_quantity_new = (
-                                portfolio.total_quantity + order.quantity
-                            )
-                            # 평단가 재계산
-                            portfolio.average_purchase_price = (
-                                total_cost_prev + total_cost
-                            ) / total_quantity_new
-                            portfolio.total_quantity = total_quantity_new
-                            portfolio.save()
-
-                        elif order.order_type == Order.OrderType.SELL:
-                            # 체결 시점에 보유 수량 재확인
-                            try:
-                                portfolio = Portfolio.objects.select_for_update().get(
-                                    user=user, stock=order.stock
-                                )
-                                if portfolio.total_quantity < order.quantity:
-                                    raise ValueError(
-                                        "체결 시점 보유 수량 부족."
-                                    )  # 주문 실패 처리
-                            except Portfolio.DoesNotExist:
-                                raise ValueError(
-                                    "체결 시점 포트폴리오 없음."
-                                )  # 주문 실패 처리
-
-                            user.cash_balance += total_cost
-                            portfolio.total_quantity -= order.quantity
-                            if portfolio.total_quantity == 0:
-                                portfolio.delete()
-                            else:
-                                portfolio.save()
-
-                        # 사용자 잔고 변경 저장
-                        user.save(update_fields=["cash_balance"])
-
-                        # Transaction(거래 내역) 생성
-                        Transaction.objects.create(
-                            user=user,
-                            stock=order.stock,
-                            order=order,
-                            transaction_type=order.order_type,
-                            quantity=order.quantity,
-                            executed_price=execution_price,  # 결정된 체결 가격 사용
-                        )
-
-                        # 주문 상태를 COMPLETED로 업데이트
-                        order.status = Order.StatusType.COMPLETED
-                        order.save(update_fields=["status"])
-                        executed_count += 1
-
-                except (
-                    ValueError,
-                    Portfolio.DoesNotExist,
-                ) as exec_error:  # 체결 시점 유효성 검사 오류 처리
-                    logger.warning(
-                        f"주문 ID {order.id} 체결 실패 (유효성 검사 오류): {exec_error}"
-                    )
-                    order.status = Order.StatusType.FAILED
-                    order.save(update_fields=["status"])
-                    failed_count += 1
-                except Exception as db_error:  # 체결 중 DB 오류 처리
-                    logger.error(f"주문 ID {order.id} 체결 중 DB 오류: {db_error}")
-                    # 주문 상태 변경 없이 다음 주기에 재시도
-                    # 필요시 다른 에러 상태로 변경 가능
-
-        except ConnectionError as api_error:
-            # 가격 조회 오류 - 로그 남기고 다음 주문으로 진행 (다음 주기에 재시도)
-            logger.error(f"주문 ID {order.id} 처리 중 API 연결 오류: {api_error}")
-        except Exception as e:
-            # 예상치 못한 오류 - 로그 남기고 다음 주문으로 진행
-            logger.error(f"주문 ID {order.id} 처리 중 예상치 못한 오류: {e}")
-
+                fills.append(Fill(order, order.limit_price))
+
+    try:
+        settlement = settle_fills(fills)
+        executed_count, failed_count = (
+            len(settlement.executed),
+            len(settlement.failed),
+        )
+    except Exception as e:
+        # DB 오류 - 묶음 전체가 롤백되어 주문은 PENDING으로 남고 다음 주기에 재시도
+        logger.error(f"지정가 주문 {len(fills)}건 체결 중 DB 오류: {e}")
+        executed_count = failed_count = 0
+    finished_at = time.perf_counter()
+
+    elapsed = finished_at - matched_at
     result_message = (
-        f"미체결 주문 처리 완료. 체결: {executed_count}, 실패: {failed_count}"
+        f"미체결 주문 처리 완료. 체결: {executed_count}, 실패: {failed_count} "
+        f"(종목 {len(current_prices)}개 현재가 조회 {fetched_at - started_at:.3f}s, "
+        f"주문 {len(pending_orders)}건 선별 {matched_at - fetched_at:.3f}s, "
+        f"체결 {elapsed:.3f}s, 초당 {executed_count / elapsed if elapsed > 0 else 0:.1f}건)"
     )
     logger.info(result_message)
     return result_message
@@ -5,16 +5,29 @@ from decimal import Decimal
 from unittest.mock import MagicMock, patch  # MagicMock 추가 (필요시 사용)
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone  # For timestamp comparison
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from stocks.feeder import feed_quotes
 from stocks.models import Stock
+from stocks.quote_cache import quote_cache
+from stocks.snapshot import store_price_snapshot
+from stocks.views import get_current_stock_price_for_trading
 
+from .execution import Fill, settle_fills
 from .models import Order, Portfolio, Transaction
-from .tasks import process_pending_limit_orders
+from .order_book import OrderBook, get_order_book, order_book
+from .tasks import (
+    feed_watched_quotes,
+    get_watched_stock_codes,
+    process_pending_limit_orders,
+)
 
 # users 앱의 AssetHistory 모델도 임포트 (setUp에서 사용 가능성 고려)
 # from users.models import AssetHistory
@@ -251,6 +264,24 @@ class TradingAPITests(APITestCase):
         self.assertIsInstance(response.data, list)
         self.assertEqual(response.data[0].code, "invalid")
 
+    @patch("trading.serializers.settle_fills")
+    @patch("stocks.views.get_current_stock_price_for_trading")
+    def test_market_order_db_error_marks_failed(self, mock_price, mock_settle):
+        """[실패] 시장가 체결 정산이 DB 오류로 롤백되면 주문은 PENDING이 아니라 FAILED"""
+        mock_price.return_value = Decimal("150000.00")
+        mock_settle.side_effect = IntegrityError("duplicate key")
+        data = {
+            "stock": "000660",
+            "order_type": "BUY",
+            "quantity": 1,
+            "price_type": "MARKET",
+        }
+        response = self.client.post(self.order_url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        order = Order.objects.get(user=self.user, stock=self.stock_sk)
+        self.assertEqual(order.status, Order.StatusType.FAILED)
+
     # --- 2. 지정가(LIMIT) 주문 테스트 ---
 
     def test_limit_buy_success_pending(self):
@@ -708,6 +739,81 @@ class TradingTaskTests(TestCase):  # TestCase 상속
             average_purchase_price=Decimal("100000.00"),
         )
 
+    # --- Task: feed_watched_quotes (시세 피더) 테스트 ---
+
+    def test_get_watched_stock_codes(self):
+        """[성공] 보유 중인 종목 + 미체결 주문 종목만 피더 대상"""
+        stock_naver = Stock.objects.create(stock_code="035420", stock_name="NAVER")
+        stock_kakao = Stock.objects.create(stock_code="035720", stock_name="카카오")
+        Order.objects.create(
+            user=self.user,
+            stock=self.stock_samsung,
+            order_type="BUY",
+            quantity=1,
+            price_type="LIMIT",
+            limit_price=Decimal("70000"),
+            status=Order.StatusType.PENDING,
+        )
+        Order.objects.create(
+            user=self.user,
+            stock=stock_naver,
+            order_type="BUY",
+            quantity=1,
+            price_type="MARKET",
+            status=Order.StatusType.COMPLETED,
+        )
+        Portfolio.objects.create(user=self.user, stock=stock_kakao, total_quantity=0)
+
+        self.assertEqual(get_watched_stock_codes(), {"000660", "005930"})
+
+    @patch("stocks.feeder.fetch_current_stock_price")
+    def test_feed_watched_quotes_warms_quote_cache(self, mock_fetch):
+        """[성공] 피더가 채운 현재가는 이후 조회에서 네이버 요청 없이 사용"""
+        cache.clear()
+        quote_cache.clear()
+        mock_fetch.return_value = Decimal("120000")
+
+        result = feed_watched_quotes()
+
+        self.assertIn("성공: 1", result)
+        mock_fetch.assert_called_once_with("000660")
+        with patch("stocks.views.fetch_current_stock_price") as mock_upstream:
+            price = get_current_stock_price_for_trading("000660")
+        self.assertEqual(price, Decimal("120000"))
+        mock_upstream.assert_not_called()
+
+    @patch("stocks.feeder.fetch_current_stock_price")
+    def test_feed_caps_fetches_and_fills_rest_from_snapshot(self, mock_fetch):
+        """[성공] 주기당 MAX_FETCHES 종목만 개별 조회하고, 나머지는 시세 스냅샷으로 갱신"""
+        cache.clear()
+        quote_cache.clear()
+        mock_fetch.return_value = Decimal("1000")
+        codes = [f"{i:06d}" for i in range(1, 6)]
+        store_price_snapshot(
+            [
+                {
+                    "code": code,
+                    "name": code,
+                    "price": 2000,
+                    "change": 0,
+                    "change_rate": 0.0,
+                    "market_cap": 1,
+                    "volume": 1,
+                }
+                for code in codes
+            ]
+        )
+
+        with self.settings(QUOTE_FEED={"MAX_FETCHES": 2}):
+            updated, failed = feed_quotes(codes)
+
+        self.assertEqual((updated, failed), (5, 0))
+        self.assertEqual(mock_fetch.call_count, 2)
+        prices = {
+            code: quote.price for code, quote in quote_cache.get_many(codes).items()
+        }
+        self.assertEqual(sorted(prices.values()), [1000] * 2 + [2000] * 3)
+
     # --- Task: process_pending_limit_orders 테스트 ---
 
     @patch(
@@ -936,3 +1042,300 @@ class TradingTaskTests(TestCase):  # TestCase 상속
         self.assertEqual(
             pending_order2.status, Order.StatusType.COMPLETED
         )  # 정상 조회된 주문은 체결됨
+
+    @patch("trading.tasks.get_current_stock_price_for_trading")
+    def test_task_fetches_each_stock_price_once(self, mock_get_price):
+        """[성공] Task - 같은 종목의 주문 여러 건은 현재가 한 번으로 평가하고 조회/체결 시간을 보고"""
+        for _ in range(5):
+            Order.objects.create(
+                user=self.user,
+                stock=self.stock_samsung,
+                order_type="BUY",
+                quantity=1,
+                price_type="LIMIT",
+                limit_price=Decimal("75000"),
+                status=Order.StatusType.PENDING,
+            )
+        Order.objects.create(
+            user=self.user,
+            stock=self.stock_sk,
+            order_type="SELL",
+            quantity=1,
+            price_type="LIMIT",
+            limit_price=Decimal("110000"),
+            status=Order.StatusType.PENDING,
+        )
+        mock_get_price.side_effect = lambda code: {
+            "005930": Decimal("74000"),
+            "000660": Decimal("115000"),
+        }[code]
+
+        result = process_pending_limit_orders()
+
+        self.assertEqual(
+            sorted(call.args[0] for call in mock_get_price.call_args_list),
+            ["000660", "005930"],
+        )
+        self.assertIn("체결: 6, 실패: 0", result)
+        self.assertIn("현재가 조회", result)
+        self.assertIn("체결 0.", result)
+
+
+class ExecutionTests(TestCase):
+    """
+    trading.execution (체결 묶음 정산)을 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        order_book.reset()
+        self.user = User.objects.create_user(
+            email="execuser@example.com",
+            nickname="execuser",
+            password="password123",
+            cash_balance=Decimal("1000000.00"),
+        )
+        self.stock_samsung = Stock.objects.create(
+            stock_code="005930", stock_name="삼성전자"
+        )
+        self.stock_sk = Stock.objects.create(
+            stock_code="000660", stock_name="SK하이닉스"
+        )
+
+    def _order(self, order_type, quantity, stock=None, user=None):
+        return Order.objects.create(
+            user=user or self.user,
+            stock=stock or self.stock_samsung,
+            order_type=order_type,
+            quantity=quantity,
+            price_type="MARKET",
+            status=Order.StatusType.PENDING,
+        )
+
+    def test_batch_applies_fills_in_order_id_order(self):
+        """같은 사용자의 체결은 순서대로 예수금에 반영되고, 부족한 체결만 실패"""
+        first = self._order("BUY", 5)  # 350,000원
+        second = self._order("BUY", 5)  # 400,000원 (평단가 75,000원)
+        third = self._order("BUY", 5)  # 375,000원 -> 남은 250,000원으로 부족
+        fourth = self._order("BUY", 1, stock=self.stock_sk)  # 100,000원
+
+        settlement = settle_fills(
+            [
+                Fill(fourth, Decimal("100000")),
+                Fill(third, Decimal("75000")),
+                Fill(second, Decimal("80000")),
+                Fill(first, Decimal("70000")),
+            ]
+        )
+
+        self.assertEqual(
+            [order.id for order in settlement.executed],
+            [first.id, second.id, fourth.id],
+        )
+        self.assertEqual(settlement.failed, {third.id: "체결 시점 예수금 부족."})
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.cash_balance, Decimal("150000.00"))
+        portfolio = Portfolio.objects.get(user=self.user, stock=self.stock_samsung)
+        self.assertEqual(portfolio.total_quantity, 10)
+        self.assertEqual(portfolio.average_purchase_price, Decimal("75000.00"))
+        self.assertEqual(
+            dict(Order.objects.values_list("id", "status")),
+            {
+                first.id: Order.StatusType.COMPLETED,
+                second.id: Order.StatusType.COMPLETED,
+                third.id: Order.StatusType.FAILED,
+                fourth.id: Order.StatusType.COMPLETED,
+            },
+        )
+        self.assertEqual(Transaction.objects.count(), 3)
+
+    def test_failed_buy_leaves_no_empty_portfolio(self):
+        """새 종목 매수가 실패하면 미리 넣은 빈 포트폴리오 행도 남기지 않음"""
+        order = self._order("BUY", 100, stock=self.stock_sk)  # 10,000,000원 > 예수금
+
+        settlement = settle_fills([Fill(order, Decimal("100000"))])
+
+        self.assertEqual(list(settlement.failed), [order.id])
+        self.assertFalse(
+            Portfolio.objects.filter(user=self.user, stock=self.stock_sk).exists()
+        )
+
+    def test_buy_uses_portfolio_inserted_concurrently(self):
+        """확인 직후 다른 작업자가 같은 포트폴리오 행을 넣어도 IntegrityError 없이 그 행에 반영"""
+        order = self._order("BUY", 1, stock=self.stock_sk)
+        Portfolio.objects.create(user=self.user, stock=self.stock_sk)
+
+        # 존재 여부를 확인할 때는 아직 없던 행
+        with patch("trading.execution._existing_pairs", return_value=set()):
+            settlement = settle_fills([Fill(order, Decimal("100000"))])
+
+        self.assertEqual([o.id for o in settlement.executed], [order.id])
+        portfolio = Portfolio.objects.get(user=self.user, stock=self.stock_sk)
+        self.assertEqual(portfolio.total_quantity, 1)
+
+    def test_sell_to_zero_deletes_portfolio_and_skips_closed_orders(self):
+        """보유 수량이 0이 된 포트폴리오는 삭제하고, PENDING이 아닌 주문은 건너뜀"""
+        Portfolio.objects.create(
+            user=self.user,
+            stock=self.stock_sk,
+            total_quantity=3,
+            average_purchase_price=Decimal("100000.00"),
+        )
+        sell = self._order("SELL", 3, stock=self.stock_sk)
+        oversell = self._order("SELL", 1, stock=self.stock_sk)
+        canceled = self._order("BUY", 1)
+        canceled.status = Order.StatusType.CANCELED
+        canceled.save(update_fields=["status"])
+
+        settlement = settle_fills(
+            [
+                Fill(sell, Decimal("110000")),
+                Fill(oversell, Decimal("110000")),
+                Fill(canceled, Decimal("70000")),
+            ]
+        )
+
+        self.assertEqual([order.id for order in settlement.executed], [sell.id])
+        self.assertEqual(settlement.failed, {oversell.id: "체결 시점 보유 수량 부족."})
+        self.assertEqual(settlement.skipped, [canceled.id])
+        self.assertFalse(Portfolio.objects.filter(user=self.user).exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.cash_balance, Decimal("1330000.00"))
+        canceled.refresh_from_db()
+        self.assertEqual(canceled.status, Order.StatusType.CANCELED)
+
+    def test_query_count_does_not_grow_with_fills(self):
+        """쿼리 수는 체결 건수와 무관하게 일정"""
+        users = [
+            User.objects.create_user(
+                email=f"exec{i}@example.com",
+                nickname=f"exec{i}",
+                password="password123",
+            )
+            for i in range(10)
+        ]
+        for user in users:
+            Portfolio.objects.create(
+                user=user,
+                stock=self.stock_sk,
+                total_quantity=10,
+                average_purchase_price=Decimal("100000.00"),
+            )
+
+        def settle(n):
+            fills = []
+            for user in users[:n]:
+                fills.append(Fill(self._order("BUY", 1, user=user), Decimal("70000")))
+                fills.append(
+                    Fill(
+                        self._order("SELL", 1, stock=self.stock_sk, user=user),
+                        Decimal("110000"),
+                    )
+                )
+            with CaptureQueriesContext(connection) as queries:
+                settlement = settle_fills(fills)
+            self.assertEqual(len(settlement.executed), 2 * n)
+            return len(queries)
+
+        self.assertEqual(settle(2), settle(8))
+
+
+class OrderBookTests(TestCase):
+    """
+    trading.order_book (지정가 주문 장부)를 테스트합니다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        order_book.reset()
+        self.user = User.objects.create_user(
+            email="bookuser@example.com",
+            nickname="bookuser",
+            password="password123",
+            cash_balance=Decimal("100000000.00"),
+        )
+        self.stock = Stock.objects.create(stock_code="005930", stock_name="삼성전자")
+
+    def _limit_order(self, order_type, limit_price, stock=None):
+        return Order.objects.create(
+            user=self.user,
+            stock=stock or self.stock,
+            order_type=order_type,
+            quantity=1,
+            price_type="LIMIT",
+            limit_price=Decimal(limit_price),
+            status=Order.StatusType.PENDING,
+        )
+
+    def test_match_returns_only_crossing_orders(self):
+        """매수는 지정가 높은 순, 매도는 낮은 순으로 체결 조건을 만족하는 주문만"""
+        book = OrderBook()
+        for order_id, order_type, price in [
+            (1, "BUY", 80),
+            (2, "BUY", 100),
+            (3, "BUY", 90),
+            (4, "SELL", 120),
+            (5, "SELL", 110),
+            (6, "BUY", 100),
+        ]:
+            book.add(order_id, order_type, Decimal(price))
+
+        self.assertEqual(book.match(Decimal("95")), [2, 6])
+        self.assertEqual(book.match(Decimal("90")), [2, 6, 3])
+        self.assertEqual(book.match(Decimal("115")), [5])
+        self.assertEqual(book.match(Decimal("100")), [2, 6])
+
+        book.remove(2)
+        book.add(5, "SELL", Decimal("130"))  # 같은 주문 ID는 교체
+        self.assertEqual(book.match(Decimal("115")), [])
+        self.assertEqual(book.match(Decimal("100")), [6])
+        self.assertEqual(len(book), 5)
+
+    def test_book_follows_placed_and_canceled_orders(self):
+        """DB로 처음 만든 뒤에는 주문 접수/취소 기록을 반영하고, 기록이 없어지면 DB로 다시 만듦"""
+        first = self._limit_order("BUY", "75000")
+        self.assertEqual(get_order_book().match("005930", Decimal("74000")), [first.id])
+
+        second = self._limit_order("BUY", "76000")
+        market = Order.objects.create(
+            user=self.user,
+            stock=self.stock,
+            order_type="BUY",
+            quantity=1,
+            price_type="MARKET",
+        )
+        self.assertEqual(
+            get_order_book().match("005930", Decimal("74000")), [second.id, first.id]
+        )
+        self.assertNotIn(market.id, get_order_book().match("005930", Decimal("0")))
+
+        second.status = Order.StatusType.CANCELED
+        second.save(update_fields=["status"])
+        self.assertEqual(get_order_book().match("005930", Decimal("74000")), [first.id])
+
+        cache.clear()
+        third = self._limit_order("SELL", "70000")
+        cache.clear()
+        self.assertEqual(
+            get_order_book().match("005930", Decimal("74000")), [first.id, third.id]
+        )
+
+    @patch("trading.tasks.get_current_stock_price_for_trading")
+    def test_task_executes_only_crossing_orders(self, mock_get_price):
+        """Task는 현재가에 체결되는 주문만 DB에서 읽어 체결"""
+        waiting = [self._limit_order("BUY", str(60000 + i)) for i in range(20)]
+        crossing = self._limit_order("BUY", "75000")
+        mock_get_price.return_value = Decimal("74000")
+
+        result = process_pending_limit_orders()
+
+        self.assertIn("체결: 1", result)
+        crossing.refresh_from_db()
+        self.assertEqual(crossing.status, Order.StatusType.COMPLETED)
+        self.assertEqual(
+            Order.objects.filter(
+                id__in=[order.id for order in waiting], status=Order.StatusType.PENDING
+            ).count(),
+            20,
+        )
+        self.assertEqual(get_order_book().match("005930", Decimal("74000")), [])
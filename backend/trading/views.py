@@ -2,7 +2,6 @@
 
 # 1. Standard Library
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal
 
 # 2. Third-Party
@@ -12,6 +11,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 # 3. First-Party (My Project)
+from stocks.fetcher import fetch_prices
 from stocks.views import get_current_stock_price_for_trading
 
 # 4. Local (Current App)
@@ -50,7 +50,7 @@ class PortfolioListView(generics.ListAPIView):
     """
     [수정됨] 사용자의 보유 주식 현황 (포트폴리오) 목록
     - View에서 현재가를 미리 조회하여 Serializer에 전달 (N+1 문제 해결)
-    - 가격 조회 병렬 처리 적용
+    - 가격 조회 병렬 처리 적용 (stocks.fetcher 조회 엔진)
     """
 
     serializer_class = PortfolioSerializer
@@ -71,29 +71,11 @@ class PortfolioListView(generics.ListAPIView):
         # 1. 필요한 모든 종목 코드 추출
         stock_codes = list(queryset.values_list("stock__stock_code", flat=True))
 
-        price_cache = {}  # 종목 코드별 현재가를 저장할 딕셔너리
-
-        # 2. 가격 병렬 조회 (ThreadPoolExecutor 사용)
-        with ThreadPoolExecutor(
-            max_workers=10
-        ) as executor:  # max_workers는 서버 환경에 맞게 조절
-            future_to_code = {
-                executor.submit(get_current_stock_price_for_trading, code): code
-                for code in stock_codes
-            }
-
-            for future in as_completed(future_to_code):
-                code = future_to_code[future]
-                try:
-                    # 함수 실행 결과 (Decimal 가격) 가져오기
-                    # get_current_stock_price_for_trading 함수가 Decimal을 반환한다고 가정
-                    price = future.result()
-                    price_cache[code] = price
-                    logger.debug(f"Fetched price for {code}: {price}")
-                except Exception as exc:
-                    # 가격 조회 중 에러 발생 시 None 저장하고 로그 남기기
-                    logger.error(f"Error fetching price for {code}: {exc}")
-                    price_cache[code] = None  # 오류 발생 시 None으로 처리
+        # 2. 가격 병렬 조회 (프로세스 공용 조회 엔진 사용, 요청마다 스레드를 만들지 않음)
+        # 조회 실패 시 None 으로 처리됨
+        price_cache = fetch_prices(
+            stock_codes, fetch=get_current_stock_price_for_trading
+        )
 
         # 3. Serializer context에 가격 캐시 전달
         context = self.get_serializer_context()
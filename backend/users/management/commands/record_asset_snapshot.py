@@ -10,6 +10,7 @@ from django.db import transaction as db_transaction
 from django.utils import timezone
 from pykrx import stock
 
+from stocks.fetcher import fetch_prices
 from stocks.views import get_current_stock_price_for_trading
 from trading.models import Portfolio
 from users.models import AssetHistory, User
@@ -85,28 +86,38 @@ class Command(BaseCommand):
         processed_users = 0
         errors = []
 
+        # 활성 사용자가 보유한 모든 종목의 현재가를 공용 조회 엔진으로 한 번에 동시 조회
+        held_stock_codes = Portfolio.objects.filter(
+            user__is_active=True, total_quantity__gt=0
+        ).values_list("stock__stock_code", flat=True)
+        current_prices = fetch_prices(
+            held_stock_codes, fetch=get_current_stock_price_for_trading
+        )
+        # 조회 실패/시간 초과 종목(None)은 평가액 0으로 계산되므로 한 번에 알림
+        missing_codes = sorted(
+            code for code, price in current_prices.items() if price is None
+        )
+        if missing_codes:
+            logger.warning(
+                f"현재가를 가져오지 못한 종목 {len(missing_codes)}/{len(current_prices)}개는 "
+                f"평가액 0으로 계산합니다: {', '.join(missing_codes)}"
+            )
+
         for user in users:
             try:
                 # 1. 총 주식 평가액 계산 (기존 로직 동일)
                 total_stock_value = Decimal("0.00")
                 portfolio_items = Portfolio.objects.filter(
                     user=user, total_quantity__gt=0
-                )
+                ).select_related("stock")
 
                 for item in portfolio_items:
-                    try:
-                        current_price = get_current_stock_price_for_trading(
-                            item.stock.stock_code
-                        )
-                        if current_price is not None:
-                            total_stock_value += current_price * item.total_quantity
-                        else:
-                            logger.warning(
-                                f"경고: {user.email}의 {item.stock.stock_name} 현재가 조회 실패."
-                            )
-                    except Exception as price_error:
-                        logger.error(
-                            f"에러: {user.email}의 {item.stock.stock_name} 가격 조회 중 오류: {price_error}"
+                    current_price = current_prices.get(item.stock.stock_code)
+                    if current_price is not None:
+                        total_stock_value += current_price * item.total_quantity
+                    else:
+                        logger.warning(
+                            f"경고: {user.email}의 {item.stock.stock_name} 현재가 조회 실패."
                         )
 
                 # 2. 총 자산 계산 (기존 로직 동일)
@@ -7,8 +7,8 @@ import { useNavigate } from 'react-router-dom'
 export interface StockResult {
   name: string
   code: string
-  price: string
-  changeRate: number // 등락률을 숫자로 받아 처리
+  price: string | null // 시세를 아직 모르는 종목은 null
+  changeRate: number | null // 등락률을 숫자로 받아 처리 (모르면 null)
 }
 
 interface SearchResultsTableProps {
@@ -59,15 +59,19 @@ const SearchResultsTable: React.FC<SearchResultsTableProps> = ({ results }) => {
             >
               <td className="py-3 px-4">{stock.name}</td>
               <td className="py-3 px-4">{stock.code}</td>
-              <td className="py-3 px-4">{stock.price}</td>
-              <td
-                className={`py-3 px-4 font-semibold ${
-                  stock.changeRate >= 0 ? 'text-red-500' : 'text-blue-500'
-                }`}
-              >
-                {stock.changeRate >= 0 ? '+' : ''}
-                {stock.changeRate.toFixed(2)}%
-              </td>
+              <td className="py-3 px-4">{stock.price ?? '-'}</td>
+              {stock.changeRate === null ? (
+                <td className="py-3 px-4 text-gray-400">-</td>
+              ) : (
+                <td
+                  className={`py-3 px-4 font-semibold ${
+                    stock.changeRate >= 0 ? 'text-red-500' : 'text-blue-500'
+                  }`}
+                >
+                  {stock.changeRate >= 0 ? '+' : ''}
+                  {stock.changeRate.toFixed(2)}%
+                </td>
+              )}
             </tr>
           ))}
         </tbody>
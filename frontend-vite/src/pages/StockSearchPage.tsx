@@ -26,6 +26,16 @@ const StockSearchPage: React.FC = () => {
 
       // 2. 백엔드에서 받은 데이터를 프론트엔드 형식에 맞게 가공합니다.
       const processedData: StockResult[] = response.data.map((stock: any) => {
+        // 시세 스냅샷/현재가 캐시에 없는 종목은 price/changeRate가 null
+        if (stock.price === null || stock.changeRate === null) {
+          return {
+            name: stock.name,
+            code: stock.code,
+            price: stock.price,
+            changeRate: null,
+          }
+        }
+
         const currentPrice = parseFloat(stock.price.replace(/,/g, '')) // "58,100" -> 58100
         const changeValue = stock.changeRate // 백엔드에서 받은 등락 '값' (예: 500)
 